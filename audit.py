@@ -0,0 +1,220 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+
+from dotenv import load_dotenv
+
+import events
+import catalog
+import page_parsers
+import ratelimit
+from register_album import ALBUM_VIEW_URL, MY_ALBUM_URL
+
+try:
+	import aiohttp
+except ImportError:  # 감사 명령에서만 필요하다
+	aiohttp = None
+
+# 보유 앨범 전체의 ISRC/UCI 누락 여부를 브라우저 없이 점검한다. 로그인 쿠키만 브라우저(또는 저장된 파일)에서
+# 가져오고, 앨범 상세 페이지는 asyncio HTTP로 동시에 받아 page_parsers로 'ISRC/Music.UCI' 표를 읽는다.
+
+COOKIES_ENV = "MIMS_COOKIES_FILE"
+DEFAULT_COOKIES = "mims_cookies.json"
+DEFAULT_REPORT = "audit_report.json"
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+# --rate로 거는 감사 전용 버킷. 공유 read 버킷의 속도는 프로세스마다 같아야 하므로 건드리지 않는다.
+AUDIT_KIND = "audit"
+
+
+def browser_cookies(mims_id: str, mims_password: str) -> list:
+	"""헤드리스 크롬으로 로그인해 세션 쿠키를 가져온다."""
+	from register_album import create_driver, login
+
+	driver = create_driver(headless=True)
+	try:
+		if not login(driver, mims_id, mims_password):
+			raise RuntimeError("로그인 실패")
+		return driver.get_cookies()
+	finally:
+		driver.quit()
+
+
+def load_cookies(path: str) -> list:
+	with open(path, encoding="utf-8") as f:
+		return json.load(f)
+
+
+def save_cookies(cookies: list, path: str) -> None:
+	with open(path, "w", encoding="utf-8") as f:
+		json.dump(cookies, f, ensure_ascii=False)
+	os.chmod(path, 0o600)
+
+
+def audit_album_html(code: str, html: str) -> dict:
+	"""앨범 상세 HTML 하나를 점검 결과로 만든다."""
+	rows = page_parsers.parse_album_code_rows(html)
+	missing = [
+		{"track_seq": i, "title": r["title"], "isrc": bool(r["isrc"]), "uci": bool(r["uci"])}
+		for i, r in enumerate(rows, start=1) if not (r["isrc"] and r["uci"])
+	]
+	if not rows:
+		status = "empty"
+	elif missing:
+		status = "incomplete"
+	else:
+		status = "complete"
+	return {
+		"code": code,
+		"status": status,
+		"tracks": len(rows),
+		"isrc": sum(1 for r in rows if r["isrc"]),
+		"uci": sum(1 for r in rows if r["uci"]),
+		"missing": missing,
+	}
+
+
+async def _fetch(session, url: str, semaphore, retries: int = 2):
+	"""동시 요청 수와 공유 속도 제한(read, 설정돼 있으면 audit도)을 지켜 페이지를 받아 (최종 URL, HTML)을 반환한다."""
+	for attempt in range(retries + 1):
+		async with semaphore:
+			if AUDIT_KIND in ratelimit.limits():
+				await ratelimit.acquire_async(AUDIT_KIND)
+			await ratelimit.acquire_async("read")
+			try:
+				async with session.get(url) as resp:
+					if resp.status in (429, 502, 503) and attempt < retries:
+						await asyncio.sleep(2 ** attempt)
+						continue
+					resp.raise_for_status()
+					return str(resp.url), await resp.text()
+			except (aiohttp.ClientError, asyncio.TimeoutError):
+				if attempt == retries:
+					raise
+				await asyncio.sleep(2 ** attempt)
+
+
+async def _audit_one(session, code: str, semaphore) -> dict:
+	try:
+		final_url, html = await _fetch(session, ALBUM_VIEW_URL.format(code=code), semaphore)
+	except Exception as e:
+		return {"code": code, "status": "error", "error": f"{type(e).__name__}: {e}"}
+	if "/login" in final_url:
+		return {"code": code, "status": "error", "error": "로그인 페이지로 이동됨 (쿠키 만료)"}
+	return audit_album_html(code, html)
+
+
+async def _list_my_albums(session, semaphore, pages: int) -> list:
+	"""My앨범 목록 페이지에서 앨범 코드와 제목을 모은다. 새 코드가 없는 페이지에서 멈춘다."""
+	albums, seen = [], set()
+	for page in range(1, pages + 1):
+		url = MY_ALBUM_URL if page == 1 else f"{MY_ALBUM_URL}?page={page}"
+		_, html = await _fetch(session, url, semaphore)
+		fresh = [a for a in page_parsers.parse_album_cards(html) if a["code"] and a["code"] not in seen]
+		if not fresh:
+			break
+		for album in fresh:
+			seen.add(album["code"])
+			albums.append(album)
+	return albums
+
+
+async def run_audit(codes: dict, cookies: list, concurrency: int = 8, rate: float = None, my_album_pages: int = 0, progress: bool = True) -> list:
+	"""앨범 코드별 상세 페이지를 동시에 받아 점검 결과 목록을 반환한다. codes는 코드 → 제목. rate를 주면 공유 read 예산 위에 audit 상한을 더 건다."""
+	if rate:
+		ratelimit.configure(**{AUDIT_KIND: (rate, max(1.0, rate * 2))})
+	jar = {c["name"]: c["value"] for c in cookies}
+	semaphore = asyncio.Semaphore(concurrency)
+	timeout = aiohttp.ClientTimeout(total=30)
+	async with aiohttp.ClientSession(cookies=jar, timeout=timeout, headers={"User-Agent": USER_AGENT}) as session:
+		if my_album_pages:
+			for album in await _list_my_albums(session, semaphore, my_album_pages):
+				codes.setdefault(album["code"], album["title"])
+
+		tasks = [asyncio.ensure_future(_audit_one(session, code, semaphore)) for code in codes]
+		results = []
+		for done, task in enumerate(asyncio.as_completed(tasks), start=1):
+			result = await task
+			result["title"] = codes.get(result["code"], "")
+			results.append(result)
+			if progress:
+				sys.stderr.write(f"\r점검 {done}/{len(tasks)}")
+				sys.stderr.flush()
+		if progress and tasks:
+			sys.stderr.write("\n")
+	results.sort(key=lambda r: ("complete", "incomplete", "empty", "error").index(r["status"]), reverse=True)
+	return results
+
+
+def codes_from_history(path=None) -> dict:
+	"""실행 기록에 남은 앨범 코드 → 제목."""
+	return {r["album_code"]: r.get("title", "") for r in catalog.load_history(path) if r.get("album_code")}
+
+
+def main():
+	"""보유 앨범의 ISRC/UCI 누락을 점검하고 보고서를 남긴다. 누락·오류가 있으면 종료코드 1."""
+	parser = argparse.ArgumentParser(description="MIMS 앨범 ISRC/UCI 누락 일괄 점검 (HTTP)")
+	parser.add_argument("codes", nargs="*", help="점검할 앨범 코드")
+	parser.add_argument("--codes-file", help="앨범 코드가 한 줄에 하나씩 있는 파일")
+	parser.add_argument("--no-history", action="store_true", help="실행 기록의 앨범 코드를 포함하지 않음")
+	parser.add_argument("--my-album-pages", type=int, default=0, help="My앨범 목록에서 코드를 모을 최대 페이지 수")
+	parser.add_argument("--cookies", default=os.getenv(COOKIES_ENV) or DEFAULT_COOKIES, help="로그인 쿠키 JSON (없으면 브라우저로 로그인해 만든다)")
+	parser.add_argument("--concurrency", type=int, default=8, help="동시 요청 수")
+	parser.add_argument("--rate", type=float, default=None, help="감사 요청의 초당 상한 (공유 read 예산은 그대로 지키며 더 낮추기만 한다)")
+	parser.add_argument("--report", default=DEFAULT_REPORT, help="보고서 JSON 경로")
+	args = parser.parse_args()
+
+	if aiohttp is None:
+		events.error("aiohttp가 설치되어 있지 않습니다. pip install aiohttp 후 다시 실행하세요.")
+		return 2
+
+	codes = {} if args.no_history else codes_from_history()
+	for code in args.codes:
+		codes.setdefault(code, "")
+	if args.codes_file:
+		with open(args.codes_file, encoding="utf-8") as f:
+			for line in f:
+				if line.strip():
+					codes.setdefault(line.strip(), "")
+
+	if os.path.exists(args.cookies):
+		cookies = load_cookies(args.cookies)
+	else:
+		load_dotenv()
+		mims_id, mims_password = os.getenv("MIMS_ID"), os.getenv("MIMS_PASSWORD")
+		if not mims_id or not mims_password:
+			events.error("쿠키 파일이 없고 환경변수 MIMS_ID/MIMS_PASSWORD도 설정되지 않았습니다.")
+			return 2
+		cookies = browser_cookies(mims_id, mims_password)
+		save_cookies(cookies, args.cookies)
+
+	if not codes and not args.my_album_pages:
+		events.error("점검할 앨범 코드가 없습니다. 코드를 지정하거나 --my-album-pages를 쓰세요.")
+		return 2
+
+	started = time.perf_counter()
+	results = asyncio.run(run_audit(codes, cookies, args.concurrency, args.rate, args.my_album_pages))
+	elapsed = time.perf_counter() - started
+
+	with open(args.report, "w", encoding="utf-8") as f:
+		json.dump({"audited_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "elapsed": round(elapsed, 2), "albums": results}, f, ensure_ascii=False, indent=1)
+
+	counts = {s: sum(1 for r in results if r["status"] == s) for s in ("complete", "incomplete", "empty", "error")}
+	for r in results:
+		if r["status"] == "incomplete":
+			tracks = ", ".join(f"#{m['track_seq']}{'' if m['isrc'] else ' ISRC'}{'' if m['uci'] else ' UCI'}" for m in r["missing"])
+			events.warning(f"{r['code']} {r['title']}: {r['tracks']}곡 중 누락 {len(r['missing'])}곡 ({tracks})", step="audit")
+		elif r["status"] in ("empty", "error"):
+			events.warning(f"{r['code']} {r['title']}: {r.get('error') or '코드 표가 비어 있음'}", step="audit")
+	events.info(
+		f"점검 {len(results)}개 앨범 ({elapsed:.1f}s): 완료 {counts['complete']} · 누락 {counts['incomplete']} · "
+		f"빈 표 {counts['empty']} · 오류 {counts['error']} → {args.report}",
+		step="audit", **counts,
+	)
+	return 0 if counts["complete"] == len(results) else 1
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,685 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import re
+
+from dotenv import load_dotenv
+
+import events
+import metrics
+import ratelimit
+import netcapture
+import page_parsers
+from catalog import append_history
+from workbook import read_album, parse_duration_column
+import register_album
+from register_album import LOGIN_URL, ALBUM_REGISTER_URL, ALBUM_VIEW_URL, prepare_upload
+
+try:
+	from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
+except ImportError:  # --backend playwright에서만 필요하다
+	async_playwright = None
+	PlaywrightTimeout = TimeoutError
+
+# 등록·발급 단계(login, 업로드, 상세 진입, 재생시간, 중복확인, 권리정보, My앨범, 발급) 아래에 브라우저 백엔드를 둔다.
+# selenium은 기존 register_album 함수를 드라이버별 스레드에서 그대로 돌리고, playwright는 같은 단계를 async API로
+# 구현해 한 프로세스·한 브라우저 안에서 앨범마다 브라우저 컨텍스트를 따로 쓴다(자동 대기, 명령마다 HTTP 왕복 없음).
+
+BACKENDS = ("selenium", "playwright")
+OK_BUTTON = "button:text-is('확인'), button:text-is('확 인')"
+MODAL_ROWS = "#search-right-list tbody tr, .modal-body table tbody tr"
+COUNT_CODES_JS = """([selector, expected]) => {
+	const th = [...document.querySelectorAll('th')].find(t => t.textContent.includes('ISRC/Music.UCI'));
+	const table = th && th.closest('table');
+	return !!table && table.querySelectorAll(selector).length >= expected;
+}"""
+
+ALBUM_SECONDS = metrics.Histogram("mims_backend_album_seconds", "백엔드별 앨범 하나(등록·발급) 소요시간", ("backend",))
+
+
+class Session:
+	"""로그인된 브라우저 하나(셀레니움 드라이버 또는 플레이라이트 컨텍스트)에서 등록·발급 단계를 수행한다."""
+
+	backend = ""
+
+	async def login(self, mims_id: str, mims_password: str) -> bool:
+		raise NotImplementedError
+
+	async def upload(self, upload_path: str) -> None:
+		raise NotImplementedError
+
+	async def open_detail(self, album_title=None) -> None:
+		raise NotImplementedError
+
+	async def fill_durations(self, excel_path: str, durations) -> None:
+		raise NotImplementedError
+
+	async def save_last_track(self) -> None:
+		raise NotImplementedError
+
+	async def meta_confirm(self) -> bool:
+		raise NotImplementedError
+
+	async def apply_rights(self) -> None:
+		raise NotImplementedError
+
+	async def find_album_code(self, album_title=None):
+		raise NotImplementedError
+
+	async def issue_codes(self, album_code: str, verify_mode: str = "smart"):
+		raise NotImplementedError
+
+	async def close(self) -> None:
+		raise NotImplementedError
+
+
+# ----- selenium -----
+class SeleniumSession(Session):
+	"""기존 register_album 단계 함수를 드라이버 하나에 묶어 스레드에서 실행한다. 앨범·단계 문맥은 스레드로 따라간다."""
+
+	backend = "selenium"
+
+	def __init__(self, driver):
+		self.driver = driver
+
+	async def _call(self, fn, *args):
+		return await asyncio.to_thread(fn, self.driver, *args)
+
+	async def login(self, mims_id, mims_password):
+		return await self._call(register_album.login, mims_id, mims_password)
+
+	async def upload(self, upload_path):
+		await self._call(register_album._upload_excel, upload_path)
+
+	async def open_detail(self, album_title=None):
+		await self._call(register_album._open_uploaded_album, album_title)
+
+	async def fill_durations(self, excel_path, durations):
+		await self._call(register_album._fill_durations_from_excel, excel_path, durations)
+
+	async def save_last_track(self):
+		await self._call(register_album._save_next_on_last_track)
+
+	async def meta_confirm(self):
+		return await self._call(register_album._handle_meta_confirm)
+
+	async def apply_rights(self):
+		await self._call(register_album._apply_rights_and_register)
+
+	async def find_album_code(self, album_title=None):
+		return await self._call(register_album.find_album_code, album_title)
+
+	async def issue_codes(self, album_code, verify_mode="smart"):
+		return await self._call(register_album.issue_album, album_code, verify_mode)
+
+	async def close(self):
+		await asyncio.to_thread(self.driver.quit)
+
+
+class SeleniumBackend:
+	name = "selenium"
+
+	def __init__(self, headless: bool = False):
+		self.headless = headless
+
+	async def start(self) -> None:
+		pass
+
+	async def new_session(self) -> Session:
+		return SeleniumSession(await asyncio.to_thread(register_album.create_driver, self.headless))
+
+	async def close(self) -> None:
+		pass
+
+
+# ----- playwright -----
+class PlaywrightSession(Session):
+	"""플레이라이트 브라우저 컨텍스트 하나. 요소 대기는 로케이터의 자동 대기에 맡기고, 알림창은 모두 수락하며 문구를 모은다."""
+
+	backend = "playwright"
+
+	def __init__(self, context, page):
+		self.context = context
+		self.page = page
+		self.alerts = []
+		page.on("dialog", self._on_dialog)
+
+	async def _on_dialog(self, dialog) -> None:
+		self.alerts.append(dialog.message)
+		events.info(f"알림 감지: {dialog.message}", kind="alert")
+		await dialog.accept()
+
+	async def _goto(self, url: str) -> None:
+		await ratelimit.acquire_async("read")
+		await self.page.goto(url)
+
+	async def _click(self, target, kind: str = "read", **kwargs) -> None:
+		locator = self.page.locator(target) if isinstance(target, str) else target
+		await ratelimit.acquire_async(kind)
+		await locator.click(**kwargs)
+
+	async def _optional_click(self, selector: str, timeout: float, kind: str = None) -> bool:
+		"""있으면 누른다. kind를 주면 서버로 요청이 나가는 클릭이라 속도 제한을 먼저 지킨다."""
+		try:
+			locator = self.page.locator(selector).first
+			if kind:
+				await locator.wait_for(timeout=timeout * 1000)
+				await ratelimit.acquire_async(kind)
+			await locator.click(timeout=timeout * 1000)
+			return True
+		except PlaywrightTimeout:
+			return False
+
+	async def login(self, mims_id, mims_password):
+		await self._goto(LOGIN_URL)
+		try:
+			await self.page.fill("#inputEmail", mims_id)
+			await self.page.fill("#inputPwd", mims_password)
+			await self._click("#login-btn", kind="login")
+			await self.page.wait_for_selector('a[href="/mypage/album"]', state="attached")
+			events.info("로그인 성공!")
+			return True
+		except Exception as e:
+			events.warning(f"로그인 실패: {e}")
+			return False
+
+	async def upload(self, upload_path):
+		page = self.page
+		await self._goto(ALBUM_REGISTER_URL)
+		events.info("앨범등록 페이지 진입 완료!")
+		await page.click("#register-excel-btn")
+		await page.wait_for_selector("#excel-card:not(.d-none)", state="attached")
+		if not os.path.exists(upload_path):
+			raise FileNotFoundError(f"엑셀 파일을 찾을 수 없습니다: {upload_path}")
+		await page.set_input_files("#mims-excel-upload", upload_path)
+		events.info(f"파일 선택 완료: {upload_path}")
+		await page.wait_for_selector("#excel-card tbody tr", state="attached")
+		pattern = re.compile(netcapture.upload_pattern())
+		try:
+			async with page.expect_response(lambda r: r.request.resource_type in ("xhr", "fetch") and bool(pattern.search(r.url)), timeout=30_000) as info:
+				await self._click("#excel-card button:has(span.fa-upload)", kind="upload")
+				events.info("업로드 버튼 클릭 완료. 업로드 진행 대기...")
+			response = await self._captured(await info.value)
+		except PlaywrightTimeout:
+			events.warning("업로드 응답을 찾지 못했지만 다음 단계로 진행합니다.")
+			return
+		ok, message = netcapture.verdict(response)
+		if ok:
+			events.info(f"업로드 완료 감지! (HTTP {response['status']}) {message}".rstrip(), url=response["url"])
+			return
+		if ok is None:
+			events.info(f"업로드 응답으로 성패를 판단할 수 없어 성공 배지로 확인합니다 (HTTP {response['status']}).", url=response["url"])
+			try:
+				await page.wait_for_selector("#excel-card .badge-success", state="attached", timeout=5_000)
+				events.info("업로드 완료 감지!")
+			except PlaywrightTimeout:
+				events.warning("업로드 성공 배지를 확인하지 못했지만 다음 단계로 진행합니다.")
+			return
+		errors = netcapture.validation_errors(response["json"])
+		for error in errors:
+			events.error(f"업로드 검증 오류: {error}")
+		raise register_album.UploadRejected(message or f"HTTP {response['status']}", errors)
+
+	@staticmethod
+	async def _captured(response) -> dict:
+		"""playwright 응답을 netcapture.verdict가 읽는 딕셔너리 모양으로 바꾼다."""
+		body = ""
+		try:
+			body = await response.text()
+		except Exception:
+			pass
+		try:
+			payload = json.loads(body)
+		except ValueError:
+			payload = None
+		return {"url": response.url, "status": response.status, "failed": None, "body": body, "json": payload}
+
+	async def open_detail(self, album_title=None):
+		page = self.page
+		await self._optional_click("#search-btn", 10)
+		if album_title:
+			links = page.locator(f"xpath={register_album.UPLOADED_ALBUM_LINKS_XPATH}")
+			await links.first.wait_for(state="attached", timeout=15_000)
+			titles = await links.all_inner_texts()
+			matched = [i for i, t in enumerate(titles) if register_album.same_title(t, album_title)]
+			if not matched:
+				raise Exception(f"업로드한 앨범을 목록에서 찾지 못했습니다: {album_title}")
+			link = links.nth(matched[0])
+		else:
+			link = page.locator("xpath=//div[@id='table']//table//tbody/tr[1]/td[3]/a[contains(@class,'go-register')]")
+		title = await link.inner_text(timeout=15_000)
+		await self._click(link)
+		events.info(f"상세등록 페이지로 이동 중... (앨범명: {title})")
+		await page.wait_for_url("**/mypage/meta/register/**", timeout=20_000)
+		events.info("상세등록 페이지 진입 완료!")
+		try:
+			await page.wait_for_selector("#track-list", state="attached", timeout=5_000)
+		except PlaywrightTimeout:
+			# 앨범정보 필수값 점검은 셀레니움 경로(_check_required_and_go_next)에만 있다. 여기서는 곡정보 탭으로 넘어가 본다.
+			await self._click("#meta-next-album-btn", kind="upload")
+			await page.wait_for_selector("#track-list", state="attached")
+
+	async def _ensure_tracks_tab(self) -> None:
+		active = await self.page.locator("#meta-tracks.show.active").count()
+		if not active:
+			await self.page.click("#metaTab a[data-target='#meta-tracks']")
+			await self.page.wait_for_selector("#meta-tracks.show.active", state="attached")
+
+	async def _open_track(self, row, seq: str) -> None:
+		await self._click(row.locator(register_album.MetaRegisterPage.TRACK_LINK[1]))
+		if seq:
+			await self.page.wait_for_function("seq => document.getElementById('importSeq').value === seq", arg=seq)
+
+	async def _save_next(self) -> None:
+		await self._click("#update-meta-track-next-track-btn", kind="upload")
+
+	async def fill_durations(self, excel_path, durations):
+		page = self.page
+		await self._ensure_tracks_tab()
+		rows = page.locator("#track-list tbody tr")
+		await rows.first.wait_for(state="attached")
+		total = await rows.count()
+		seqs = await rows.evaluate_all("rows => rows.map(r => r.getAttribute('data-import_seq') || '')")
+		if durations is None:
+			durations = parse_duration_column(excel_path)
+
+		missing = page_parsers.missing_durations(await page.content(), total)
+		targets = list(range(total)) if missing is None else missing
+		if missing is not None:
+			events.info(f"업로드 후 재생시간 확인: {total - len(missing)}/{total}개 트랙 반영됨", missing=[i + 1 for i in missing])
+			if not targets:
+				events.info("모든 트랙에 재생시간이 있어 곡별 입력을 건너뜁니다.")
+				return
+
+		updated = 0
+		current = None
+		for pos, idx in enumerate(targets):
+			track_started = time.perf_counter()
+			hms = durations.hms[idx] if idx < durations.track_count else None
+			next_idx = targets[pos + 1] if pos + 1 < len(targets) else None
+			try:
+				if current != idx:
+					await self._open_track(rows.nth(idx), seqs[idx])
+				values = [await page.input_value(f"#{fid}") for fid in ("duration_hh", "duration_mm", "duration_ss", "duration")]
+				already_filled = bool(values[3].strip() or all(v.strip() for v in values[:3]))
+				if not already_filled and hms:
+					for fid, value in zip(("duration_hh", "duration_mm", "duration_ss"), hms):
+						await page.fill(f"#{fid}", value)
+						await page.dispatch_event(f"#{fid}", "keyup")
+						await page.dispatch_event(f"#{fid}", "change")
+					await page.eval_on_selector(
+						"#duration",
+						"(el, v) => { if (!el.value) { el.value = v; ['change','input'].forEach(e => el.dispatchEvent(new Event(e, {bubbles: true}))); } }",
+						":".join(hms),
+					)
+					updated += 1
+					events.debug(f"재생시간 입력 {':'.join(hms)}", track_seq=idx + 1)
+				elif already_filled:
+					events.debug("재생시간이 이미 입력되어 있어 건너뜁니다.", track_seq=idx + 1)
+			except Exception as e:
+				events.warning(f"{idx+1}번째 트랙 재생시간 처리 중 요소 탐색/입력 실패: {e}", track_seq=idx + 1)
+
+			current = None
+			try:
+				await self._save_next()
+				if idx < total - 1:
+					if next_idx == idx + 1:
+						await page.wait_for_function("seq => document.getElementById('importSeq').value === seq", arg=seqs[idx + 1], timeout=6_000)
+						current = next_idx
+				elif await self._optional_click(OK_BUTTON, 5):
+					events.info("모달 '확인' 버튼 클릭")
+			except Exception as e:
+				events.warning(f"저장 후 다음으로 클릭 실패: {e}", track_seq=idx + 1)
+			events.debug("트랙 처리 완료", kind="track", track_seq=idx + 1, duration=time.perf_counter() - track_started)
+		events.info(f"재생시간 입력 완료: {updated}개 트랙")
+
+	async def save_last_track(self):
+		await self._ensure_tracks_tab()
+		rows = self.page.locator("#track-list tbody tr")
+		if not await rows.count():
+			events.warning("수록곡 목록이 비어 있어 저장-다음 수행을 건너뜁니다.")
+			return
+		last = rows.last
+		try:
+			await self._open_track(last, await last.get_attribute("data-import_seq") or "")
+		except Exception as e:
+			events.warning(f"마지막 트랙 활성화 실패: {e}")
+		try:
+			await self._save_next()
+			events.info("마지막 곡에서 '저장 후 다음으로' 클릭")
+			if await self._optional_click(OK_BUTTON, 5):
+				events.info("모달 '확인' 버튼 클릭")
+		except Exception as e:
+			events.warning(f"마지막 곡 저장-다음 클릭 실패: {e}")
+
+	async def meta_confirm(self):
+		page = self.page
+		try:
+			await page.wait_for_selector("#meta-confirm", state="attached")
+			await page.wait_for_timeout(300)
+			titles = page_parsers.parse_search_tracks(await page.content())
+			if titles:
+				events.warning(f"검색앨범 수록곡 {len(titles)}개 발견 → 화면 유지")
+				for i, title in enumerate(titles, start=1):
+					events.info(f"검색앨범 곡 {i}: {title}", track_seq=i)
+				return False
+			events.info("검색앨범 수록곡 없음 → 다음 단계로 진행")
+			if not await self._optional_click("#meta-next-right-new-btn, #meta-next-right-dup-btn", 3, kind="upload"):
+				events.warning("다음 버튼을 찾지 못했습니다. 진행을 중단합니다.")
+				return False
+			try:
+				await page.wait_for_selector("#right-reg-btn", state="attached", timeout=3_000)
+				events.info("권리정보 탭 진입 완료")
+			except PlaywrightTimeout:
+				events.warning("권리정보 탭 진입 확인 실패(타임아웃)")
+			return True
+		except Exception as e:
+			events.warning(f"앨범중복확인 처리 실패: {e}")
+			return False
+
+	async def _select_member(self, category: str, label: str) -> None:
+		"""권리정보 탭에서 제작(P)·유통(S)회원 검색 모달을 열어 '케이저'(이메일 metalfocus*) 행을 선택한다."""
+		page = self.page
+		try:
+			await self._optional_click("#metaTab a[data-target='#meta-right']", 2)
+			await self._click(f"#track-right-apply button.search-group[data-group-category='{category}']", timeout=5_000)
+			modal = page.locator("#rightModal")
+			await modal.wait_for(state="visible", timeout=5_000)
+			events.info(f"{label} 검색 모달 열림")
+			await modal.locator("#searchValue, input[type='text']").first.fill("케이저")
+			await self._click(modal.locator("#modal-right-search, button:text-is('검색')").first)
+			row = modal.locator(MODAL_ROWS).filter(has_text="metalfocus").first
+			await row.wait_for(timeout=5_000)
+			await self._click(row.locator(".select-right, button:has-text('선택'), button:has-text('선 택'), button:has-text('선 정')").first, kind="upload")
+			events.info(f"{label}: metalfocus* 항목 선택 완료")
+			try:
+				await modal.wait_for(state="hidden", timeout=6_000)
+			except PlaywrightTimeout:
+				await modal.locator(".modal-footer button, .close").first.click(timeout=3_000)
+		except Exception as e:
+			events.warning(f"{label} 자동 선택 실패: {e}")
+
+	async def apply_rights(self):
+		try:
+			await self.page.wait_for_selector("#right-reg-btn", state="attached", timeout=3_000)
+		except PlaywrightTimeout:
+			return
+		await self._select_member("P", "제작회원")
+		await self._select_member("S", "유통회원")
+		try:
+			await self._click("#right-reg-btn", kind="upload", timeout=5_000)
+			events.info("등록 버튼 클릭")
+			await self.page.wait_for_timeout(500)
+		except Exception as e:
+			events.warning(f"등록 버튼 클릭 실패: {e}")
+
+	async def find_album_code(self, album_title=None):
+		with events.step("my_album"):
+			try:
+				await self._click('a[href="/mypage/album"] >> nth=0')
+				await self.page.wait_for_selector("div.mims-pmb", state="attached")
+				albums = page_parsers.parse_album_cards(await self.page.content())
+			except Exception as e:
+				events.warning(f"앨범을 찾는 중 오류 발생: {e}")
+				return None
+		events.info(f"현재 페이지에서 {len(albums)}개의 앨범을 찾았습니다.")
+		if not albums:
+			return None
+		if album_title:
+			for album in albums:
+				if register_album.same_title(album["title"], album_title):
+					return album["code"]
+			events.warning(f"My앨범에서 제목이 일치하는 앨범을 찾지 못했습니다: {album_title}")
+			return None
+		return albums[0]["code"]
+
+	async def _counts(self) -> dict:
+		return page_parsers.count_album_code_rows(await self.page.content())
+
+	async def _issue(self, button: str, label: str, selector: str, total: int) -> list:
+		"""발급 버튼을 누르고 표의 해당 코드가 모든 행에 생길 때까지(최대 50초) 기다린다. 받은 알림 문구를 반환한다."""
+		self.alerts = []
+		await self._click(button, kind="issue")
+		events.info(f"{label} 발급 확인 완료. 페이지 반영 대기...")
+		try:
+			await self.page.wait_for_function(COUNT_CODES_JS, arg=[selector, total], timeout=50_000, polling=300)
+		except PlaywrightTimeout:
+			events.warning(f"{label} 발급 결과 반영이 확인되지 않았습니다. 알럿 메시지: " + " / ".join(self.alerts), alerts=self.alerts)
+		return self.alerts
+
+	async def _reload(self) -> None:
+		await ratelimit.acquire_async("read")
+		await self.page.reload()
+		await self.page.wait_for_selector("xpath=" + register_album.TRACK_LIST_XPATH, state="attached", timeout=20_000)
+
+	async def issue_codes(self, album_code, verify_mode="smart"):
+		with events.step("issue", album_code=album_code):
+			try:
+				await self._goto(ALBUM_VIEW_URL.format(code=album_code))
+				await self.page.wait_for_selector("xpath=" + register_album.TRACK_LIST_XPATH, state="attached", timeout=20_000)
+				counts = await self._counts()
+				total = counts["rows"]
+				need_isrc, need_uci = counts["isrc"] < total, counts["uci"] < total
+				if not need_isrc and not need_uci:
+					events.info("ISRC/UCI가 모두 존재합니다. 코드만 추출합니다.")
+					return page_parsers.parse_album_codes(await self.page.content())
+				if need_isrc:
+					alerts = await self._issue("#setTrackIsrc", "ISRC", "span.g-bg-darkred[data-clipboard-data]", total)
+					errors = register_album.issue_alert_errors(alerts)
+					if errors and need_uci:
+						# Selenium 발급과 같이 ISRC 오류 알림이면 UCI를 누르지 않는다
+						events.warning("ISRC 발급 경고/오류 감지: " + " / ".join(errors), alerts=errors)
+						events.warning("ISRC 발급이 실패해 UCI 발급을 건너뜁니다.")
+						need_uci = False
+					elif need_uci:
+						await self._reload()
+				if need_uci:
+					await self._issue("#setTrackUCI", "UCI", "span.g-bg-blue[data-clipboard-data]", total)
+
+				# 발급 버튼 대기가 이미 표 반영을 확인했으므로 smart는 누락이 있을 때만 새로고침한다
+				refreshes = 0 if verify_mode == "smart" else 2
+				for _ in range(refreshes):
+					await self._reload()
+				codes = page_parsers.parse_album_codes(await self.page.content())
+				delay = 0.5
+				while verify_mode == "smart" and not register_album._codes_complete(codes, total) and refreshes < 3:
+					await asyncio.sleep(delay)
+					delay *= 2
+					refreshes += 1
+					await self._reload()
+					codes = page_parsers.parse_album_codes(await self.page.content()) or codes
+				found = len(codes) if codes else 0
+				events.info(f"발급 결과 검증: 새로고침 {refreshes}회 후 {found}/{total}개 확인")
+				return codes
+			except Exception as e:
+				events.error(f"코드 확인/발급 중 예상치 못한 오류 발생: {e}")
+				return None
+
+	async def close(self):
+		await self.context.close()
+
+
+class PlaywrightBackend:
+	"""크로미움 하나를 띄우고 세션마다 새 브라우저 컨텍스트(쿠키·저장소가 분리된 탭 묶음)를 만든다."""
+
+	name = "playwright"
+
+	def __init__(self, headless: bool = False, timeout: float = 10):
+		self.headless = headless
+		self.timeout = timeout
+		self._playwright = None
+		self.browser = None
+
+	async def start(self) -> None:
+		self._playwright = await async_playwright().start()
+		self.browser = await self._playwright.chromium.launch(headless=self.headless)
+
+	async def new_session(self) -> Session:
+		context = await self.browser.new_context()
+		context.set_default_timeout(self.timeout * 1000)
+		return PlaywrightSession(context, await context.new_page())
+
+	async def close(self) -> None:
+		if self.browser is not None:
+			await self.browser.close()
+		if self._playwright is not None:
+			await self._playwright.stop()
+
+
+def make_backend(name: str, headless: bool = False):
+	if name == "playwright":
+		if async_playwright is None:
+			raise RuntimeError("playwright가 설치되어 있지 않습니다. pip install playwright && playwright install chromium 후 다시 실행하세요.")
+		return PlaywrightBackend(headless)
+	if name == "selenium":
+		return SeleniumBackend(headless)
+	raise ValueError(f"알 수 없는 백엔드: {name} (사용 가능: {', '.join(BACKENDS)})")
+
+
+# ----- 앨범 처리 -----
+async def register_album_async(session: Session, excel_path: str, issue: bool = True, verify_mode: str = "smart") -> dict:
+	"""register_workbook·goto_album_register와 같은 순서로 한 앨범을 등록하고 발급한다. 결과 요약 딕셔너리를 반환한다."""
+	started = time.perf_counter()
+	excel_path = os.path.abspath(excel_path)
+	album = read_album(excel_path)
+	result = {"excel": excel_path, "title": album["title"], "backend": session.backend, "status": "완료", "code": None, "codes": None}
+	with events.album_context(album["title"]) as album_state:
+		try:
+			with events.step("normalise"):
+				upload_path = await asyncio.to_thread(prepare_upload, excel_path)
+			durations = parse_duration_column(excel_path)
+			with events.step("upload"):
+				await session.upload(upload_path)
+			with events.step("open_detail"):
+				await session.open_detail(album["title"])
+			with events.step("durations"):
+				await session.fill_durations(excel_path, durations)
+			with events.step("save_last_track"):
+				await session.save_last_track()
+			with events.step("meta_confirm"):
+				proceed = await session.meta_confirm()
+			if not proceed:
+				events.warning("검색앨범 수록곡이 있어 자동 진행을 중단합니다.")
+				album_state["status"] = "중단"
+			else:
+				with events.step("rights"):
+					await session.apply_rights()
+				if issue:
+					result["code"] = await session.find_album_code(album["title"])
+					if result["code"]:
+						result["codes"] = await session.issue_codes(result["code"], verify_mode)
+					if result["codes"]:
+						append_history(album, result["code"], result["codes"])
+					else:
+						album_state["status"] = "코드 없음"
+		except Exception as e:
+			album_state["status"] = "실패"
+			events.error(f"앨범 처리 실패: {e}")
+		result["status"] = album_state["status"]
+	result["seconds"] = time.perf_counter() - started
+	ALBUM_SECONDS.observe(result["seconds"], backend=session.backend)
+	return result
+
+
+async def issue_only_async(session: Session, album_code: str, verify_mode: str = "smart") -> dict:
+	"""등록 없이 앨범 코드 하나의 발급·추출만 한다."""
+	started = time.perf_counter()
+	codes = await session.issue_codes(album_code, verify_mode)
+	seconds = time.perf_counter() - started
+	ALBUM_SECONDS.observe(seconds, backend=session.backend)
+	return {"excel": None, "title": album_code, "backend": session.backend, "status": "완료" if codes else "코드 없음", "code": album_code, "codes": codes, "seconds": seconds}
+
+
+async def run_backend(name: str, jobs: list, mims_id: str, mims_password: str, concurrency: int = 1, headless: bool = False, issue: bool = True, verify_mode: str = "smart") -> dict:
+	"""백엔드 하나로 작업(엑셀 경로 또는 ("code", 앨범코드))을 concurrency개 세션에 나눠 처리한다."""
+	backend = make_backend(name, headless)
+	await backend.start()
+	pending = asyncio.Queue()
+	for job in jobs:
+		pending.put_nowait(job)
+	results = []
+
+	async def worker(index: int) -> None:
+		session = await backend.new_session()
+		try:
+			if not await session.login(mims_id, mims_password):
+				events.error(f"[{name}-{index}] 로그인 실패")
+				return
+			while not pending.empty():
+				job = pending.get_nowait()
+				if isinstance(job, tuple):
+					results.append(await issue_only_async(session, job[1], verify_mode))
+				else:
+					results.append(await register_album_async(session, job, issue, verify_mode))
+		finally:
+			await session.close()
+
+	started = time.perf_counter()
+	try:
+		await asyncio.gather(*(worker(i) for i in range(max(1, min(concurrency, len(jobs))))))
+	finally:
+		await backend.close()
+	return {"backend": name, "wall": time.perf_counter() - started, "results": results}
+
+
+def print_summary(runs: list) -> None:
+	"""백엔드별 처리 수·성공 수·전체 시간·앨범당 평균/중앙값을 표로 출력한다."""
+	print(f"{'backend':<12} {'albums':>7} {'ok':>5} {'wall s':>9} {'s/album':>9} {'p50 s':>8}")
+	for run in runs:
+		seconds = sorted(r["seconds"] for r in run["results"]) or [0.0]
+		ok = sum(1 for r in run["results"] if r["status"] == "완료")
+		print(
+			f"{run['backend']:<12} {len(run['results']):>7} {ok:>5} {run['wall']:>9.1f} "
+			f"{sum(seconds) / len(seconds):>9.1f} {seconds[len(seconds) // 2]:>8.1f}"
+		)
+
+
+def main():
+	"""--backend로 고른 브라우저 백엔드로 앨범을 처리한다. --bench면 두 백엔드로 같은 작업을 돌려 비교한다."""
+	parser = argparse.ArgumentParser(description="브라우저 백엔드(selenium/playwright)로 앨범 등록·발급")
+	parser.add_argument("excel_paths", nargs="*", help="등록할 엑셀 파일들")
+	parser.add_argument("--codes", nargs="*", default=[], help="등록 없이 발급·추출만 할 앨범 코드들")
+	parser.add_argument("--backend", choices=BACKENDS, default="selenium", help="브라우저 백엔드")
+	parser.add_argument("--bench", action="store_true", help="selenium과 playwright로 같은 작업을 차례로 돌려 비교 (엑셀은 백엔드마다 새로 등록된다)")
+	parser.add_argument("-c", "--concurrency", type=int, default=1, help="동시에 처리할 세션 수 (playwright: 컨텍스트, selenium: 드라이버)")
+	parser.add_argument("--headless", action="store_true", help="헤드리스로 실행")
+	parser.add_argument("--no-issue", action="store_true", help="등록까지만 하고 발급은 하지 않음")
+	parser.add_argument("--verify-mode", choices=("smart", "double"), default="smart", help="발급 결과 검증 방식")
+	parser.add_argument("--out", help="결과 JSON 저장 경로")
+	args = parser.parse_args()
+
+	load_dotenv()
+	events.setup()
+	mims_id, mims_password = os.getenv("MIMS_ID"), os.getenv("MIMS_PASSWORD")
+	if not mims_id or not mims_password:
+		events.error("환경변수 MIMS_ID/MIMS_PASSWORD가 설정되지 않았습니다. .env를 확인하세요.")
+		return 1
+	jobs = list(args.excel_paths) + [("code", c) for c in args.codes]
+	if not jobs:
+		parser.error("엑셀 경로나 --codes 중 하나는 필요합니다.")
+
+	runs = []
+	try:
+		for name in (BACKENDS if args.bench else (args.backend,)):
+			runs.append(asyncio.run(run_backend(
+				name, jobs, mims_id, mims_password, args.concurrency, args.headless, not args.no_issue, args.verify_mode,
+			)))
+	except RuntimeError as e:
+		events.error(str(e))
+		return 2
+	finally:
+		events.shutdown()
+
+	print_summary(runs)
+	if args.out:
+		with open(args.out, "w", encoding="utf-8") as f:
+			json.dump(runs, f, ensure_ascii=False, indent=1)
+		print(f"결과 저장: {args.out}")
+	return 0 if all(r["status"] == "완료" for run in runs for r in run["results"]) else 1
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,180 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import datetime as dt
+
+from openpyxl import load_workbook
+
+import page_parsers
+from fixtures import load_fixtures
+from register_album import _parse_excel_duration_to_hms, DEFAULT_EXCEL_FILENAME
+
+# 파싱/추출 핫패스 마이크로벤치마크. 결과를 기준선(JSON)으로 저장하고 비교할 수 있다.
+
+DEFAULT_BASELINE = "bench_baseline.json"
+SAMPLE_WORKBOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), DEFAULT_EXCEL_FILENAME)
+
+
+def _synthetic_album_detail(track_count: int) -> str:
+	"""앨범 상세 페이지의 ISRC/Music.UCI 표를 흉내 낸 HTML을 만든다."""
+	rows = []
+	for i in range(1, track_count + 1):
+		rows.append(
+			f'<tr><td>{i}</td><td>1</td><td>{i}</td><td><a href="#">곡 {i}</a></td><td>박성태</td>'
+			f'<td><span class="badge g-bg-darkred" data-clipboard-data="KRA40250{i:04d}">ISRC</span> '
+			f'<span class="badge g-bg-blue" data-clipboard-data="G7100125{i:06d}">UCI</span></td></tr>'
+		)
+	return (
+		"<html><body><div class='container'><table class='table'><thead><tr><th>No</th><th>CD</th><th>Track</th>"
+		"<th>곡명</th><th>가수</th><th>ISRC/Music.UCI</th></tr></thead><tbody>"
+		+ "".join(rows)
+		+ "</tbody></table></div></body></html>"
+	)
+
+
+def _make_workbook(directory: str, track_count: int) -> str:
+	"""샘플 MIMS 엑셀을 복제해 track_count개 트랙 행을 가진 워크북을 만든다."""
+	wb = load_workbook(SAMPLE_WORKBOOK)
+	ws = wb.active
+	for idx in range(track_count):
+		row = 18 + idx
+		ws.cell(row=row, column=1, value="1")
+		ws.cell(row=row, column=2, value=str(idx + 1))
+		ws.cell(row=row, column=5, value=f"곡 {idx + 1}")
+		ws.cell(row=row, column=9, value="박성태")
+		ws.cell(row=row, column=11, value="130")
+		ws.cell(row=row, column=14, value=f"00:{(idx % 50) + 1:02d}:{idx % 60:02d}")
+	path = os.path.join(directory, f"bench_{track_count}.xlsx")
+	wb.save(path)
+	return path
+
+
+def _load_workbook_tracks(path: str) -> int:
+	wb = load_workbook(path, data_only=True)
+	ws = wb.active
+	count = sum(1 for v in ws.iter_rows(min_row=18, min_col=14, max_col=14, values_only=True) if v[0] is not None)
+	wb.close()
+	return count
+
+
+def build_cases(tmpdir: str, fixtures_dir=None) -> dict:
+	"""벤치마크 이름 → 인자 없는 호출 함수 목록을 만든다."""
+	cases = {
+		"duration.time": lambda v=dt.time(0, 4, 57): _parse_excel_duration_to_hms(v),
+		"duration.timedelta": lambda v=dt.timedelta(minutes=4, seconds=57): _parse_excel_duration_to_hms(v),
+		"duration.float": lambda v=297 / 86400: _parse_excel_duration_to_hms(v),
+		"duration.mmss": lambda v="04:57": _parse_excel_duration_to_hms(v),
+		"duration.hhmmss": lambda v=" 00:04:57": _parse_excel_duration_to_hms(v),
+	}
+
+	small = SAMPLE_WORKBOOK
+	large = _make_workbook(tmpdir, 200)
+	cases["workbook.load_small"] = lambda: _load_workbook_tracks(small)
+	cases["workbook.load_200"] = lambda: _load_workbook_tracks(large)
+
+	html_12 = _synthetic_album_detail(12)
+	html_200 = _synthetic_album_detail(200)
+	cases["extract.album_detail_12"] = lambda: page_parsers.parse_album_codes(html_12)
+	cases["extract.album_detail_200"] = lambda: page_parsers.parse_album_codes(html_200)
+
+	if fixtures_dir:
+		for i, fx in enumerate(f for f in load_fixtures(fixtures_dir) if f["kind"] == "album_detail"):
+			cases[f"extract.fixture_{i}"] = lambda html=fx["html"]: page_parsers.parse_album_codes(html)
+	return cases
+
+
+def _percentile(sorted_values: list, pct: float) -> float:
+	if not sorted_values:
+		return 0.0
+	k = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * (len(sorted_values) - 1)))))
+	return sorted_values[k]
+
+
+def run_case(fn, samples: int = 50, min_sample_time: float = 0.002) -> dict:
+	"""호출 묶음 크기를 보정한 뒤 샘플별 1회 평균 시간을 모아 ops/s·p50·p99를 계산한다."""
+	fn()
+	number = 1
+	while True:
+		started = time.perf_counter()
+		for _ in range(number):
+			fn()
+		if time.perf_counter() - started >= min_sample_time or number >= 1 << 20:
+			break
+		number *= 2
+
+	per_op = []
+	for _ in range(samples):
+		started = time.perf_counter()
+		for _ in range(number):
+			fn()
+		per_op.append((time.perf_counter() - started) / number)
+	per_op.sort()
+	mean = sum(per_op) / len(per_op)
+	return {
+		"ops_per_sec": 1.0 / mean if mean > 0 else 0.0,
+		"p50_us": _percentile(per_op, 50) * 1e6,
+		"p99_us": _percentile(per_op, 99) * 1e6,
+		"number": number,
+		"samples": samples,
+	}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+	"""기준선 대비 ops/s가 threshold 비율 이상 떨어진 항목 목록을 반환한다."""
+	regressions = []
+	for name, r in results.items():
+		base = baseline.get(name)
+		if not base or not base.get("ops_per_sec"):
+			continue
+		change = r["ops_per_sec"] / base["ops_per_sec"] - 1.0
+		r["change"] = change
+		if change < -threshold:
+			regressions.append(name)
+	return regressions
+
+
+def main():
+	"""벤치마크를 실행해 표로 출력하고, 기준선 저장/비교 결과에 따라 종료코드를 반환한다."""
+	parser = argparse.ArgumentParser(description="MIMS 자동화 파싱/추출 마이크로벤치마크")
+	parser.add_argument("-k", "--filter", default="", help="이름에 이 문자열이 포함된 벤치마크만 실행")
+	parser.add_argument("--samples", type=int, default=50, help="벤치마크별 샘플 수")
+	parser.add_argument("--fixtures", help="capture 스냅샷 디렉터리 (앨범 상세 추출 벤치마크 추가)")
+	parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, help="결과를 기준선 JSON으로 저장")
+	parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="기준선 JSON과 비교")
+	parser.add_argument("--threshold", type=float, default=0.10, help="회귀로 판단할 ops/s 하락 비율")
+	args = parser.parse_args()
+
+	with tempfile.TemporaryDirectory() as tmpdir:
+		cases = build_cases(tmpdir, args.fixtures)
+		results = {}
+		for name, fn in cases.items():
+			if args.filter and args.filter not in name:
+				continue
+			results[name] = run_case(fn, samples=args.samples)
+
+	regressions = []
+	if args.compare:
+		with open(args.compare, encoding="utf-8") as f:
+			regressions = compare(results, json.load(f), args.threshold)
+
+	print(f"{'benchmark':<28} {'ops/s':>12} {'p50(us)':>10} {'p99(us)':>10} {'vs base':>9}")
+	for name, r in results.items():
+		change = f"{r['change']:+.1%}" if "change" in r else "-"
+		flag = "  << 회귀" if name in regressions else ""
+		print(f"{name:<28} {r['ops_per_sec']:>12,.0f} {r['p50_us']:>10.2f} {r['p99_us']:>10.2f} {change:>9}{flag}")
+
+	if args.save:
+		with open(args.save, "w", encoding="utf-8") as f:
+			json.dump({name: {k: r[k] for k in ("ops_per_sec", "p50_us", "p99_us")} for name, r in results.items()}, f, indent=2)
+		print(f"기준선 저장: {args.save}")
+	if regressions:
+		print(f"기준선 대비 {args.threshold:.0%} 이상 느려진 항목: {', '.join(regressions)}")
+		return 1
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
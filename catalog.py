@@ -0,0 +1,100 @@
+import os
+import csv
+import json
+import time
+import threading
+
+# 보유 카탈로그(CSV/JSON)와 지난 실행 기록(JSON Lines)을 같은 앨범 모델(dict)로 읽고 쓴다.
+# 앨범 모델: {"title", "artist", ..., "tracks": [{"title", "artist", "duration", ...}]}
+
+HISTORY_ENV = "MIMS_RUN_HISTORY"
+DEFAULT_HISTORY = "run_history.jsonl"
+
+_history_lock = threading.Lock()
+
+
+def history_path() -> str:
+	"""실행 기록 파일 경로를 반환한다. MIMS_RUN_HISTORY로 바꿀 수 있다."""
+	return os.getenv(HISTORY_ENV) or DEFAULT_HISTORY
+
+
+def _album_from_csv_rows(rows: list) -> list:
+	"""CSV 행(트랙 1개 = 1행)을 앨범 단위로 묶는다. album_ 접두 열은 앨범, 나머지는 트랙 필드가 된다."""
+	albums = {}
+	for row in rows:
+		album_fields = {}
+		track = {}
+		for key, value in row.items():
+			if key is None:
+				continue
+			key = key.strip()
+			value = (value or "").strip()
+			if key.startswith("album_"):
+				album_fields[key[len("album_"):]] = value
+			elif key.startswith("track_"):
+				track[key[len("track_"):]] = value
+			else:
+				track[key] = value
+		album_key = album_fields.get("id") or (album_fields.get("title", ""), album_fields.get("artist", ""))
+		album = albums.get(album_key)
+		if album is None:
+			album = dict(album_fields, tracks=[])
+			albums[album_key] = album
+		if track.get("title"):
+			track["artist"] = track.get("artist") or album.get("artist", "")
+			album["tracks"].append(track)
+	return list(albums.values())
+
+
+def load_catalog(path: str) -> list:
+	"""카탈로그 CSV/JSON을 앨범 모델 목록으로 읽는다."""
+	if path.lower().endswith(".json"):
+		with open(path, encoding="utf-8") as f:
+			data = json.load(f)
+		albums = data.get("albums", []) if isinstance(data, dict) else data
+		for album in albums:
+			album.setdefault("tracks", [])
+			for track in album["tracks"]:
+				track["artist"] = track.get("artist") or album.get("artist", "")
+		return albums
+	with open(path, encoding="utf-8-sig", newline="") as f:
+		return _album_from_csv_rows(list(csv.DictReader(f)))
+
+
+def append_history(album: dict, album_code: str, codes: list, path=None) -> None:
+	"""발급이 끝난 앨범의 트랙·코드를 실행 기록에 한 줄로 추가한다. 트랙과 코드는 순서로 짝짓는다."""
+	tracks = []
+	workbook_tracks = album.get("tracks", [])
+	for i, item in enumerate(codes or []):
+		source = workbook_tracks[i] if i < len(workbook_tracks) else {}
+		tracks.append({
+			"title": item.get("title") or source.get("title", ""),
+			"artist": source.get("artist") or album.get("artist", ""),
+			"duration": source.get("duration"),
+			"isrc": item.get("isrc"),
+			"uci": item.get("uci"),
+		})
+	record = {
+		"album_code": album_code,
+		"title": album.get("title", ""),
+		"artist": album.get("artist", ""),
+		"recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+		"tracks": tracks,
+	}
+	with _history_lock:
+		with open(path or history_path(), "a", encoding="utf-8") as f:
+			f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def load_history(path=None) -> list:
+	"""실행 기록 파일을 앨범 모델 목록으로 읽는다. 파일이 없으면 빈 목록."""
+	path = path or history_path()
+	if not os.path.exists(path):
+		return []
+	records = []
+	with open(path, encoding="utf-8") as f:
+		for line in f:
+			line = line.strip()
+			if line:
+				records.append(json.loads(line))
+	return records
@@ -0,0 +1,302 @@
+import os
+import sys
+import json
+import time
+import queue
+import socket
+import secrets
+import argparse
+import functools
+import threading
+import contextlib
+import socketserver
+import traceback
+from dotenv import load_dotenv
+
+import events
+import metrics
+import ratelimit
+from catalog import append_history
+from workbook import DurationReport
+from preprocess import preprocess_one
+from register_album import create_driver, is_logged_in, register_workbook, find_album_code, issue_album, export_album, MY_ALBUM_URL
+from session import BrowserSession, RecyclePolicy
+from watchdog import Watchdog, parse_budgets
+
+# 로그인된 브라우저 세션을 띄워 둔 채 로컬 소켓으로 작업(등록·발급·코드 내보내기)을 받는 상주 프로세스.
+# 명령 한 번마다 크롬 실행·드라이버 확인·로그인을 반복하지 않고, daemon_client로 붙어 데운 세션에서 바로 처리한다.
+# 요청·응답은 한 줄에 JSON 하나이고, 접속 정보(포트·토큰)는 본인만 읽을 수 있는 상태 파일에 남긴다.
+
+STATE_ENV = "MIMS_DAEMON_FILE"
+DEFAULT_STATE = os.path.join(os.path.expanduser("~"), ".mims_daemon.json")
+HOST = "127.0.0.1"
+IDLE_CHECK_SECONDS = 300
+SESSION_WAIT_SECONDS = 600
+JOB_OPS = ("register", "issue", "export")
+
+JOBS = metrics.Counter("mims_daemon_jobs", "상주 프로세스가 처리한 작업 수", ("op", "status"))
+JOB_SECONDS = metrics.Histogram("mims_daemon_job_seconds", "상주 프로세스 작업 처리 시간(세션 대기 포함)", ("op",))
+
+
+def state_path() -> str:
+	return os.getenv(STATE_ENV) or DEFAULT_STATE
+
+
+class BrowserDaemon:
+	"""로그인된 BrowserSession 풀을 들고 작업 요청을 하나씩 빌려 준 세션에서 처리한다."""
+
+	def __init__(self, mims_id: str, mims_password: str, sessions: int = 1, headless: bool = False, recycle_policy=None, watchdog=None, verify_mode: str = "smart"):
+		self.mims_id = mims_id
+		self.mims_password = mims_password
+		self.size = max(1, sessions)
+		self.factory = functools.partial(create_driver, headless=headless)
+		self.recycle_policy = recycle_policy or RecyclePolicy.from_env()
+		self.watchdog = watchdog or Watchdog()
+		self.verify_mode = verify_mode
+		self.token = secrets.token_hex(16)
+		self.sessions = []
+		self.pool = queue.Queue()
+		self.started = time.time()
+		self.counts = {}
+		self._last_used = {}
+		self._lock = threading.Lock()
+		self._server = None
+
+	def start_sessions(self) -> int:
+		"""세션을 띄워 로그인하고 풀에 넣는다. 로그인된 세션 수를 반환한다."""
+		ready = 0
+		for i in range(self.size):
+			session = BrowserSession(self.mims_id, self.mims_password, f"daemon-{i+1}", self.recycle_policy, self.factory)
+			self.sessions.append(session)
+			if session.start():
+				ready += 1
+			else:
+				events.error(f"[{session.name}] 로그인 실패. 첫 작업 때 다시 시도합니다.", step="daemon")
+			self._last_used[session.name] = time.monotonic()
+			self.pool.put(session)
+		return ready
+
+	def close(self) -> None:
+		for session in self.sessions:
+			session.close()
+
+	@contextlib.contextmanager
+	def _borrow(self):
+		"""풀에서 세션 하나를 빌린다. 모두 사용 중이면 빌릴 수 있을 때까지 기다린다."""
+		try:
+			session = self.pool.get(timeout=SESSION_WAIT_SECONDS)
+		except queue.Empty:
+			raise RuntimeError(f"{SESSION_WAIT_SECONDS}초 동안 빈 세션이 없었습니다.")
+		try:
+			yield session
+		finally:
+			self._last_used[session.name] = time.monotonic()
+			self.pool.put(session)
+
+	def _ensure_ready(self, session: BrowserSession) -> None:
+		"""세션이 죽었거나 오래 쉬었으면 로그인 상태를 확인하고, 필요하면 다시 띄운다."""
+		if session.driver is None:
+			if not session.start():
+				raise RuntimeError("로그인 실패")
+			return
+		if time.monotonic() - self._last_used.get(session.name, 0) < IDLE_CHECK_SECONDS:
+			return
+		try:
+			ratelimit.acquire("read")
+			session.driver.get(MY_ALBUM_URL)
+			ok = is_logged_in(session.driver)
+		except Exception:
+			ok = False
+		if not ok:
+			events.info(f"[{session.name}] 세션이 만료되어 다시 로그인합니다.", step="daemon")
+			if not session.restart():
+				raise RuntimeError("로그인 실패")
+
+	def handle(self, request: dict) -> dict:
+		"""요청 하나를 처리해 응답 dict를 반환한다. 예외는 error로 돌려준다."""
+		op = request.get("op")
+		if request.get("token") != self.token:
+			return {"ok": False, "error": "토큰이 맞지 않습니다."}
+		if op == "status":
+			return {"ok": True, "result": self.status()}
+		if op == "shutdown":
+			threading.Thread(target=self._server.shutdown, daemon=True).start()
+			return {"ok": True, "result": "종료합니다."}
+		if op not in JOB_OPS:
+			return {"ok": False, "error": f"알 수 없는 작업: {op}"}
+
+		started = time.perf_counter()
+		status = "failed"
+		try:
+			result = self._run_job(op, request)
+			status = "ok"
+			return {"ok": True, "result": result}
+		except Exception as e:
+			events.error(f"{op} 실패: {e}", step="daemon", traceback=traceback.format_exc())
+			return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+		finally:
+			elapsed = time.perf_counter() - started
+			JOBS.inc(op=op, status=status)
+			JOB_SECONDS.observe(elapsed, op=op)
+			with self._lock:
+				self.counts[op] = self.counts.get(op, 0) + 1
+			events.info(f"{op} {status}", step="daemon", op=op, status=status, duration=elapsed)
+
+	def _run_job(self, op: str, request: dict):
+		"""세션을 빌려 감시 아래 작업을 실행하고, 끝나면 세션 재시작 정책을 확인한다."""
+		name = request.get("excel_path") or request.get("code") or op
+		with self._borrow() as session:
+			self._ensure_ready(session)
+			with self.watchdog.watch(session.kill, os.path.basename(name), session.name) as lease:
+				try:
+					result = getattr(self, f"_{op}")(session, request)
+				except Exception:
+					incident = lease["incident"]
+					if incident is None:
+						raise
+					session.restart()
+					raise RuntimeError(f"시간 예산 초과 ({incident['scope']}/{incident['step']}), 세션을 다시 띄웠습니다.")
+			if session.driver is not None:
+				session.after_album()
+			return result
+
+	def _register(self, session: BrowserSession, request: dict) -> dict:
+		prepared = preprocess_one(request["excel_path"])
+		if prepared.get("error"):
+			raise ValueError(f"엑셀을 읽지 못함: {prepared['error']}")
+		album = prepared["album"]
+		result = {"title": album["title"], "code": None, "codes": None, "status": "stopped"}
+		with events.album_context(album["title"]) as album_state:
+			durations = DurationReport.from_dict(prepared["durations"])
+			if not register_workbook(session.driver, prepared["excel_path"], durations, prepared["upload_path"], album["title"]):
+				album_state["status"] = "중단"
+				return result
+			result["code"] = find_album_code(session.driver, album["title"])
+			result["status"] = "registered"
+			if result["code"] and request.get("issue", True):
+				result["codes"] = issue_album(session.driver, result["code"], verify_mode=request.get("verify_mode", self.verify_mode))
+				if result["codes"]:
+					append_history(album, result["code"], result["codes"])
+					result["status"] = "issued"
+				else:
+					album_state["status"] = "코드 없음"
+		return result
+
+	def _issue(self, session: BrowserSession, request: dict) -> dict:
+		codes = issue_album(session.driver, request["code"], verify_mode=request.get("verify_mode", self.verify_mode))
+		return {"code": request["code"], "codes": codes}
+
+	def _export(self, session: BrowserSession, request: dict) -> dict:
+		return {"code": request["code"], "codes": export_album(session.driver, request["code"])}
+
+	def status(self) -> dict:
+		return {
+			"pid": os.getpid(),
+			"uptime": round(time.time() - self.started, 1),
+			"idle_sessions": self.pool.qsize(),
+			"jobs": dict(self.counts),
+			"sessions": [
+				{k: v for k, v in s.memory_report().items() if k != "samples"}
+				for s in self.sessions
+			],
+			"incidents": len(self.watchdog.incidents),
+		}
+
+	def serve(self, port: int = 0, path=None) -> None:
+		"""로컬 포트에서 요청을 받는다. 접속 정보는 상태 파일에 쓰고 종료할 때 지운다."""
+		path = path or state_path()
+		self._server = _Server((HOST, port), _Handler)
+		self._server.daemon_ref = self
+		with contextlib.suppress(OSError):
+			os.remove(path)
+		# 토큰이 다른 사용자에게 보이지 않도록 처음부터 600으로 만든다
+		with os.fdopen(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), "w", encoding="utf-8") as f:
+			json.dump({"pid": os.getpid(), "host": HOST, "port": self._server.server_address[1], "token": self.token}, f)
+		self.watchdog.start()
+		events.info(f"상주 프로세스 대기 중: {HOST}:{self._server.server_address[1]} (세션 {self.size}개)", step="daemon")
+		try:
+			self._server.serve_forever()
+		finally:
+			self._server.server_close()
+			self.watchdog.close()
+			with contextlib.suppress(OSError):
+				os.remove(path)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+	daemon_threads = True
+	allow_reuse_address = True
+
+
+class _Handler(socketserver.StreamRequestHandler):
+	"""연결 하나에서 JSON 요청 줄을 읽을 때마다 처리해 응답 줄을 돌려준다."""
+
+	def handle(self) -> None:
+		for line in self.rfile:
+			if not line.strip():
+				continue
+			try:
+				response = self.server.daemon_ref.handle(json.loads(line))
+			except ValueError as e:
+				response = {"ok": False, "error": f"요청을 읽지 못함: {e}"}
+			self.wfile.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+			self.wfile.flush()
+
+
+def _alive(path: str) -> bool:
+	"""상태 파일의 포트에 접속되면 True. 비정상 종료로 남은 파일이면 False."""
+	try:
+		with open(path, encoding="utf-8") as f:
+			state = json.load(f)
+		with socket.create_connection((state["host"], state["port"]), timeout=1):
+			return True
+	except (OSError, ValueError, KeyError):
+		return False
+
+
+def main():
+	"""로그인된 브라우저 세션을 띄워 두고 로컬 소켓으로 작업을 받는다."""
+	parser = argparse.ArgumentParser(description="MIMS 브라우저 상주 프로세스")
+	parser.add_argument("--sessions", type=int, default=1, help="띄워 둘 브라우저 세션 수")
+	parser.add_argument("--port", type=int, default=0, help="대기할 로컬 포트 (기본: 빈 포트)")
+	parser.add_argument("--headless", action="store_true", help="브라우저 창 없이 실행")
+	parser.add_argument("--verify-mode", choices=("smart", "double"), default="smart", help="발급 후 검증 방식")
+	parser.add_argument("--album-budget", type=float, default=None, help="작업 하나에 허용할 최대 시간(초)")
+	parser.add_argument("--step-budgets", default="", help="단계별 시간 예산, 예: upload=180,issue=900")
+	args = parser.parse_args()
+
+	load_dotenv()
+	metrics.start_from_env()
+	mims_id = os.getenv("MIMS_ID")
+	mims_password = os.getenv("MIMS_PASSWORD")
+	if not mims_id or not mims_password:
+		events.error("환경변수 MIMS_ID/MIMS_PASSWORD가 설정되지 않았습니다. .env를 확인하세요.")
+		return 2
+
+	path = state_path()
+	if os.path.exists(path) and _alive(path):
+		events.error(f"이미 실행 중인 상주 프로세스가 있습니다 ({path}).")
+		return 1
+
+	daemon = BrowserDaemon(
+		mims_id, mims_password,
+		sessions=args.sessions,
+		headless=args.headless,
+		watchdog=Watchdog(parse_budgets(args.step_budgets), args.album_budget),
+		verify_mode=args.verify_mode,
+	)
+	if not daemon.start_sessions():
+		events.error("로그인된 세션이 없어 종료합니다.")
+		daemon.close()
+		return 1
+	try:
+		daemon.serve(args.port, path)
+	except KeyboardInterrupt:
+		pass
+	finally:
+		daemon.close()
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
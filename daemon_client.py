@@ -0,0 +1,109 @@
+import os
+import sys
+import csv
+import json
+import socket
+import argparse
+
+# daemon.py 상주 프로세스에 작업을 보내는 가벼운 클라이언트. 셀레늄을 불러오지 않으므로 바로 뜬다.
+
+STATE_ENV = "MIMS_DAEMON_FILE"
+DEFAULT_STATE = os.path.join(os.path.expanduser("~"), ".mims_daemon.json")
+CONNECT_TIMEOUT = 5
+
+
+class DaemonUnavailable(Exception):
+	"""상주 프로세스가 없거나 접속할 수 없을 때 발생한다."""
+
+
+def read_state(path=None) -> dict:
+	path = path or os.getenv(STATE_ENV) or DEFAULT_STATE
+	try:
+		with open(path, encoding="utf-8") as f:
+			return json.load(f)
+	except (OSError, ValueError) as e:
+		raise DaemonUnavailable(f"상주 프로세스 정보를 읽지 못했습니다 ({path}): {e}")
+
+
+def request(op: str, path=None, **fields) -> dict:
+	"""작업 요청 한 줄을 보내고 응답 dict를 반환한다. 작업이 끝날 때까지 기다린다."""
+	state = read_state(path)
+	try:
+		sock = socket.create_connection((state["host"], state["port"]), timeout=CONNECT_TIMEOUT)
+	except OSError as e:
+		raise DaemonUnavailable(f"상주 프로세스에 접속하지 못했습니다: {e}")
+	with sock:
+		sock.settimeout(None)
+		f = sock.makefile("rw", encoding="utf-8", newline="\n")
+		f.write(json.dumps({"op": op, "token": state["token"], **fields}, ensure_ascii=False) + "\n")
+		f.flush()
+		line = f.readline()
+	if not line:
+		raise DaemonUnavailable("상주 프로세스가 응답 없이 연결을 끊었습니다.")
+	return json.loads(line)
+
+
+def _print_codes(codes) -> None:
+	for seq, item in enumerate(codes or [], start=1):
+		print(f"{seq:>3}. {item['title']}  ISRC {item['isrc']}  UCI {item['uci']}")
+
+
+def _write_csv(path: str, code: str, codes) -> None:
+	with open(path, "w", encoding="utf-8-sig", newline="") as f:
+		writer = csv.writer(f)
+		writer.writerow(["album_code", "track_seq", "title", "isrc", "uci"])
+		for seq, item in enumerate(codes or [], start=1):
+			writer.writerow([code, seq, item["title"], item["isrc"], item["uci"]])
+
+
+def main():
+	"""상주 프로세스에 등록·발급·내보내기·상태·종료 요청을 보낸다."""
+	parser = argparse.ArgumentParser(description="MIMS 브라우저 상주 프로세스 클라이언트")
+	parser.add_argument("--state", default=None, help="상주 프로세스 상태 파일 (기본: ~/.mims_daemon.json)")
+	sub = parser.add_subparsers(dest="op", required=True)
+	reg = sub.add_parser("register", help="엑셀을 업로드·등록하고 코드를 발급")
+	reg.add_argument("excel_path")
+	reg.add_argument("--no-issue", action="store_true", help="등록과 앨범 코드 확인까지만 한다")
+	reg.add_argument("--verify-mode", choices=("smart", "double"), default=None)
+	iss = sub.add_parser("issue", help="앨범 코드의 ISRC/UCI를 발급·추출")
+	iss.add_argument("code")
+	iss.add_argument("--verify-mode", choices=("smart", "double"), default=None)
+	exp = sub.add_parser("export", help="발급 없이 앨범 코드의 ISRC/UCI 표를 읽음")
+	exp.add_argument("code")
+	exp.add_argument("-o", "--output", help="CSV로 저장할 경로")
+	sub.add_parser("status", help="세션·작업 현황")
+	sub.add_parser("stop", help="상주 프로세스 종료")
+	args = parser.parse_args()
+
+	fields = {}
+	if args.op == "register":
+		fields = {"excel_path": os.path.abspath(args.excel_path), "issue": not args.no_issue}
+	elif args.op in ("issue", "export"):
+		fields = {"code": args.code}
+	if getattr(args, "verify_mode", None):
+		fields["verify_mode"] = args.verify_mode
+
+	try:
+		response = request("shutdown" if args.op == "stop" else args.op, args.state, **fields)
+	except DaemonUnavailable as e:
+		print(f"{e}\n먼저 'python daemon.py'로 상주 프로세스를 띄우세요.", file=sys.stderr)
+		return 2
+	if not response.get("ok"):
+		print(f"실패: {response.get('error')}", file=sys.stderr)
+		return 1
+
+	result = response["result"]
+	if args.op in ("status", "stop"):
+		print(json.dumps(result, ensure_ascii=False, indent=1) if isinstance(result, dict) else result)
+		return 0
+	if args.op == "register":
+		print(f"[{result['status']}] {result['title']} (코드: {result['code']})")
+	_print_codes(result.get("codes"))
+	if args.op == "export" and args.output:
+		_write_csv(args.output, result["code"], result["codes"])
+		print(f"→ {args.output}")
+	return 0 if result.get("codes") or result.get("status") == "registered" else 1
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,277 @@
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+import contextlib
+import contextvars
+from logging.handlers import QueueHandler, QueueListener
+
+import metrics
+
+# 자동화 진행 상황을 구조화된 이벤트(앨범·단계·트랙 순번·레벨·소요시간)로 남긴다.
+# 앨범·단계 문맥은 contextvars에 두어 스레드와 asyncio 태스크마다 따로 잡힌다.
+# 호출 스레드는 큐에 넣기만 하고, 파일(JSON Lines)/콘솔/앨범별 보고서 기록은 백그라운드 리스너 스레드가 맡는다.
+
+LOG_DIR_ENV = "MIMS_LOG_DIR"
+DEFAULT_LOG_DIR = "logs"
+LOGGER_NAME = "mims"
+
+_logger = logging.getLogger(LOGGER_NAME)
+_logger.propagate = False
+_album = contextvars.ContextVar("mims_album", default=None)
+_step = contextvars.ContextVar("mims_step", default=None)
+_setup_lock = threading.Lock()
+_listener = None
+_log_dir = None
+_step_enter_hooks = []
+_step_exit_hooks = []
+_step_failure_hooks = []
+
+
+class JsonLinesHandler(logging.Handler):
+	"""이벤트 하나를 JSON 한 줄로 파일에 기록한다."""
+
+	def __init__(self, path: str):
+		super().__init__()
+		self._file = open(path, "a", encoding="utf-8")
+
+	def emit(self, record):
+		try:
+			self._file.write(json.dumps(_record_dict(record), ensure_ascii=False, default=str) + "\n")
+			self._file.flush()
+		except Exception:
+			self.handleError(record)
+
+	def close(self):
+		self._file.close()
+		super().close()
+
+
+class ConsoleFormatter(logging.Formatter):
+	"""콘솔용으로 시각·앨범·단계·트랙과 메시지를 한 줄로 만든다. traceback은 파일에만 남긴다."""
+
+	def format(self, record):
+		ev = getattr(record, "event", {})
+		prefix = []
+		if ev.get("album"):
+			prefix.append(ev["album"])
+		if ev.get("step"):
+			prefix.append(ev["step"])
+		if ev.get("track_seq") is not None:
+			prefix.append(f"#{ev['track_seq']}")
+		head = time.strftime("%H:%M:%S", time.localtime(record.created))
+		level = "" if record.levelno == logging.INFO else f" {record.levelname}"
+		where = f" [{' · '.join(prefix)}]" if prefix else ""
+		took = f" ({ev['duration']:.2f}s)" if ev.get("duration") is not None else ""
+		return f"{head}{level}{where} {record.getMessage()}{took}"
+
+
+class AlbumReportHandler(logging.Handler):
+	"""앨범별로 단계 소요시간·경고·오류를 모았다가 앨범이 끝나면 보고서(JSON)와 콘솔 요약을 남긴다."""
+
+	def __init__(self, directory: str, stream=None):
+		super().__init__()
+		self.directory = directory
+		self.stream = stream or sys.stdout
+		self._albums = {}
+
+	def emit(self, record):
+		ev = getattr(record, "event", {})
+		album = ev.get("album")
+		if not album:
+			return
+		report = self._albums.setdefault(album, {
+			"album": album, "started_at": record.created, "steps": {}, "warnings": [], "errors": [], "events": 0,
+		})
+		report["events"] += 1
+		if ev.get("kind") == "step" and ev.get("duration") is not None:
+			step = report["steps"].setdefault(ev["step"], {"count": 0, "seconds": 0.0, "failed": 0})
+			step["count"] += 1
+			step["seconds"] = round(step["seconds"] + ev["duration"], 3)
+			if record.levelno >= logging.ERROR:
+				step["failed"] += 1
+		if record.levelno >= logging.ERROR:
+			report["errors"].append({"step": ev.get("step"), "message": record.getMessage()})
+		elif record.levelno >= logging.WARNING:
+			report["warnings"].append({"step": ev.get("step"), "message": record.getMessage()})
+		if ev.get("kind") == "album_end":
+			self._write(self._albums.pop(album), record, ev)
+
+	def _write(self, report, record, ev):
+		report["finished_at"] = record.created
+		report["duration"] = round(record.created - report["started_at"], 3)
+		report["status"] = ev.get("status", "")
+		os.makedirs(self.directory, exist_ok=True)
+		safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in report["album"])[:60]
+		path = os.path.join(self.directory, f"{time.strftime('%Y%m%d-%H%M%S')}_{safe}.json")
+		with open(path, "w", encoding="utf-8") as f:
+			json.dump(report, f, ensure_ascii=False, indent=1)
+		steps = ", ".join(f"{name} {s['seconds']:.1f}s" for name, s in report["steps"].items())
+		self.stream.write(
+			f"=== {report['album']} [{report['status'] or '완료'}] {report['duration']:.1f}s · "
+			f"경고 {len(report['warnings'])} · 오류 {len(report['errors'])} · {steps}\n"
+		)
+		self.stream.flush()
+
+
+def _record_dict(record) -> dict:
+	ev = dict(getattr(record, "event", {}))
+	data = {
+		"ts": round(record.created, 3),
+		"level": record.levelname,
+		"thread": record.threadName,
+		"album": ev.pop("album", None),
+		"step": ev.pop("step", None),
+		"track_seq": ev.pop("track_seq", None),
+		"duration": ev.pop("duration", None),
+		"message": record.getMessage(),
+	}
+	data.update(ev)
+	return data
+
+
+def setup(log_dir=None, console_level=logging.INFO, summary_stream=None) -> str:
+	"""큐 핸들러와 백그라운드 리스너를 구성한다. 이미 구성되어 있으면 그대로 둔다. summary_stream은 앨범 요약 출력처(기본 stdout)."""
+	global _listener, _log_dir
+	with _setup_lock:
+		if _listener is not None:
+			return _log_dir
+		_log_dir = log_dir or os.getenv(LOG_DIR_ENV) or DEFAULT_LOG_DIR
+		os.makedirs(_log_dir, exist_ok=True)
+
+		json_handler = JsonLinesHandler(os.path.join(_log_dir, f"events-{time.strftime('%Y%m%d')}.jsonl"))
+		json_handler.setLevel(logging.DEBUG)
+		console = logging.StreamHandler(sys.stdout)
+		console.setLevel(console_level)
+		console.setFormatter(ConsoleFormatter())
+		reports = AlbumReportHandler(os.path.join(_log_dir, "reports"), summary_stream)
+		reports.setLevel(logging.DEBUG)
+
+		event_queue = queue.Queue()
+		_logger.handlers[:] = [QueueHandler(event_queue)]
+		_logger.setLevel(logging.DEBUG)
+		_listener = QueueListener(event_queue, json_handler, console, reports, respect_handler_level=True)
+		_listener.start()
+		atexit.register(shutdown)
+		return _log_dir
+
+
+def shutdown() -> None:
+	"""큐에 남은 이벤트를 모두 기록하고 리스너를 멈춘다."""
+	global _listener
+	with _setup_lock:
+		if _listener is None:
+			return
+		_listener.stop()
+		for handler in _listener.handlers:
+			handler.close()
+		_listener = None
+
+
+def current_album():
+	return _album.get()
+
+
+def current_step():
+	return _step.get()
+
+
+def event(message: str, level: int = logging.INFO, **fields) -> None:
+	"""이벤트 하나를 큐에 넣는다. album/step을 주지 않으면 현재 스레드·태스크의 문맥 값을 쓴다."""
+	if _listener is None:
+		setup()
+	fields.setdefault("album", current_album())
+	fields.setdefault("step", current_step())
+	metrics.observe_event(level, fields)
+	_logger.log(level, message, extra={"event": fields})
+
+
+def debug(message: str, **fields) -> None:
+	event(message, logging.DEBUG, **fields)
+
+
+def info(message: str, **fields) -> None:
+	event(message, logging.INFO, **fields)
+
+
+def warning(message: str, **fields) -> None:
+	event(message, logging.WARNING, **fields)
+
+
+def error(message: str, **fields) -> None:
+	event(message, logging.ERROR, **fields)
+
+
+def end_album(album: str, status: str) -> None:
+	"""앨범 처리 종료 이벤트를 남긴다. 이 이벤트를 받으면 앨범 보고서가 기록된다."""
+	info("앨범 처리 종료", album=album, kind="album_end", status=status)
+
+
+@contextlib.contextmanager
+def album_context(album: str, report: bool = True):
+	"""이 블록 안에서 남기는 이벤트에 앨범 이름을 붙인다. report가 True면 끝날 때 앨범 보고서를 쓰게 한다."""
+	token = _album.set(album)
+	state = {"status": "완료"}
+	try:
+		yield state
+	except BaseException:
+		state["status"] = "실패"
+		raise
+	finally:
+		if report:
+			end_album(album, state["status"])
+		_album.reset(token)
+
+
+def on_step_enter(hook) -> None:
+	"""단계가 시작될 때 hook(단계 이름)을 호출하도록 등록한다."""
+	_step_enter_hooks.append(hook)
+
+
+def on_step_exit(hook) -> None:
+	"""단계가 성공·실패와 관계없이 끝날 때 hook(단계 이름)을 호출하도록 등록한다."""
+	_step_exit_hooks.append(hook)
+
+
+def remove_step_hooks(*hooks) -> None:
+	"""on_step_enter/exit/failure로 등록한 hook을 모두 해제한다. 등록되지 않은 hook은 무시한다."""
+	for registry in (_step_enter_hooks, _step_exit_hooks, _step_failure_hooks):
+		for hook in hooks:
+			while hook in registry:
+				registry.remove(hook)
+
+
+def _run_hooks(hooks, *args) -> None:
+	for hook in hooks:
+		try:
+			hook(*args)
+		except Exception as hook_error:
+			warning(f"단계 훅 오류: {hook_error}")
+
+
+def on_step_failure(hook) -> None:
+	"""단계가 예외로 끝날 때 hook(단계 이름, 예외)을 호출하도록 등록한다."""
+	_step_failure_hooks.append(hook)
+
+
+@contextlib.contextmanager
+def step(name: str, **fields):
+	"""단계 문맥을 설정하고 소요시간을 이벤트로 남긴다. 예외는 실패 이벤트를 남기고 다시 던진다."""
+	token = _step.set(name)
+	_run_hooks(_step_enter_hooks, name)
+	started = time.perf_counter()
+	try:
+		yield
+	except BaseException as e:
+		error(f"단계 실패: {e}", kind="step", duration=time.perf_counter() - started, **fields)
+		_run_hooks(_step_failure_hooks, name, e)
+		raise
+	else:
+		debug("단계 완료", kind="step", duration=time.perf_counter() - started, **fields)
+	finally:
+		_run_hooks(_step_exit_hooks, name)
+		_step.reset(token)
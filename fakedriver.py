@@ -0,0 +1,544 @@
+import copy
+import json
+import time
+import html
+import contextlib
+from collections import Counter, deque
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.common.exceptions import (
+	NoSuchElementException, StaleElementReferenceException, NoAlertPresentException,
+	UnexpectedAlertPresentException, ElementNotInteractableException, WebDriverException, NoSuchWindowException,
+)
+
+# 이 프로젝트가 쓰는 Selenium API 일부를 메모리에서 흉내 내는 가짜 드라이버.
+# 화면은 선언형 픽스처(상태 이름 → 요소 트리와 클릭·입력 시 동작)로 기술하고, 대기·지연은 가상 시계로 흘려보내므로
+# 실제 브라우저와 사이트 없이 등록·발급 흐름의 분기를 밀리초 단위로 돌려 볼 수 있다.
+#
+# 픽스처 형식:
+#   {"start": 상태, "urls": {URL 접두: 상태}, "strict_alerts": true,
+#    "states": {상태: {"url": ..., "html": ..., "on_enter": 동작, "elements": [요소, ...]}}}
+# 요소: {"key", "id", "tag", "text", "attrs": {...}, "match": [로케이터 문자열, ...], "present", "displayed", "enabled",
+#        "children": [요소, ...], "on_click": 동작, "on_send_keys": 동작}
+# 동작(하나 또는 목록, "delay"초 뒤 실행 가능): {"goto": 상태} {"alert": 문구} {"show"/"hide": key} {"display": key, "value": bool}
+#        {"set": {key: {속성: 값}}} {"cycle": {"key", "attr", "values"}}
+#        {"response": {"url", "status", "body", "type"}} — "performance": true인 픽스처에서 성능 로그에 XHR 응답을 남긴다
+# CDP Network.emulateNetworkConditions의 latency(ms)는 서버 왕복으로 보고 get/refresh와 화면 전환·지연 동작에 더한다.
+# switch_to.new_window로 연 탭은 상태·요소·알림창을 따로 가지며, 지연 동작은 그 동작을 일으킨 탭에서 실행된다.
+
+_ELEMENT_FIELDS = ("text", "present", "displayed", "enabled")
+_WINDOW_FIELDS = ("_url", "_state", "_elements", "_keys", "_alerts", "_generation")
+
+
+class VirtualClock:
+	"""time.time/monotonic/sleep을 대신하는 가상 시계. sleep은 기다리지 않고 시각만 옮긴다."""
+
+	def __init__(self, start: float = 1_700_000_000.0):
+		self.start = self.now = start
+		self.slept = 0.0
+
+	def time(self) -> float:
+		return self.now
+
+	def sleep(self, seconds: float) -> None:
+		seconds = max(0.0, seconds)
+		self.now += seconds
+		self.slept += seconds
+
+	def elapsed(self) -> float:
+		return self.now - self.start
+
+	@contextlib.contextmanager
+	def patch(self):
+		"""이 블록 동안 time 모듈의 time·monotonic·sleep을 가상 시계로 바꾼다. perf_counter는 그대로 둔다."""
+		saved = time.time, time.monotonic, time.sleep
+		time.time, time.monotonic, time.sleep = self.time, self.time, self.sleep
+		try:
+			yield self
+		finally:
+			time.time, time.monotonic, time.sleep = saved
+
+
+def _matches(spec: dict, by: str, value: str) -> bool:
+	if by == By.ID:
+		return spec.get("id") == value
+	if by == By.TAG_NAME:
+		return spec.get("tag") == value
+	if by == By.NAME:
+		return spec.get("attrs", {}).get("name") == value
+	if by == By.CLASS_NAME:
+		return value in spec.get("attrs", {}).get("class", "").split()
+	match = spec.get("match", ())
+	parts = [value] + ([p.strip() for p in value.split(",")] if by == By.CSS_SELECTOR and "," in value else [])
+	return any(p in match or (by == By.CSS_SELECTOR and spec.get("id") and p == "#" + spec["id"]) for p in parts)
+
+
+def _search(specs: list, by: str, value: str, out: list) -> list:
+	"""보이는(present) 요소 트리를 깊이 우선으로 훑어 일치하는 요소를 모은다."""
+	for spec in specs:
+		if not spec.get("present", True):
+			continue
+		if _matches(spec, by, value):
+			out.append(spec)
+		_search(spec.get("children", ()), by, value, out)
+	return out
+
+
+class FakeElement(WebElement):
+	"""픽스처 요소 하나. 상태가 바뀌면(화면 전환·새로고침) 이전 요소는 stale이 된다."""
+
+	def __init__(self, driver, spec: dict, generation: int):
+		self._driver = driver
+		self._spec = spec
+		self._generation = generation
+
+	def __repr__(self):
+		return f"<FakeElement {self._spec.get('key') or self._spec.get('id') or self._spec.get('tag')}>"
+
+	def __eq__(self, other):
+		return isinstance(other, FakeElement) and other._spec is self._spec and other._generation == self._generation
+
+	def __hash__(self):
+		return id(self._spec)
+
+	def _check(self, call: str) -> dict:
+		self._driver._tick(call)
+		if self._generation != self._driver._generation or not self._spec.get("present", True):
+			raise StaleElementReferenceException(f"stale element: {self!r}")
+		return self._spec
+
+	@property
+	def id(self):
+		return str(id(self._spec))
+
+	@property
+	def parent(self):
+		return self._driver
+
+	@property
+	def tag_name(self) -> str:
+		return self._check("tag_name").get("tag", "div")
+
+	@property
+	def text(self) -> str:
+		spec = self._check("text")
+		if not spec.get("displayed", True):
+			return ""
+		parts = [spec.get("text", "")] + [FakeElement(self._driver, c, self._generation).text for c in spec.get("children", ()) if c.get("present", True)]
+		return " ".join(p for p in parts if p)
+
+	def get_attribute(self, name: str):
+		spec = self._check("get_attribute")
+		if name in ("textContent", "innerText"):
+			return spec.get("text", "")
+		return spec.get("attrs", {}).get(name)
+
+	get_dom_attribute = get_attribute
+	get_property = get_attribute
+
+	def is_displayed(self) -> bool:
+		return bool(self._check("is_displayed").get("displayed", True))
+
+	def is_enabled(self) -> bool:
+		return bool(self._check("is_enabled").get("enabled", True))
+
+	def is_selected(self) -> bool:
+		return bool(self._check("is_selected").get("attrs", {}).get("checked"))
+
+	def click(self) -> None:
+		spec = self._check("click")
+		self._driver._guard()
+		if not spec.get("displayed", True) or not spec.get("enabled", True):
+			raise ElementNotInteractableException(f"element not interactable: {self!r}")
+		self._driver.calls["click"] += 1
+		self._driver._log("click", spec)
+		self._driver._run(spec.get("on_click"))
+
+	def send_keys(self, *values) -> None:
+		spec = self._check("send_keys")
+		self._driver._guard()
+		attrs = spec.setdefault("attrs", {})
+		for value in map(str, values):
+			if value == Keys.BACK_SPACE:
+				attrs["value"] = (attrs.get("value") or "")[:-1]
+			elif value.isprintable():
+				attrs["value"] = (attrs.get("value") or "") + value
+		self._driver._run(spec.get("on_send_keys"))
+
+	def clear(self) -> None:
+		self._check("clear").setdefault("attrs", {})["value"] = ""
+
+	def find_element(self, by=By.ID, value=None):
+		found = self.find_elements(by, value)
+		if not found:
+			raise NoSuchElementException(f"{by}={value} (in {self!r})")
+		return found[0]
+
+	def find_elements(self, by=By.ID, value=None) -> list:
+		spec = self._check("find_elements")
+		self._driver.calls["find"] += 1
+		return [FakeElement(self._driver, s, self._generation) for s in _search(spec.get("children", ()), by, value, [])]
+
+
+class FakeAlert:
+	def __init__(self, driver):
+		self._driver = driver
+
+	@property
+	def text(self) -> str:
+		return self._driver._alert_text()
+
+	def accept(self) -> None:
+		self._driver._close_alert("accept")
+
+	def dismiss(self) -> None:
+		self._driver._close_alert("dismiss")
+
+
+class _SwitchTo:
+	def __init__(self, driver):
+		self._driver = driver
+
+	@property
+	def alert(self) -> FakeAlert:
+		self._driver._tick("switch_to.alert")
+		if not self._driver._alerts:
+			raise NoAlertPresentException("no such alert")
+		return FakeAlert(self._driver)
+
+	def window(self, handle: str) -> None:
+		self._driver._switch_window(handle)
+
+	def new_window(self, type_hint=None) -> None:
+		self._driver._new_window()
+
+
+class FakeDriver:
+	"""선언형 픽스처를 화면 상태로 삼는 WebDriver 대역. calls에 API 호출 수, history에 클릭·전환 기록을 남긴다."""
+
+	def __init__(self, fixture: dict, clock=None):
+		self.fixture = fixture
+		self.clock = clock or VirtualClock()
+		self.strict_alerts = fixture.get("strict_alerts", True)
+		self.calls = Counter()
+		self.history = []
+		self._url = ""
+		self.session_id = "fake"
+		self.switch_to = _SwitchTo(self)
+		self._bindings = dict(fixture.get("urls", {}))
+		self._alerts = deque()
+		self._pending = []
+		self._generation = 0
+		self._serial = 0
+		self._handle = "fake-0"
+		self._windows = {}
+		self._opened = 1
+		self._state = None
+		self._elements = []
+		self._keys = {}
+		self._cookies = []
+		self.rtt = 0.0
+		self._perf_log = []
+		self._bodies = {}
+		if fixture.get("start"):
+			self._enter(fixture["start"])
+
+	@property
+	def current_url(self) -> str:
+		self._tick()
+		return self._url
+
+	@property
+	def state(self) -> str:
+		"""지금 보고 있는 픽스처 상태 이름."""
+		return self._state
+
+	# ----- 상태 전환·동작 -----
+	def _log(self, kind: str, spec_or_name) -> None:
+		name = spec_or_name if isinstance(spec_or_name, str) else (spec_or_name.get("key") or spec_or_name.get("id") or spec_or_name.get("tag"))
+		self.history.append((round(self.clock.elapsed(), 3), kind, name))
+
+	def _index(self, specs: list) -> None:
+		for spec in specs:
+			key = spec.get("key") or spec.get("id")
+			if key:
+				self._keys[key] = spec
+			self._index(spec.get("children", ()))
+
+	def _enter(self, name: str, url=None) -> None:
+		state = self.fixture["states"][name]
+		self._state = name
+		self._serial += 1
+		self._generation = self._serial
+		self._elements = copy.deepcopy(state.get("elements", []))
+		self._keys = {}
+		self._index(self._elements)
+		self._url = url or state.get("url") or self._url
+		self._log("enter", name)
+		self._run(state.get("on_enter"))
+
+	def _binding(self, url: str):
+		prefixes = [p for p in self._bindings if url.startswith(p)]
+		return self._bindings[max(prefixes, key=len)] if prefixes else None
+
+	def _run(self, actions) -> None:
+		if not actions:
+			return
+		for action in actions if isinstance(actions, list) else [actions]:
+			delay = action.get("delay", 0)
+			if self.rtt and (delay or "goto" in action):
+				delay += self.rtt
+			if delay:
+				self._pending.append((self.clock.now + delay, len(self.history), action, self._handle))
+				self._pending.sort(key=lambda p: (p[0], p[1]))
+			else:
+				self._apply(action)
+
+	def _apply(self, action: dict) -> None:
+		if "goto" in action:
+			self._enter(action["goto"])
+			# 같은 주소의 서버 상태가 바뀐 것으로 보고 새로고침·재방문에도 이 상태를 보여 준다
+			self._bindings[self._url] = action["goto"]
+		if "alert" in action:
+			self._alerts.append(action["alert"])
+		for key in _as_list(action.get("show")):
+			self._keys[key]["present"] = True
+		for key in _as_list(action.get("hide")):
+			self._keys[key]["present"] = False
+		if "display" in action:
+			self._keys[action["display"]]["displayed"] = action.get("value", True)
+		for key, values in action.get("set", {}).items():
+			spec = self._keys[key]
+			for attr, value in values.items():
+				if attr in _ELEMENT_FIELDS:
+					spec[attr] = value
+				else:
+					spec.setdefault("attrs", {})[attr] = value
+		if "response" in action:
+			self._respond(action["response"])
+		if "cycle" in action:
+			cycle = action["cycle"]
+			attrs = self._keys[cycle["key"]].setdefault("attrs", {})
+			values = cycle["values"]
+			current = attrs.get(cycle["attr"])
+			pos = values.index(current) + 1 if current in values else 0
+			attrs[cycle["attr"]] = values[min(pos, len(values) - 1)]
+
+	def _tick(self, call: str = "") -> None:
+		"""가상 시각이 지난 지연 동작을 실행한다. 모든 API 호출이 먼저 부른다."""
+		if call:
+			self.calls[call] += 1
+		while self._pending and self._pending[0][0] <= self.clock.now:
+			_, _, action, handle = self._pending.pop(0)
+			if handle == self._handle:
+				self._apply(action)
+			elif handle in self._windows:
+				current = self._handle
+				self._swap(handle)
+				try:
+					self._apply(action)
+				finally:
+					self._swap(current)
+
+	def _guard(self) -> None:
+		"""알림창이 떠 있으면 크롬 기본값처럼 닫고 UnexpectedAlertPresentException을 던진다."""
+		if self._alerts and self.strict_alerts:
+			text = self._alerts.popleft()
+			self._log("alert_dismissed", text)
+			raise UnexpectedAlertPresentException(alert_text=text)
+
+	def _alert_text(self) -> str:
+		if not self._alerts:
+			raise NoAlertPresentException("no such alert")
+		return self._alerts[0]
+
+	def _close_alert(self, how: str) -> None:
+		self._tick(f"alert.{how}")
+		if not self._alerts:
+			raise NoAlertPresentException("no such alert")
+		self._log(f"alert_{how}", self._alerts.popleft())
+
+	# ----- 탭 -----
+	def _swap(self, handle: str) -> None:
+		"""지금 탭의 화면 상태를 넣어 두고 handle 탭의 상태를 꺼내 온다."""
+		if self._handle is not None:
+			self._windows[self._handle] = {f: getattr(self, f) for f in _WINDOW_FIELDS}
+		for field, value in self._windows.pop(handle).items():
+			setattr(self, field, value)
+		self._handle = handle
+
+	def _switch_window(self, handle: str) -> None:
+		self._tick("switch_to.window")
+		if handle == self._handle:
+			return
+		if handle not in self._windows:
+			raise NoSuchWindowException(f"no such window: {handle}")
+		self._swap(handle)
+		self._log("window", handle)
+
+	def _new_window(self) -> None:
+		self._tick("switch_to.new_window")
+		handle = f"fake-{self._opened}"
+		self._opened += 1
+		self._windows[handle] = {"_url": "about:blank", "_state": None, "_elements": [], "_keys": {}, "_alerts": deque(), "_generation": 0}
+		self._swap(handle)
+		self._log("window", handle)
+
+	def close(self) -> None:
+		"""지금 탭을 닫는다. 실제 드라이버처럼 다른 탭으로 전환할 때까지 어느 탭도 보고 있지 않다."""
+		self._tick("close")
+		self._log("close", self._handle)
+		self._pending = [p for p in self._pending if p[3] != self._handle]
+		self._handle = None
+		self._url, self._state, self._elements, self._keys, self._alerts = "", None, [], {}, deque()
+
+	# ----- WebDriver API -----
+	def get(self, url: str) -> None:
+		self._tick("get")
+		self._guard()
+		self._round_trip()
+		state = self._binding(url)
+		if state is None:
+			raise WebDriverException(f"픽스처에 없는 주소: {url}")
+		self._enter(state, url)
+
+	def refresh(self) -> None:
+		self._tick("refresh")
+		self._guard()
+		self._round_trip()
+		self._enter(self._binding(self._url) or self._state, self._url)
+
+	def find_element(self, by=By.ID, value=None) -> FakeElement:
+		found = self.find_elements(by, value)
+		if not found:
+			raise NoSuchElementException(f"{by}={value} (state {self._state})")
+		return found[0]
+
+	def find_elements(self, by=By.ID, value=None) -> list:
+		self._tick("find")
+		self._guard()
+		return [FakeElement(self, s, self._generation) for s in _search(self._elements, by, value, [])]
+
+	def execute_script(self, script: str, *args):
+		self._tick("execute_script")
+		self._guard()
+		el = args[0] if args and isinstance(args[0], FakeElement) else None
+		if el is not None:
+			spec = el._check("execute_script")
+			if "arguments[0].click()" in script:
+				self.calls["click"] += 1
+				self._log("click", spec)
+				self._run(spec.get("on_click"))
+			elif "arguments[0].value = arguments[1]" in script:
+				spec.setdefault("attrs", {})["value"] = args[1]
+			elif "classList.remove('d-none')" in script:
+				spec.setdefault("attrs", {})["class"] = " ".join(c for c in spec.get("attrs", {}).get("class", "").split() if c != "d-none")
+				spec["displayed"] = True
+		for needle, result in self.fixture.get("scripts", {}).items():
+			if needle in script:
+				return result
+		return None
+
+	def execute_cdp_cmd(self, cmd: str, params: dict) -> dict:
+		self._tick("execute_cdp_cmd")
+		if cmd == "Network.emulateNetworkConditions":
+			self.rtt = max(0.0, params.get("latency", 0) / 1000)
+		if cmd == "Network.getResponseBody":
+			if params["requestId"] not in self._bodies:
+				raise WebDriverException(f"응답 본문 없음: {params['requestId']}")
+			return {"body": self._bodies[params["requestId"]], "base64Encoded": False}
+		return {}
+
+	def _round_trip(self) -> None:
+		if self.rtt:
+			self.clock.sleep(self.rtt)
+
+	@property
+	def page_source(self) -> str:
+		self._tick("page_source")
+		state = self.fixture["states"][self._state]
+		return state.get("html") or "<html><body>" + "".join(_render(s) for s in self._elements) + "</body></html>"
+
+	@property
+	def title(self) -> str:
+		return self.fixture["states"][self._state].get("title", self._state)
+
+	@property
+	def window_handles(self) -> list:
+		handles = list(self._windows) + ([self._handle] if self._handle else [])
+		return sorted(handles, key=lambda h: int(h.rsplit("-", 1)[1]))
+
+	@property
+	def current_window_handle(self) -> str:
+		if self._handle is None:
+			raise NoSuchWindowException("no such window: 닫힌 탭")
+		return self._handle
+
+	def get_screenshot_as_png(self) -> bytes:
+		return b""
+
+	def _respond(self, response: dict) -> None:
+		request_id = f"fake.{len(self._bodies) + 1}"
+		body = response.get("body", "")
+		self._bodies[request_id] = body if isinstance(body, str) else json.dumps(body, ensure_ascii=False)
+		kind = response.get("type", "XHR")
+		for method, params in (
+			("Network.requestWillBeSent", {"request": {"url": response["url"], "method": response.get("method", "POST")}, "type": kind}),
+			("Network.responseReceived", {"response": {"url": response["url"], "status": response.get("status", 200), "mimeType": "application/json"}, "type": kind}),
+			("Network.loadingFinished", {}),
+		):
+			params["requestId"] = request_id
+			self._perf_log.append({"level": "INFO", "message": json.dumps({"message": {"method": method, "params": params}})})
+
+	def get_log(self, log_type: str) -> list:
+		self._tick("get_log")
+		if log_type != "performance":
+			return []
+		if not self.fixture.get("performance"):
+			raise WebDriverException("performance 로그가 켜져 있지 않습니다")
+		entries, self._perf_log = self._perf_log, []
+		return entries
+
+	def execute_async_script(self, script: str, *args):
+		"""fetch(주소)만 흉내 낸다. 주소에 묶인 상태의 요소 트리를 HTML로 돌려준다."""
+		self._tick("execute_async_script")
+		if "fetch(" not in script or not args:
+			return None
+		self._round_trip()
+		state = self._binding(args[0])
+		if state is None:
+			return None
+		return "<html><body>" + "".join(_render(s) for s in self.fixture["states"][state]["elements"]) + "</body></html>"
+
+	def get_cookies(self) -> list:
+		return list(self._cookies)
+
+	def add_cookie(self, cookie: dict) -> None:
+		self._cookies.append(cookie)
+
+	def delete_all_cookies(self) -> None:
+		self._cookies = []
+
+	def quit(self) -> None:
+		self._log("quit", self._state or "")
+
+
+def _as_list(value) -> list:
+	if value is None:
+		return []
+	return value if isinstance(value, list) else [value]
+
+
+def _render(spec: dict) -> str:
+	"""요소 트리를 page_source용 HTML로 옮긴다. 정적 파서가 읽을 만큼만 흉내 낸다."""
+	if not spec.get("present", True):
+		return ""
+	tag = spec.get("tag", "div")
+	attrs = dict(spec.get("attrs", {}))
+	if spec.get("id"):
+		attrs["id"] = spec["id"]
+	attr_text = "".join(f' {k}="{html.escape(str(v), quote=True)}"' for k, v in attrs.items() if v is not None)
+	inner = html.escape(spec.get("text", "")) + "".join(_render(c) for c in spec.get("children", ()))
+	return f"<{tag}{attr_text}>{inner}</{tag}>"
@@ -0,0 +1,200 @@
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import threading
+
+import events
+import snapshots
+import page_parsers
+
+# 실제 실행 중 각 단계의 페이지를 민감정보를 지운 HTML로 저장(capture)하고,
+# 저장된 HTML을 정적 파서나 로컬 헤드리스 브라우저로 다시 읽어 추출 로직을 검증(replay)한다.
+
+CAPTURE_ENV = "MIMS_CAPTURE_DIR"
+INDEX_FILENAME = "index.json"
+
+# 단계 이름 → 페이지 종류. 종류별로 정적 파서와 "비어 있으면 안 되는지" 여부를 정한다.
+STEP_KINDS = {
+	"my_album": "my_album",
+	"excel_uploaded": "meta_register",
+	"track_list": "track_list",
+	"meta_confirm": "meta_confirm",
+	"right_modal_producer": "right_modal",
+	"right_modal_distributor": "right_modal",
+	"album_detail": "album_detail",
+	"album_detail_verified": "album_detail",
+}
+KIND_PARSERS = {
+	"my_album": (page_parsers.parse_album_cards, True),
+	"track_list": (page_parsers.parse_track_list, True),
+	"meta_confirm": (page_parsers.parse_search_tracks, False),
+	"right_modal": (page_parsers.parse_right_modal, False),
+	"album_detail": (page_parsers.parse_album_codes, True),
+}
+
+_SCRIPT_RE = re.compile(r"<script\b[^>]*>.*?</script\s*>", re.S | re.I)
+_EMAIL_RE = re.compile(r"([A-Za-z0-9._%+-]+)@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)+")
+_PHONE_RE = re.compile(r"\b01[016789]-?\d{3,4}-?\d{4}\b")
+_INPUT_RE = re.compile(r"<(?:input|meta)\b[^>]*>", re.I)
+_VALUE_ATTR_RE = re.compile(r"""\b(value|content)\s*=\s*("[^"]*"|'[^']*')""", re.I)
+_SECRET_HINT_RE = re.compile(r"""(type\s*=\s*["']?password|name\s*=\s*["'][^"']*(csrf|token|pwd|password))""", re.I)
+
+_lock = threading.Lock()
+_state = {"dir": None, "seq": 0, "index": []}
+
+
+def sanitize_html(html: str) -> str:
+	"""스크립트 본문·비밀번호/CSRF 값·이메일 도메인·전화번호를 지워 저장 가능한 HTML로 만든다."""
+	html = _SCRIPT_RE.sub("", html)
+
+	def _blank_secret(m):
+		tag = m.group(0)
+		if _SECRET_HINT_RE.search(tag):
+			return _VALUE_ATTR_RE.sub(lambda v: f'{v.group(1)}=""', tag)
+		return tag
+
+	html = _INPUT_RE.sub(_blank_secret, html)
+	# 회원 선택 로직이 이메일 앞부분(metalfocus*)을 보므로 로컬 파트는 남기고 도메인만 가린다
+	html = _EMAIL_RE.sub(lambda m: f"{m.group(1)}@example.com", html)
+	return _PHONE_RE.sub("010-0000-0000", html)
+
+
+def enable_capture(directory: str) -> None:
+	"""capture를 켠다. 같은 프로세스의 모든 단계 스냅샷이 directory 아래에 저장된다."""
+	with _lock:
+		os.makedirs(directory, exist_ok=True)
+		_state["dir"] = directory
+		_state["seq"] = 0
+		_state["index"] = []
+
+
+def _capture_dir():
+	if _state["dir"] is None and os.getenv(CAPTURE_ENV):
+		enable_capture(os.path.join(os.getenv(CAPTURE_ENV), time.strftime("%Y%m%d-%H%M%S")))
+	return _state["dir"]
+
+
+def capture_page(driver, step: str) -> None:
+	"""현재 페이지를 실패 스냅샷 링 버퍼에 넣고, capture가 켜져 있으면 sanitize해 저장한다."""
+	snapshots.record(driver, step)
+	directory = _capture_dir()
+	if directory is None:
+		return
+	try:
+		html = sanitize_html(driver.page_source)
+		url = (driver.current_url or "").split("?")[0]
+	except Exception as e:
+		events.warning(f"{step} 페이지 저장 실패: {e}", kind="capture")
+		return
+	with _lock:
+		_state["seq"] += 1
+		filename = f"{_state['seq']:04d}_{threading.current_thread().name}_{step}.html"
+		with open(os.path.join(directory, filename), "w", encoding="utf-8") as f:
+			f.write(html)
+		_state["index"].append({"file": filename, "step": step, "url": url, "captured_at": time.time()})
+		with open(os.path.join(directory, INDEX_FILENAME), "w", encoding="utf-8") as f:
+			json.dump(_state["index"], f, ensure_ascii=False, indent=1)
+
+
+def _guess_kind(html: str) -> str:
+	if "ISRC/Music.UCI" in html:
+		return "album_detail"
+	if "search-track-data" in html:
+		return "meta_confirm"
+	if 'id="track-list"' in html:
+		return "track_list"
+	if "mims-pmb" in html:
+		return "my_album"
+	if "rightModal" in html:
+		return "right_modal"
+	return "unknown"
+
+
+def load_fixtures(directory: str) -> list:
+	"""저장된 스냅샷 목록을 (파일경로, 단계, 종류, HTML) 형태로 읽는다."""
+	index_path = os.path.join(directory, INDEX_FILENAME)
+	if os.path.exists(index_path):
+		with open(index_path, encoding="utf-8") as f:
+			entries = json.load(f)
+	else:
+		entries = [{"file": name, "step": ""} for name in sorted(os.listdir(directory)) if name.endswith(".html")]
+	fixtures = []
+	for entry in entries:
+		path = os.path.join(directory, entry["file"])
+		with open(path, encoding="utf-8") as f:
+			html = f.read()
+		kind = STEP_KINDS.get(entry.get("step", "")) or _guess_kind(html)
+		fixtures.append({"path": path, "step": entry.get("step", ""), "kind": kind, "html": html})
+	return fixtures
+
+
+def replay_static(fixtures: list) -> list:
+	"""각 스냅샷에 정적 파서를 적용해 결과·소요시간·실패 여부를 반환한다."""
+	results = []
+	for fx in fixtures:
+		parser, required = KIND_PARSERS.get(fx["kind"], (None, False))
+		if parser is None:
+			continue
+		started = time.perf_counter()
+		parsed = parser(fx["html"])
+		elapsed = time.perf_counter() - started
+		ok = bool(parsed) or not required
+		results.append({"path": fx["path"], "kind": fx["kind"], "parsed": parsed, "elapsed": elapsed, "ok": ok})
+	return results
+
+
+def replay_browser(fixtures: list) -> list:
+	"""헤드리스 크롬으로 스냅샷을 열어 실제 Selenium 추출 함수 결과를 정적 파서 결과와 비교한다."""
+	from register_album import create_driver, extract_codes, _collect_album_cards
+
+	browser_extractors = {
+		"album_detail": extract_codes,
+		"my_album": lambda d: [{"title": a["title"], "code": a["code"]} for a in _collect_album_cards(d)],
+	}
+	results = []
+	driver = create_driver(headless=True)
+	try:
+		for fx in fixtures:
+			extractor = browser_extractors.get(fx["kind"])
+			if extractor is None:
+				continue
+			driver.get("file://" + os.path.abspath(fx["path"]))
+			started = time.perf_counter()
+			from_browser = extractor(driver)
+			elapsed = time.perf_counter() - started
+			from_static = KIND_PARSERS[fx["kind"]][0](fx["html"])
+			ok = bool(from_browser) and from_browser == from_static
+			results.append({"path": fx["path"], "kind": fx["kind"], "parsed": from_browser, "elapsed": elapsed, "ok": ok})
+	finally:
+		driver.quit()
+	return results
+
+
+def main():
+	"""저장된 스냅샷 디렉터리를 재생해 추출 결과와 속도를 출력하고, 실패가 있으면 종료코드 1을 반환한다."""
+	parser = argparse.ArgumentParser(description="MIMS 페이지 스냅샷 재생/검증")
+	parser.add_argument("directory", help="capture로 저장된 스냅샷 디렉터리")
+	parser.add_argument("--browser", action="store_true", help="헤드리스 크롬으로 Selenium 추출 결과도 비교")
+	args = parser.parse_args()
+
+	fixtures = load_fixtures(args.directory)
+	results = replay_static(fixtures)
+	if args.browser:
+		results += replay_browser(fixtures)
+
+	failed = 0
+	for r in results:
+		count = len(r["parsed"]) if r["parsed"] else 0
+		mark = "OK " if r["ok"] else "FAIL"
+		print(f"[{mark}] {r['kind']:<13} {count:>4}건 {r['elapsed'] * 1000:8.2f}ms  {os.path.basename(r['path'])}")
+		if not r["ok"]:
+			failed += 1
+	print(f"스냅샷 {len(fixtures)}개 · 검사 {len(results)}건 · 실패 {failed}건")
+	return 1 if failed else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,233 @@
+import os
+import time
+import atexit
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 프로세스 안에서 처리량·단계별 소요시간·알림·실패 횟수를 세고 OpenMetrics 텍스트(HTTP)로 내보낸다.
+# node_exporter textfile collector는 Prometheus 텍스트 0.0.4만 읽으므로 파일에는 그 형식으로 쓴다.
+# 갱신은 잠금 하나와 dict 덧셈뿐이라 운영 중에도 켜 둔다. 앨범/시간, 트랙/분은 스크레이퍼에서 rate()로 구한다.
+
+METRICS_FILE_ENV = "MIMS_METRICS_FILE"
+METRICS_PORT_ENV = "MIMS_METRICS_PORT"
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+STEP_BUCKETS = (0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+TRACK_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 16, 32)
+
+_lock = threading.Lock()
+_registry = []
+
+
+def _escape(value) -> str:
+	return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names, values, extra=()) -> str:
+	pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+	pairs.extend(f'{n}="{v}"' for n, v in extra)
+	return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+	if value == float("inf"):
+		return "+Inf"
+	return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+	kind = ""
+
+	def __init__(self, name: str, help_text: str, labelnames=()):
+		self.name = name
+		self.help = help_text
+		self.labelnames = tuple(labelnames)
+		self._values = {}
+		_registry.append(self)
+
+	def _key(self, labels: dict) -> tuple:
+		return tuple(str(labels.get(n) or "") for n in self.labelnames)
+
+	def family(self, openmetrics: bool = True) -> str:
+		return self.name
+
+	def _header(self, openmetrics: bool = True) -> list:
+		family = self.family(openmetrics)
+		return [f"# TYPE {family} {self.kind}", f"# HELP {family} {self.help}"]
+
+
+class Counter(_Metric):
+	"""단조 증가 카운터. 샘플 이름에는 _total이 붙는다."""
+
+	kind = "counter"
+
+	def inc(self, amount: float = 1, **labels) -> None:
+		key = self._key(labels)
+		with _lock:
+			self._values[key] = self._values.get(key, 0) + amount
+
+	def value(self, **labels) -> float:
+		return self._values.get(self._key(labels), 0)
+
+	def family(self, openmetrics: bool = True) -> str:
+		# 0.0.4에서는 TYPE 줄의 이름이 샘플 이름(_total 포함)과 같아야 카운터로 읽힌다
+		return self.name if openmetrics else f"{self.name}_total"
+
+	def samples(self, openmetrics: bool = True) -> list:
+		lines = self._header(openmetrics)
+		for key, value in sorted(self._values.items()):
+			lines.append(f"{self.name}_total{_labels(self.labelnames, key)} {_number(value)}")
+		return lines
+
+
+class Gauge(_Metric):
+	"""현재 값을 그대로 내보내는 게이지."""
+
+	kind = "gauge"
+
+	def set(self, value: float, **labels) -> None:
+		key = self._key(labels)
+		with _lock:
+			self._values[key] = value
+
+	def samples(self, openmetrics: bool = True) -> list:
+		lines = self._header(openmetrics)
+		for key, value in sorted(self._values.items()):
+			lines.append(f"{self.name}{_labels(self.labelnames, key)} {_number(value)}")
+		return lines
+
+
+class Histogram(_Metric):
+	"""고정 구간 히스토그램. 구간별 개수와 합계·개수를 누적한다."""
+
+	kind = "histogram"
+
+	def __init__(self, name: str, help_text: str, labelnames=(), buckets=STEP_BUCKETS):
+		super().__init__(name, help_text, labelnames)
+		self.buckets = tuple(sorted(buckets))
+
+	def observe(self, value: float, **labels) -> None:
+		key = self._key(labels)
+		idx = bisect.bisect_left(self.buckets, value)
+		with _lock:
+			state = self._values.get(key)
+			if state is None:
+				state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+			state[0][idx] += 1
+			state[1] += value
+			state[2] += 1
+
+	def samples(self, openmetrics: bool = True) -> list:
+		lines = self._header(openmetrics)
+		for key, (counts, total, count) in sorted(self._values.items()):
+			cumulative = 0
+			for bound, n in zip(self.buckets + (float("inf"),), counts):
+				cumulative += n
+				lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, [('le', _number(float(bound)))])} {cumulative}")
+			lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(round(total, 6))}")
+			lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+		return lines
+
+
+START_TIME = Gauge("mims_process_start_time_seconds", "자동화 프로세스 시작 시각(유닉스 초)")
+ALBUMS = Counter("mims_albums", "처리를 마친 앨범 수", ("status",))
+TRACKS = Counter("mims_tracks", "단계별로 처리한 트랙 수", ("step",))
+ALERTS = Counter("mims_alerts", "수락한 브라우저 알림(alert/confirm) 수", ("step",))
+STEP_SECONDS = Histogram("mims_step_duration_seconds", "자동화 단계별 소요시간", ("step",), STEP_BUCKETS)
+STEP_FAILURES = Counter("mims_step_failures", "예외로 끝난 단계 수", ("step",))
+TRACK_SECONDS = Histogram("mims_track_duration_seconds", "트랙 하나의 재생시간 입력·저장 소요시간", ("step",), TRACK_BUCKETS)
+ERRORS = Counter("mims_errors", "ERROR 수준 이벤트 수", ("step",))
+WARNINGS = Counter("mims_warnings", "WARNING 수준 이벤트 수", ("step",))
+
+START_TIME.set(round(time.time(), 3))
+
+
+def observe_event(levelno: int, fields: dict) -> None:
+	"""구조화 이벤트 하나를 지표에 반영한다. events.event에서 호출된다."""
+	kind = fields.get("kind")
+	step = fields.get("step")
+	if kind == "step":
+		if fields.get("duration") is not None:
+			STEP_SECONDS.observe(fields["duration"], step=step)
+		if levelno >= 40:
+			STEP_FAILURES.inc(step=step)
+	elif kind == "track":
+		TRACKS.inc(step=step)
+		if fields.get("duration") is not None:
+			TRACK_SECONDS.observe(fields["duration"], step=step)
+	elif kind == "alert":
+		ALERTS.inc(step=step)
+	elif kind == "album_end":
+		ALBUMS.inc(status=fields.get("status"))
+	if levelno >= 40:
+		ERRORS.inc(step=step)
+	elif levelno >= 30:
+		WARNINGS.inc(step=step)
+
+
+def render(openmetrics: bool = True) -> str:
+	"""등록된 모든 지표를 OpenMetrics 텍스트로, openmetrics=False면 Prometheus 텍스트 0.0.4로 만든다."""
+	with _lock:
+		lines = []
+		for metric in _registry:
+			lines.extend(metric.samples(openmetrics))
+	if openmetrics:
+		lines.append("# EOF")
+	return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: str) -> None:
+	"""지표를 textfile collector가 읽을 수 있게 Prometheus 텍스트 0.0.4로 쓴다. 임시 파일에 쓴 뒤 바꿔치기한다."""
+	tmp = f"{path}.{os.getpid()}.tmp"
+	with open(tmp, "w", encoding="utf-8") as f:
+		f.write(render(openmetrics=False))
+	os.replace(tmp, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+	def do_GET(self):
+		if self.path.split("?")[0] not in ("/", "/metrics"):
+			self.send_error(404)
+			return
+		body = render().encode("utf-8")
+		self.send_response(200)
+		self.send_header("Content-Type", CONTENT_TYPE)
+		self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def log_message(self, format, *args):
+		pass
+
+
+def start_http_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+	"""/metrics 엔드포인트를 백그라운드 스레드에서 연다."""
+	server = ThreadingHTTPServer((host, port), _MetricsHandler)
+	threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+	return server
+
+
+def start_textfile_writer(path: str, interval: float = 15.0) -> threading.Thread:
+	"""interval초마다, 그리고 종료 시 한 번 더 지표 파일을 쓴다."""
+	def loop():
+		while True:
+			try:
+				write_textfile(path)
+			except OSError:
+				pass
+			time.sleep(interval)
+
+	thread = threading.Thread(target=loop, name="metrics-textfile", daemon=True)
+	thread.start()
+	atexit.register(write_textfile, path)
+	return thread
+
+
+def start_from_env() -> None:
+	"""MIMS_METRICS_PORT가 있으면 HTTP 엔드포인트를, MIMS_METRICS_FILE이 있으면 textfile 출력을 켠다."""
+	port = os.getenv(METRICS_PORT_ENV)
+	if port:
+		start_http_server(int(port))
+	path = os.getenv(METRICS_FILE_ENV)
+	if path:
+		start_textfile_writer(path)
@@ -0,0 +1,246 @@
+import os
+import re
+import json
+import time
+import base64
+import weakref
+import threading
+
+import events
+import metrics
+import ratelimit
+import page_parsers
+
+# 크롬 성능 로그(goog:loggingPrefs performance)에서 XHR/Fetch 응답을 모으고, 발급·업로드 요청이 끝나면
+# CDP Network.getResponseBody로 본문을 읽는다. 발급 결과는 응답 본문에서 먼저 찾고, 본문에 코드가 없으면
+# 브라우저 세션으로 앨범 상세를 한 번 받아(fetch) 파싱한다. 화면 폴링·새로고침 없이 서버 응답만으로 판단한다.
+
+ISSUE_PATTERN_ENV = "MIMS_CAPTURE_ISSUE"
+UPLOAD_PATTERN_ENV = "MIMS_CAPTURE_UPLOAD"
+# 발급 버튼(#setTrackIsrc/#setTrackUCI)과 같은 이름의 /mypage 아래 경로 조각, 엑셀 대량등록의 /mypage/meta 아래 경로 조각에만 맞춘다
+DEFAULT_ISSUE_PATTERNS = {
+	"ISRC": r"(?i)^https?://[^/]*mims\.or\.kr/mypage/(?:[\w-]+/)*setTrackIsrc(?:[/?#]|$)",
+	"UCI": r"(?i)^https?://[^/]*mims\.or\.kr/mypage/(?:[\w-]+/)*setTrackUCI(?:[/?#]|$)",
+}
+DEFAULT_UPLOAD_PATTERN = r"(?i)^https?://[^/]*mims\.or\.kr/mypage/meta/(?:[\w-]+/)*(?:excel|upload)[\w-]*(?:[/?#]|$)"
+API_TYPES = ("XHR", "Fetch")
+MAX_REQUESTS = 500
+ISRC_RE = re.compile(r"^[A-Z]{2}[A-Z0-9]{3}\d{7}$")
+MESSAGE_KEYS = ("msg", "message", "resultMsg", "resultMessage", "errorMessage", "error")
+RESULT_KEYS = ("success", "result", "resultCode", "status", "code")
+OK_VALUES = ("success", "ok", "true", "y", "0", "00", "0000", "200")
+FAIL_VALUES = ("fail", "failure", "error", "false", "n")
+
+RESPONSES = metrics.Counter("mims_network_responses", "성능 로그에서 잡은 발급·업로드 응답", ("kind", "result"))
+
+_lock = threading.Lock()
+_captures = weakref.WeakKeyDictionary()
+
+
+def issue_pattern(label: str) -> str:
+	"""label(ISRC/UCI) 발급 요청 URL 정규식. MIMS_CAPTURE_ISSUE를 주면 두 발급 모두 그 정규식을 쓴다."""
+	return os.getenv(ISSUE_PATTERN_ENV) or DEFAULT_ISSUE_PATTERNS[label]
+
+
+def upload_pattern() -> str:
+	return os.getenv(UPLOAD_PATTERN_ENV) or DEFAULT_UPLOAD_PATTERN
+
+
+class Capture:
+	"""드라이버 하나의 성능 로그를 읽어 요청 ID별 URL·상태·완료 여부를 순서대로 모은다. 로그는 읽으면 비워지므로 드라이버마다 하나만 둔다."""
+
+	def __init__(self, driver):
+		self.driver = driver
+		self.requests = {}
+		self.order = []
+		self.read = 0
+
+	@classmethod
+	def of(cls, driver) -> "Capture":
+		with _lock:
+			capture = _captures.get(driver)
+			if capture is None:
+				capture = _captures[driver] = cls(driver)
+			return capture
+
+	def available(self) -> bool:
+		"""성능 로그를 읽을 수 있는지. create_driver가 performance 로그를 켜지 않은 드라이버면 False."""
+		try:
+			self.poll()
+			return True
+		except Exception:
+			return False
+
+	def poll(self) -> None:
+		for entry in self.driver.get_log("performance"):
+			try:
+				message = json.loads(entry["message"])["message"]
+			except (KeyError, TypeError, ValueError):
+				continue
+			self._handle(message.get("method", ""), message.get("params", {}))
+
+	def _handle(self, method: str, params: dict) -> None:
+		request_id = params.get("requestId")
+		if not request_id:
+			return
+		if method == "Network.requestWillBeSent":
+			if request_id not in self.requests:
+				self.order.append(request_id)
+				self.read += 1
+			self.requests[request_id] = {
+				"id": request_id, "url": params.get("request", {}).get("url", ""), "method": params.get("request", {}).get("method", ""),
+				"type": params.get("type", ""), "status": None, "finished": False, "failed": None,
+			}
+			if len(self.order) > MAX_REQUESTS:
+				self.requests.pop(self.order.pop(0), None)
+			return
+		request = self.requests.get(request_id)
+		if request is None:
+			return
+		if method == "Network.responseReceived":
+			response = params.get("response", {})
+			request.update(status=response.get("status"), type=params.get("type", request["type"]), mime=response.get("mimeType", ""))
+		elif method == "Network.loadingFinished":
+			request["finished"] = True
+		elif method == "Network.loadingFailed":
+			request["failed"] = params.get("errorText") or "failed"
+
+	def mark(self) -> int:
+		"""지금까지 본 요청 수. 클릭 직전에 받아 두었다가 wait에 넘기면 그 뒤에 나간 요청만 본다."""
+		self.poll()
+		return self.read
+
+	def wait(self, pattern: str, since: int, timeout: float = 30, kind: str = "api", between=None):
+		"""since 이후 URL이 pattern에 맞는 XHR/Fetch 요청이 끝날 때까지 기다려 응답 딕셔너리를 반환한다. 없으면 None.
+		between을 주면 로그를 읽기 전마다 호출한다(기다리는 동안 뜨는 확인창 처리 등)."""
+		regex = re.compile(pattern)
+		deadline = time.monotonic() + timeout
+		while True:
+			if between is not None:
+				between()
+			response = self._finished(regex, since)
+			if response is not None:
+				ok = verdict(response)[0]
+				RESPONSES.inc(kind=kind, result="unknown" if ok is None else "ok" if ok else "fail")
+				return response
+			if time.monotonic() >= deadline:
+				RESPONSES.inc(kind=kind, result="missing")
+				return None
+			time.sleep(0.1)
+
+	def _finished(self, regex, since: int):
+		self.poll()
+		skip = max(0, len(self.order) - (self.read - since))
+		for request_id in self.order[skip:]:
+			request = self.requests[request_id]
+			if request["type"] in API_TYPES and regex.search(request["url"]) and (request["finished"] or request["failed"]):
+				return self._with_body(request)
+		return None
+
+	def _with_body(self, request: dict) -> dict:
+		response = dict(request, body="", json=None)
+		if request["failed"]:
+			return response
+		try:
+			result = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request["id"]})
+			body = result.get("body", "")
+			if result.get("base64Encoded"):
+				body = base64.b64decode(body).decode("utf-8", "replace")
+			response["body"] = body
+			response["json"] = json.loads(body)
+		except ValueError:
+			pass
+		except Exception as e:
+			events.debug(f"응답 본문을 읽지 못했습니다: {e}", url=request["url"])
+		return response
+
+
+def _message(payload) -> str:
+	if isinstance(payload, dict):
+		for key in MESSAGE_KEYS:
+			value = payload.get(key)
+			if isinstance(value, str) and value.strip():
+				return value.strip()
+	return ""
+
+
+def verdict(response: dict) -> tuple:
+	"""응답이 성공인지와 서버 메시지를 (True/False/None, str)로 판단한다. 결과 키도 오류 문구도 없으면 None(판단 불가)."""
+	if response.get("failed"):
+		return False, response["failed"]
+	payload = response.get("json")
+	message = _message(payload) or (response.get("body") or "")[:200].strip()
+	if (response.get("status") or 0) >= 400:
+		return False, message or f"HTTP {response['status']}"
+	if isinstance(payload, dict):
+		for key in RESULT_KEYS:
+			value = payload.get(key)
+			if isinstance(value, bool):
+				return value, message
+			if isinstance(value, (str, int)) and str(value).strip().lower() in OK_VALUES:
+				return True, message
+			if isinstance(value, str) and value.strip().lower() in FAIL_VALUES:
+				return False, message
+	if message and ("오류" in message or "실패" in message):
+		return False, message
+	return None, message
+
+
+def validation_errors(payload) -> list:
+	"""응답 JSON에서 서버 검증 오류 문구를 모은다. 키 이름에 error/fail/invalid가 들어간 값과 행 번호가 붙은 메시지를 본다."""
+	errors = []
+	for item in _walk(payload):
+		row = next((item[k] for k in ("row", "rowNum", "line", "rowIndex") if k in item), None)
+		message = _message(item)
+		if row is not None and message:
+			errors.append(f"{row}행: {message}")
+		for key, value in item.items():
+			if not any(n in key.lower() for n in ("error", "fail", "invalid")):
+				continue
+			if isinstance(value, str) and value.strip():
+				errors.append(value.strip())
+			elif isinstance(value, list):
+				errors.extend(str(v).strip() for v in value if isinstance(v, (str, int)) and str(v).strip())
+	return list(dict.fromkeys(errors))
+
+
+def _walk(node):
+	if isinstance(node, dict):
+		yield node
+		for value in node.values():
+			yield from _walk(value)
+	elif isinstance(node, list):
+		for value in node:
+			yield from _walk(value)
+
+
+def _field(item: dict, *needles) -> str:
+	for key, value in item.items():
+		if isinstance(value, str) and any(n in key.lower() for n in needles):
+			return value.strip()
+	return ""
+
+
+def codes_from_payload(payload):
+	"""응답 JSON에서 곡별 {title, isrc, uci} 목록을 찾는다. ISRC 모양의 값을 가진 객체가 없으면 None."""
+	codes = []
+	for item in _walk(payload):
+		isrc = _field(item, "isrc")
+		if ISRC_RE.match(isrc):
+			codes.append({"title": _field(item, "title", "name"), "isrc": isrc, "uci": _field(item, "uci") or None})
+	return codes or None
+
+
+FETCH_JS = """
+const done = arguments[arguments.length - 1];
+fetch(arguments[0], {credentials: 'same-origin'}).then(r => r.text()).then(done).catch(() => done(null));
+"""
+
+
+def fetch_album_codes(driver, url: str):
+	"""브라우저 세션(쿠키)으로 앨범 상세 HTML을 한 번 받아 코드 표를 파싱한다. 화면은 바꾸지 않는다."""
+	ratelimit.acquire("read")
+	html = driver.execute_async_script(FETCH_JS, url)
+	if not html:
+		return None
+	return page_parsers.parse_album_codes(html)
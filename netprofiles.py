@@ -0,0 +1,216 @@
+import os
+import sys
+import json
+import time
+import argparse
+import contextlib
+
+import events
+from register_album import create_driver, login, goto_album_register, issue_album, DEFAULT_EXCEL_FILENAME
+
+# CDP Network.emulateNetworkConditions로 회선 조건(왕복 지연·대역폭)을 바꿔 가며 등록·발급 흐름을 돌리고
+# 단계별 소요시간을 비교한다. 고정 sleep·타임아웃이 한 대의 개발 노트북 회선에 맞춰져 있으므로,
+# 어떤 단계가 RTT에 비례해 늘어나는지(초/100ms RTT) 보고 대기값을 손볼 곳을 찾는 용도다.
+
+SAMPLE_WORKBOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), DEFAULT_EXCEL_FILENAME)
+
+# latency: 추가 왕복 지연(ms), download/upload: kbit/s (-1이면 제한 없음)
+PROFILES = {
+	"none": None,
+	"lan": {"latency": 2, "download": 100_000, "upload": 100_000},
+	"office": {"latency": 20, "download": 30_000, "upload": 15_000},
+	"high_rtt": {"latency": 300, "download": 10_000, "upload": 5_000},
+	"slow3g": {"latency": 400, "download": 400, "upload": 400},
+}
+DEFAULT_PROFILES = ("lan", "office", "high_rtt", "slow3g")
+
+
+def parse_profile(text: str) -> tuple:
+	"""'이름=지연ms:다운kbps:업kbps' 형식의 사용자 프로필을 (이름, 조건)으로 바꾼다. 이름만 주면 PROFILES에서 찾는다."""
+	name, _, spec = text.partition("=")
+	name = name.strip()
+	if not spec:
+		if name not in PROFILES:
+			raise ValueError(f"알 수 없는 회선 프로필: {name} (사용 가능: {', '.join(PROFILES)})")
+		return name, PROFILES[name]
+	parts = [float(p) for p in spec.split(":")]
+	latency, download, upload = (parts + [-1, -1])[:3]
+	return name, {"latency": latency, "download": download, "upload": upload if len(parts) > 2 else download}
+
+
+def _kbps_to_bytes(kbps: float) -> float:
+	return -1 if kbps < 0 else kbps * 1000 / 8
+
+
+def apply(driver, conditions) -> None:
+	"""드라이버에 회선 조건을 건다. None이면 에뮬레이션을 끈다(지연 0, 대역폭 무제한)."""
+	conditions = conditions or {"latency": 0, "download": -1, "upload": -1}
+	driver.execute_cdp_cmd("Network.enable", {})
+	driver.execute_cdp_cmd("Network.emulateNetworkConditions", {
+		"offline": False,
+		"latency": conditions["latency"],
+		"downloadThroughput": _kbps_to_bytes(conditions["download"]),
+		"uploadThroughput": _kbps_to_bytes(conditions["upload"]),
+	})
+
+
+class PhaseTimer:
+	"""events.step 훅으로 단계별 소요시간을 모은다. 가짜 드라이버의 가상 시계로도 잴 수 있게 time.monotonic을 쓴다."""
+
+	def __init__(self):
+		self.phases = None
+		self._started = {}
+		events.on_step_enter(self._enter)
+		events.on_step_exit(self._exit)
+
+	def _enter(self, name: str) -> None:
+		if self.phases is not None:
+			self._started[name] = time.monotonic()
+
+	def _exit(self, name: str) -> None:
+		started = self._started.pop(name, None)
+		if self.phases is not None and started is not None:
+			self.phases[name] = self.phases.get(name, 0.0) + time.monotonic() - started
+
+	@contextlib.contextmanager
+	def record(self):
+		"""이 블록 안에서 끝난 단계의 소요시간을 담은 딕셔너리를 내준다. "total"에 블록 전체 시간을 더한다."""
+		phases = self.phases = {}
+		self._started = {}
+		started = time.monotonic()
+		try:
+			yield phases
+		finally:
+			phases["total"] = time.monotonic() - started
+			self.phases = None
+
+
+def _run_flow(driver, mims_id: str, mims_password: str, excel_path: str, album_code=None) -> bool:
+	"""로그인 후 album_code가 있으면 그 앨범의 발급만, 없으면 엑셀 등록부터 발급까지 수행한다."""
+	if not login(driver, mims_id, mims_password):
+		return False
+	if album_code:
+		return bool(issue_album(driver, album_code))
+	return goto_album_register(driver, excel_path)
+
+
+def run_profile(name: str, conditions, flow, repeat: int, timer: PhaseTimer, driver_factory) -> dict:
+	"""한 회선 프로필에서 흐름을 repeat번 돌려 단계별 평균 소요시간을 반환한다."""
+	runs = []
+	for i in range(repeat):
+		driver = driver_factory()
+		try:
+			apply(driver, conditions)
+			events.info(f"회선 프로필 {name} 실행 {i + 1}/{repeat}", profile=name)
+			with timer.record() as phases:
+				ok = flow(driver)
+			runs.append({"ok": bool(ok), "phases": phases})
+		except Exception as e:
+			events.error(f"회선 프로필 {name} 실행 실패: {e}", profile=name)
+			runs.append({"ok": False, "phases": {}})
+		finally:
+			try:
+				driver.quit()
+			except Exception:
+				pass
+	names = []
+	for run in runs:
+		names.extend(n for n in run["phases"] if n not in names)
+	mean = {n: sum(r["phases"].get(n, 0.0) for r in runs) / len(runs) for n in names}
+	return {"conditions": conditions, "runs": runs, "ok": sum(1 for r in runs if r["ok"]), "phases": mean}
+
+
+def rtt_slopes(results: dict) -> dict:
+	"""단계별로 프로필의 지연(ms)에 대한 소요시간의 최소제곱 기울기(초/100ms RTT)를 구한다."""
+	points = [((r["conditions"] or {}).get("latency", 0), r["phases"]) for r in results.values()]
+	latencies = [lat for lat, _ in points]
+	mean_lat = sum(latencies) / len(latencies)
+	variance = sum((lat - mean_lat) ** 2 for lat in latencies)
+	slopes = {}
+	if not variance:
+		return slopes
+	for name in {n for _, phases in points for n in phases}:
+		values = [phases.get(name, 0.0) for _, phases in points]
+		mean_val = sum(values) / len(values)
+		slopes[name] = sum((lat - mean_lat) * (v - mean_val) for lat, v in zip(latencies, values)) / variance * 100
+	return slopes
+
+
+def print_report(results: dict, slopes: dict) -> None:
+	"""단계 × 프로필 표. 마지막 열은 RTT 100ms당 늘어나는 초이며 큰 순서로 정렬한다."""
+	profiles = list(results)
+	phases = sorted({n for r in results.values() for n in r["phases"]}, key=lambda n: (n == "total", -slopes.get(n, 0.0)))
+	print(f"{'phase':<18}" + "".join(f"{p:>11}" for p in profiles) + f"{'s/100ms':>10}")
+	for name in phases:
+		cells = "".join(f"{results[p]['phases'].get(name, 0.0):>10.2f}s" for p in profiles)
+		slope = f"{slopes[name]:>+10.2f}" if name in slopes else f"{'-':>10}"
+		print(f"{name:<18}{cells}{slope}")
+	print(f"{'ok':<18}" + "".join(f"{str(results[p]['ok']) + '/' + str(len(results[p]['runs'])):>11}" for p in profiles))
+
+
+def _fake_setup(excel_path: str):
+	"""가짜 드라이버·가상 시계로 흐름을 돌릴 때 쓸 드라이버 팩토리와 시계를 만든다."""
+	import tempfile
+	import scenarios
+	from fakedriver import FakeDriver, VirtualClock
+	from workbook import read_album
+
+	scenarios._prepare_environment(tempfile.mkdtemp(prefix="mims_netprofiles_"))
+	clock = VirtualClock()
+	fixture = scenarios.register_fixture(read_album(excel_path))
+	return (lambda: FakeDriver(fixture, clock)), clock
+
+
+def main():
+	"""회선 프로필마다 등록·발급 흐름을 돌려 단계별 소요시간과 RTT 민감도를 출력한다."""
+	parser = argparse.ArgumentParser(description="회선 조건(CDP 네트워크 에뮬레이션)별 등록·발급 단계 소요시간 비교")
+	parser.add_argument("profiles", nargs="*", default=list(DEFAULT_PROFILES), help=f"프로필 이름 또는 이름=지연ms:다운kbps:업kbps (기본: {' '.join(DEFAULT_PROFILES)})")
+	parser.add_argument("--excel", default=SAMPLE_WORKBOOK, help="등록할 엑셀 (프로필·반복마다 새 앨범이 등록된다)")
+	parser.add_argument("--album-code", help="등록 없이 이 앨범의 발급만 잰다")
+	parser.add_argument("-n", "--repeat", type=int, default=1, help="프로필별 반복 횟수")
+	parser.add_argument("--headless", action="store_true", help="헤드리스 크롬으로 실행")
+	parser.add_argument("--fake", action="store_true", help="사이트 대신 가짜 드라이버(scenarios 픽스처)와 가상 시계로 실행")
+	parser.add_argument("--out", help="결과 JSON 저장 경로")
+	args = parser.parse_args()
+
+	try:
+		profiles = dict(parse_profile(p) for p in args.profiles)
+	except ValueError as e:
+		print(e, file=sys.stderr)
+		return 2
+
+	clock = None
+	if args.fake:
+		factory, clock = _fake_setup(args.excel)
+		mims_id, mims_password = "bench@example.com", "secret"
+		album_code = "A1001" if args.album_code else None
+	else:
+		from dotenv import load_dotenv
+		load_dotenv()
+		events.setup()
+		mims_id, mims_password = os.getenv("MIMS_ID"), os.getenv("MIMS_PASSWORD")
+		if not mims_id or not mims_password:
+			events.error("환경변수 MIMS_ID/MIMS_PASSWORD가 설정되지 않았습니다. .env를 확인하세요.")
+			return 1
+		factory = lambda: create_driver(args.headless)
+		album_code = args.album_code
+
+	timer = PhaseTimer()
+	flow = lambda d: _run_flow(d, mims_id, mims_password, args.excel, album_code)
+	results = {}
+	with clock.patch() if clock else contextlib.nullcontext():
+		for name, conditions in profiles.items():
+			results[name] = run_profile(name, conditions, flow, args.repeat, timer, factory)
+
+	slopes = rtt_slopes(results)
+	print_report(results, slopes)
+	if args.out:
+		with open(args.out, "w", encoding="utf-8") as f:
+			json.dump({"profiles": results, "rtt_slopes": slopes}, f, ensure_ascii=False, indent=1)
+		print(f"결과 저장: {args.out}")
+	events.shutdown()
+	return 0 if all(r["ok"] == len(r["runs"]) for r in results.values()) else 1
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,295 @@
+import re
+from html.parser import HTMLParser
+
+# 브라우저 없이 저장된 MIMS 페이지(HTML)에서 자동화가 쓰는 값들을 뽑아내는 정적 파서 모음
+
+_VOID_TAGS = {
+	"area", "base", "br", "col", "embed", "hr", "img", "input",
+	"link", "meta", "param", "source", "track", "wbr",
+}
+_WS_RE = re.compile(r"\s+")
+_DURATION_TEXT_RE = re.compile(r"^\d{1,2}:\d{2}(?::\d{2})?$")
+
+
+class Node:
+	"""파싱된 HTML 요소 하나. children에는 하위 Node와 텍스트(str)가 섞여 있다."""
+
+	__slots__ = ("tag", "attrs", "children", "parent")
+
+	def __init__(self, tag: str, attrs: dict, parent=None):
+		self.tag = tag
+		self.attrs = attrs
+		self.children = []
+		self.parent = parent
+
+	@property
+	def classes(self) -> list:
+		return (self.attrs.get("class") or "").split()
+
+	def get(self, name: str, default=None):
+		"""속성 값을 반환한다."""
+		return self.attrs.get(name, default)
+
+	def text(self) -> str:
+		"""하위 텍스트를 모두 이어 붙이고 공백을 정리해 반환한다."""
+		return _WS_RE.sub(" ", "".join(self._iter_text())).strip()
+
+	def _iter_text(self):
+		for child in self.children:
+			if isinstance(child, str):
+				yield child
+			else:
+				yield from child._iter_text()
+
+	def own_text(self) -> str:
+		"""직계 텍스트 노드만 이어 붙여 반환한다. (XPath text()와 같은 범위)"""
+		return "".join(c for c in self.children if isinstance(c, str))
+
+	def iter(self):
+		"""하위 요소를 문서 순서대로 순회한다."""
+		for child in self.children:
+			if not isinstance(child, str):
+				yield child
+				yield from child.iter()
+
+	def find_all(self, tag=None, cls=None, id=None, **attrs) -> list:
+		"""태그·클래스·id·속성 조건에 맞는 하위 요소를 모두 반환한다."""
+		return [n for n in self.iter() if _matches(n, tag, cls, id, attrs)]
+
+	def find(self, tag=None, cls=None, id=None, **attrs):
+		"""조건에 맞는 첫 하위 요소를 반환한다. 없으면 None."""
+		for n in self.iter():
+			if _matches(n, tag, cls, id, attrs):
+				return n
+		return None
+
+	def child_elements(self, tag=None) -> list:
+		"""직계 하위 요소를 반환한다."""
+		return [c for c in self.children if not isinstance(c, str) and (tag is None or c.tag == tag)]
+
+	def ancestor(self, tag: str):
+		"""가장 가까운 상위 tag 요소를 반환한다."""
+		node = self.parent
+		while node is not None and node.tag != tag:
+			node = node.parent
+		return node
+
+
+def _matches(node: Node, tag, cls, id, attrs) -> bool:
+	if tag is not None and node.tag != tag:
+		return False
+	if id is not None and node.attrs.get("id") != id:
+		return False
+	if cls is not None and cls not in node.classes:
+		return False
+	for name, value in attrs.items():
+		name = name.replace("_", "-")
+		if value is True:
+			if name not in node.attrs:
+				return False
+		elif node.attrs.get(name) != value:
+			return False
+	return True
+
+
+class _TreeBuilder(HTMLParser):
+	"""HTMLParser 이벤트로 Node 트리를 만든다. 닫히지 않은 태그는 상위 태그가 닫힐 때 함께 닫는다."""
+
+	def __init__(self):
+		super().__init__(convert_charrefs=True)
+		self.root = Node("#document", {})
+		self._stack = [self.root]
+
+	def handle_starttag(self, tag, attrs):
+		node = Node(tag, {k: (v if v is not None else "") for k, v in attrs}, self._stack[-1])
+		self._stack[-1].children.append(node)
+		if tag not in _VOID_TAGS:
+			self._stack.append(node)
+
+	def handle_startendtag(self, tag, attrs):
+		node = Node(tag, {k: (v if v is not None else "") for k, v in attrs}, self._stack[-1])
+		self._stack[-1].children.append(node)
+
+	def handle_endtag(self, tag):
+		for i in range(len(self._stack) - 1, 0, -1):
+			if self._stack[i].tag == tag:
+				del self._stack[i:]
+				return
+
+	def handle_data(self, data):
+		self._stack[-1].children.append(data)
+
+
+def parse_html(html: str) -> Node:
+	"""HTML 문자열을 Node 트리로 파싱한다."""
+	builder = _TreeBuilder()
+	builder.feed(html)
+	builder.close()
+	return builder.root
+
+
+def _ensure_tree(doc):
+	return parse_html(doc) if isinstance(doc, str) else doc
+
+
+def _tbody_rows(table: Node) -> list:
+	rows = []
+	for tbody in table.find_all("tbody"):
+		if tbody.ancestor("table") is table:
+			rows.extend(tbody.child_elements("tr"))
+	return rows
+
+
+def parse_album_cards(doc) -> list:
+	"""My앨범(div.mims-pmb)의 앨범 카드에서 제목과 코드를 추출한다."""
+	root = _ensure_tree(doc)
+	albums = []
+	for container in root.find_all("div", cls="mims-pmb"):
+		for card in container.find_all(cls="thumbnail-style"):
+			title = ""
+			for h3 in card.find_all("h3"):
+				links = h3.child_elements("a")
+				if links:
+					title = links[0].text()
+					break
+			link = card.find("a", cls="go-view")
+			if link is None:
+				continue
+			albums.append({"title": title, "code": link.get("data-album-code")})
+	return albums
+
+
+def parse_album_codes(doc):
+	"""앨범 상세의 'ISRC/Music.UCI' 표에서 곡명·ISRC·UCI를 추출한다. extract_codes와 같이 ISRC/UCI가 빠진 행이 있으면 None."""
+	root = _ensure_tree(doc)
+	table = None
+	for th in root.find_all("th"):
+		if "ISRC/Music.UCI" in th.own_text():
+			table = th.ancestor("table")
+			break
+	if table is None:
+		return []
+	codes = []
+	for row in _tbody_rows(table):
+		isrc_el = row.find("span", cls="g-bg-darkred")
+		if isrc_el is None:
+			return None
+		uci_el = row.find("span", cls="g-bg-blue")
+		if uci_el is None:
+			return None
+		cells = row.child_elements("td")
+		title_el = cells[3].find("a") if len(cells) >= 4 else None
+		if title_el is None:
+			return None
+		codes.append({
+			"title": title_el.text(),
+			"isrc": isrc_el.get("data-clipboard-data"),
+			"uci": uci_el.get("data-clipboard-data"),
+		})
+	return codes
+
+
+def parse_album_code_rows(doc) -> list:
+	"""앨범 상세 표의 행마다 곡명·ISRC·UCI를 추출한다. 빠진 값은 None으로 둔다."""
+	root = _ensure_tree(doc)
+	table = None
+	for th in root.find_all("th"):
+		if "ISRC/Music.UCI" in th.own_text():
+			table = th.ancestor("table")
+			break
+	rows = []
+	for row in (_tbody_rows(table) if table is not None else []):
+		isrc_el = row.find("span", cls="g-bg-darkred", data_clipboard_data=True)
+		uci_el = row.find("span", cls="g-bg-blue", data_clipboard_data=True)
+		cells = row.child_elements("td")
+		title_el = cells[3].find("a") if len(cells) >= 4 else None
+		rows.append({
+			"title": title_el.text() if title_el is not None else "",
+			"isrc": isrc_el.get("data-clipboard-data") if isrc_el is not None else None,
+			"uci": uci_el.get("data-clipboard-data") if uci_el is not None else None,
+		})
+	return rows
+
+
+def count_album_code_rows(doc) -> dict:
+	"""앨범 상세 표의 전체 행 수와 ISRC/UCI가 채워진 행 수를 센다."""
+	root = _ensure_tree(doc)
+	table = None
+	for th in root.find_all("th"):
+		if "ISRC/Music.UCI" in th.own_text():
+			table = th.ancestor("table")
+			break
+	rows = _tbody_rows(table) if table is not None else []
+	isrc = sum(1 for r in rows if r.find("span", cls="g-bg-darkred", data_clipboard_data=True) is not None)
+	uci = sum(1 for r in rows if r.find("span", cls="g-bg-blue", data_clipboard_data=True) is not None)
+	return {"rows": len(rows), "isrc": isrc, "uci": uci}
+
+
+def _track_duration_cell(tr):
+	"""행에서 재생시간 칸을 찾는다. for 속성에 duration이 들어간 칸, 없으면 시:분:초 모양의 칸."""
+	cells = tr.child_elements("td")
+	for td in cells:
+		if "duration" in (td.get("for") or "").lower():
+			return td
+	for td in cells:
+		if _DURATION_TEXT_RE.match(td.text()):
+			return td
+	return None
+
+
+def parse_track_list(doc) -> list:
+	"""곡정보 탭 #track-list의 행별 import_seq·곡제목·재생시간을 추출한다. 재생시간 칸을 못 찾은 행은 None."""
+	root = _ensure_tree(doc)
+	track_list = root.find(id="track-list")
+	if track_list is None:
+		return []
+	rows = []
+	for tbody in track_list.find_all("tbody"):
+		for tr in tbody.child_elements("tr"):
+			title_td = tr.find("td", **{"for": "displayTrackTitle"})
+			duration_td = _track_duration_cell(tr)
+			rows.append({
+				"import_seq": tr.get("data-import_seq") or "",
+				"title": title_td.text() if title_td is not None else "",
+				"duration": duration_td.text() if duration_td is not None else None,
+			})
+	return rows
+
+
+def missing_durations(doc, total: int):
+	"""#track-list에서 재생시간이 비어 있는 행 인덱스 목록. 행 수가 total과 다르거나 재생시간 칸을 읽을 수 없으면 None."""
+	rows = parse_track_list(doc)
+	if len(rows) != total or all(r["duration"] is None for r in rows):
+		return None
+	return [i for i, r in enumerate(rows) if not r["duration"]]
+
+
+def parse_search_tracks(doc) -> list:
+	"""앨범중복확인 탭 #search-track-data의 검색된 수록곡 제목을 추출한다."""
+	root = _ensure_tree(doc)
+	container = root.find(id="search-track-data")
+	if container is None:
+		return []
+	titles = []
+	for table in container.find_all("table"):
+		for tr in _tbody_rows(table):
+			title_el = tr.find(cls="select-title")
+			if title_el is not None:
+				titles.append(title_el.text())
+				continue
+			cells = tr.child_elements("td")
+			titles.append(cells[2].text() if len(cells) > 2 else tr.text())
+	return titles
+
+
+def parse_right_modal(doc) -> list:
+	"""#rightModal 회원 검색 결과의 행별 셀 텍스트를 추출한다."""
+	root = _ensure_tree(doc)
+	modal = root.find(id="rightModal")
+	if modal is None:
+		return []
+	rows = []
+	for table in modal.find_all("table"):
+		for tr in _tbody_rows(table):
+			rows.append([td.text() for td in tr.child_elements("td")])
+	return rows
@@ -0,0 +1,245 @@
+import weakref
+import threading
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+import metrics
+import ratelimit
+
+# 자주 쓰는 화면 요소를 페이지 객체로 묶고 찾은 요소를 드라이버별로 기억해 둔다.
+# 기억해 둔 요소는 호출할 때 StaleElementReferenceException이 나면 그때만 다시 찾아 한 번 재시도한다.
+# 같은 요소를 대기 루프마다 다시 찾던 곳(곡정보 탭, importSeq, 재생시간 입력칸, 발급 코드 수 등)이 대상이다.
+
+LOOKUPS = metrics.Counter("mims_page_element_lookups", "페이지 객체 요소 조회 (hit: 캐시, miss: 첫 조회, stale: 다시 찾음)", ("page", "result"))
+
+_lock = threading.Lock()
+_pages = weakref.WeakKeyDictionary()
+
+
+class Handle:
+	"""기억해 둔 WebElement 대리자. 요소가 stale이면 다시 찾아 같은 호출을 한 번 더 한다."""
+
+	def __init__(self, page, name: str, element):
+		self._page = page
+		self._name = name
+		self.element = element
+
+	def _retry(self, call):
+		try:
+			return call(self.element)
+		except StaleElementReferenceException:
+			self.element = self._page._resolve(self._name, stale=True)
+			return call(self.element)
+
+	def __getattr__(self, attr):
+		value = self._retry(lambda el: getattr(el, attr))
+		if not callable(value):
+			return value
+		return lambda *args, **kwargs: self._retry(lambda el: getattr(el, attr)(*args, **kwargs))
+
+
+class Page:
+	"""로케이터 이름 → (By, 값) 표를 가진 페이지. 요소를 기억해 두고 stale일 때만 다시 찾는다."""
+
+	name = "page"
+	LOCATORS = {}
+
+	def __init__(self, driver):
+		self.driver = driver
+		self.stats = {"hit": 0, "miss": 0, "stale": 0}
+		self._handles = {}
+		self._lists = {}
+
+	@classmethod
+	def of(cls, driver) -> "Page":
+		"""드라이버마다 하나씩 만든 페이지 객체를 돌려준다. 드라이버가 바뀌면 캐시도 새로 시작한다."""
+		with _lock:
+			pages = _pages.setdefault(driver, {})
+			page = pages.get(cls)
+			if page is None:
+				page = pages[cls] = cls(driver)
+			return page
+
+	def _count(self, result: str) -> None:
+		self.stats[result] += 1
+		LOOKUPS.inc(page=self.name, result=result)
+
+	def _resolve(self, name: str, stale: bool = False):
+		self._count("stale" if stale else "miss")
+		return self.driver.find_element(*self.LOCATORS[name])
+
+	def find(self, name: str) -> Handle:
+		"""name 요소의 대리자를 반환한다. 처음이면 찾고, 그 뒤로는 기억해 둔 요소를 쓴다. 없으면 NoSuchElementException."""
+		handle = self._handles.get(name)
+		if handle is not None:
+			self._count("hit")
+			return handle
+		handle = self._handles[name] = Handle(self, name, self._resolve(name))
+		return handle
+
+	def find_all(self, name: str) -> list:
+		"""name 요소 목록. 목록 중 하나라도 stale이면 목록 전체를 다시 찾는다."""
+		elements = self._lists.get(name)
+		if elements:
+			try:
+				elements[0].is_enabled()
+				self._count("hit")
+				return elements
+			except StaleElementReferenceException:
+				self._count("stale")
+		else:
+			self._count("miss")
+		elements = self._lists[name] = self.driver.find_elements(*self.LOCATORS[name])
+		return elements
+
+	def forget(self, *names) -> None:
+		"""새로고침·화면 전환처럼 요소가 바뀐 것을 아는 경우 기억을 지운다. 이름이 없으면 모두 지운다."""
+		for name in names or list(self._handles) + list(self._lists):
+			self._handles.pop(name, None)
+			self._lists.pop(name, None)
+
+	def refresh(self) -> None:
+		ratelimit.acquire("read")
+		self.driver.refresh()
+		self.forget()
+
+	def attribute(self, name: str, attr: str = "value") -> str:
+		return (self.find(name).get_attribute(attr) or "").strip()
+
+	def wait(self, condition, timeout: float = 10):
+		"""condition(page)이 참이 될 때까지 기다린다. 요소가 아직 없으면(NoSuchElementException) 계속 기다린다."""
+		return WebDriverWait(self.driver, timeout, ignored_exceptions=(NoSuchElementException, StaleElementReferenceException)).until(lambda d: condition(self))
+
+	def wait_visible(self, name: str, timeout: float = 10) -> Handle:
+		return self.wait(lambda p: p.find(name) if p.find(name).is_displayed() else False, timeout)
+
+	def wait_clickable(self, name: str, timeout: float = 10) -> Handle:
+		def clickable(p):
+			handle = p.find(name)
+			return handle if handle.is_displayed() and handle.is_enabled() else False
+		return self.wait(clickable, timeout)
+
+	def script(self, js: str, *args):
+		"""대리자를 WebElement로 풀어서 스크립트를 실행한다. stale이면 다시 찾아 한 번 더 실행한다."""
+		try:
+			return self.driver.execute_script(js, *[a.element if isinstance(a, Handle) else a for a in args])
+		except StaleElementReferenceException:
+			for a in args:
+				if isinstance(a, Handle):
+					a.element = self._resolve(a._name, stale=True)
+			fresh = [a.element if isinstance(a, Handle) else a for a in args]
+			return self.driver.execute_script(js, *fresh)
+
+	def click(self, name: str, kind: str = "read", timeout: float = 10) -> None:
+		"""보이도록 스크롤한 뒤 속도 제한을 거쳐 클릭한다."""
+		handle = self.wait_clickable(name, timeout)
+		self.script("arguments[0].scrollIntoView({block:'center'});", handle)
+		ratelimit.acquire(kind)
+		handle.click()
+
+
+class MetaRegisterPage(Page):
+	"""앨범 상세 등록 화면(앨범정보·곡정보·앨범중복확인 탭)."""
+
+	name = "meta_register"
+	LOCATORS = {
+		"meta_tracks": (By.ID, "meta-tracks"),
+		"tracks_tab": (By.CSS_SELECTOR, "#metaTab a[data-target='#meta-tracks']"),
+		"next_album": (By.ID, "meta-next-album-btn"),
+		"track_list": (By.ID, "track-list"),
+		"track_rows": (By.CSS_SELECTOR, "#track-list tbody tr"),
+		"import_seq": (By.ID, "importSeq"),
+		"duration_hh": (By.ID, "duration_hh"),
+		"duration_mm": (By.ID, "duration_mm"),
+		"duration_ss": (By.ID, "duration_ss"),
+		"duration": (By.ID, "duration"),
+		"save_next": (By.ID, "update-meta-track-next-track-btn"),
+	}
+	TRACK_LINK = (By.CSS_SELECTOR, "td[for='displayTrackTitle'] a.show-track-btn")
+
+	def tracks_tab_active(self) -> bool:
+		classes = self.find("meta_tracks").get_attribute("class") or ""
+		return "show" in classes and "active" in classes
+
+	def rows(self) -> list:
+		return self.find_all("track_rows")
+
+	def row_seqs(self) -> list:
+		return [(r.get_attribute("data-import_seq") or "") for r in self.rows()]
+
+	def current_seq(self) -> str:
+		return self.attribute("import_seq")
+
+	def wait_seq(self, seq: str, timeout: float = 10) -> None:
+		self.wait(lambda p: p.current_seq() == seq, timeout)
+
+	def duration_inputs(self, timeout: float = 10) -> tuple:
+		"""HH·MM·SS 입력칸과 숨은 duration 칸. 트랙을 바꿔도 같은 요소를 다시 쓰므로 처음 한 번만 찾는다."""
+		return (
+			self.wait_visible("duration_hh", timeout),
+			self.wait_visible("duration_mm", timeout),
+			self.wait_visible("duration_ss", timeout),
+			self.find("duration"),
+		)
+
+
+class RightsTabPage(Page):
+	"""권리정보 탭."""
+
+	name = "rights"
+	LOCATORS = {
+		"rights_tab": (By.CSS_SELECTOR, "#metaTab a[data-target='#meta-right']"),
+		"apply": (By.ID, "track-right-apply"),
+		"register": (By.ID, "right-reg-btn"),
+	}
+
+
+class AlbumDetailPage(Page):
+	"""앨범 상세(발급) 화면. 코드 수는 기억해 둔 수록곡 표 안에서만 센다."""
+
+	name = "album_detail"
+	LOCATORS = {
+		"code_table": (By.XPATH, "//th[contains(text(), 'ISRC/Music.UCI')]/ancestor::table"),
+		"issue_isrc": (By.ID, "setTrackIsrc"),
+		"issue_uci": (By.ID, "setTrackUCI"),
+	}
+	ROWS = (By.CSS_SELECTOR, "tbody tr")
+	ISRC_APPLIED = (By.CSS_SELECTOR, "span.g-bg-darkred[data-clipboard-data]")
+	UCI_APPLIED = (By.CSS_SELECTOR, "span.g-bg-blue[data-clipboard-data]")
+
+	def _count_in_table(self, locator) -> int:
+		return len(self.find("code_table").find_elements(*locator))
+
+	def count_rows(self) -> int:
+		return self._count_in_table(self.ROWS)
+
+	def count_isrc(self) -> int:
+		return self._count_in_table(self.ISRC_APPLIED)
+
+	def count_uci(self) -> int:
+		return self._count_in_table(self.UCI_APPLIED)
+
+
+class MyAlbumPage(Page):
+	"""My앨범 목록 화면."""
+
+	name = "my_album"
+	LOCATORS = {
+		"menu_link": (By.CSS_SELECTOR, 'a[href="/mypage/album"]'),
+		"container": (By.CSS_SELECTOR, "div.mims-pmb"),
+		"cards": (By.CSS_SELECTOR, "div.mims-pmb .thumbnail-style"),
+	}
+
+
+def stats() -> dict:
+	"""모든 드라이버의 페이지별 hit/miss/stale 합계."""
+	totals = {}
+	with _lock:
+		for pages in _pages.values():
+			for page in pages.values():
+				row = totals.setdefault(page.name, {"hit": 0, "miss": 0, "stale": 0})
+				for k, v in page.stats.items():
+					row[k] += v
+	return totals
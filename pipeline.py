@@ -0,0 +1,461 @@
+import os
+import time
+import queue
+import argparse
+import threading
+import traceback
+from dotenv import load_dotenv
+
+import events
+import metrics
+import title_index
+from catalog import append_history
+from workbook import DurationReport
+from preprocess import preprocess_one, preprocess_many
+from register_album import register_workbook, find_album_code, issue_album, _print_codes
+from session import BrowserSession, RecyclePolicy
+from tabs import TabIssuer
+from watchdog import Watchdog, parse_budgets
+
+_STOP = object()
+
+
+class StageStats:
+	"""단계별 처리 수·실패 수·작업 시간을 모아 가동률을 계산한다."""
+
+	def __init__(self, name: str, workers: int):
+		self.name = name
+		self.workers = workers
+		self.done = 0
+		self.failed = 0
+		self.busy = 0.0
+		self.started = time.time()
+		self._active = {}
+		self._lock = threading.Lock()
+
+	def begin(self) -> None:
+		"""현재 워커가 작업을 시작했음을 기록한다."""
+		with self._lock:
+			self._active[threading.get_ident()] = time.time()
+
+	def release(self) -> None:
+		"""현재 워커의 작업 시간만 정산한다. 완료 수는 세지 않는다."""
+		with self._lock:
+			began = self._active.pop(threading.get_ident(), None)
+			if began is not None:
+				self.busy += time.time() - began
+
+	def end(self, ok: bool) -> None:
+		"""현재 워커의 작업 종료와 성공 여부를 기록한다."""
+		self.release()
+		with self._lock:
+			if ok:
+				self.done += 1
+			else:
+				self.failed += 1
+
+	def utilisation(self) -> float:
+		"""시작 이후 전체 워커 시간 대비 작업 중이던 시간의 비율을 반환한다."""
+		with self._lock:
+			now = time.time()
+			busy = self.busy + sum(now - t for t in self._active.values())
+			capacity = (now - self.started) * self.workers
+		if capacity <= 0:
+			return 0.0
+		return min(1.0, busy / capacity)
+
+
+def _job_name(job: dict) -> str:
+	return job["title"] or os.path.basename(job["excel_path"])
+
+
+class AlbumPipeline:
+	"""등록 단계와 발급 단계를 큐로 연결해 여러 앨범을 겹쳐서 처리한다."""
+
+	def __init__(self, mims_id: str, mims_password: str, register_workers: int = 1, issue_workers: int = 1, report_interval: float = 30.0, verify_mode: str = "smart", strict_durations: bool = False, skip_duplicates: bool = False, recycle_policy=None, watchdog=None, max_retries: int = 1, preprocess_workers=None, issue_tabs: int = 1):
+		self.mims_id = mims_id
+		self.mims_password = mims_password
+		self.register_queue = queue.Queue()
+		self.issue_queue = queue.Queue()
+		self.register_stats = StageStats("등록", max(1, register_workers))
+		self.issue_stats = StageStats("발급", max(1, issue_workers))
+		self.report_interval = report_interval
+		self.verify_mode = verify_mode
+		self.strict_durations = strict_durations
+		self.skip_duplicates = skip_duplicates
+		self._title_index = None
+		self._code_index = None
+		self._titles = set()
+		self.recycle_policy = recycle_policy or RecyclePolicy.from_env()
+		self.sessions = []
+		self.watchdog = watchdog or Watchdog()
+		self.max_retries = max_retries
+		self.preprocess_workers = preprocess_workers
+		self.issue_tabs = max(1, issue_tabs)
+		self.results = []
+		self._results_lock = threading.Lock()
+		self._stopped = threading.Event()
+
+	def submit(self, excel_path: str, prepared=None) -> None:
+		"""엑셀 재생시간 열과 중복 의심·기존 코드 보유 트랙을 먼저 검사한 뒤 등록 대기열에 넣는다.
+
+		prepared는 preprocess 결과다. 없으면 이 자리에서 전처리한다.
+		"""
+		job = {"excel_path": os.path.abspath(excel_path), "title": "", "code": None, "durations": None, "album": None, "upload_path": None}
+		prepared = prepared or preprocess_one(job["excel_path"])
+		if prepared.get("error"):
+			self._finish(job, "failed", f"엑셀을 읽지 못함: {prepared['error']}")
+			return
+		job["album"] = prepared["album"]
+		job["durations"] = DurationReport.from_dict(prepared["durations"])
+		job["upload_path"] = prepared["upload_path"]
+		job["title"] = job["album"]["title"]
+		# 등록 세션이 여럿이면 업로드 목록·My앨범에서 제목으로 자기 앨범을 찾으므로 같은 제목을 동시에 올리지 않는다
+		if self.register_stats.workers > 1 and job["title"] in self._titles:
+			self._finish(job, "rejected", "같은 제목의 앨범이 이미 대기열에 있음 (등록 세션 여럿)")
+			return
+		self._titles.add(job["title"])
+		if self._title_index is None:
+			self._title_index = title_index.load_default_index()
+			self._code_index = title_index.build_code_index()
+		with events.album_context(_job_name(job), report=False):
+			job["durations"].print_report()
+			if self.strict_durations and not job["durations"].ok:
+				self._finish(job, "rejected", "재생시간 검증 오류")
+				return
+			if title_index.precheck(job["album"], self._title_index) and self.skip_duplicates:
+				self._finish(job, "rejected", "중복 의심 트랙 있음")
+				return
+			if title_index.reuse_check(job["album"], self._code_index) and self.skip_duplicates:
+				self._finish(job, "rejected", "기존 ISRC 보유 트랙 있음")
+				return
+		self.register_queue.put(job)
+
+	def run(self, excel_paths) -> list:
+		"""모든 엑셀을 등록→발급 순서로 처리하고 앨범별 결과 목록을 반환한다."""
+		for path, prepared in zip(excel_paths, preprocess_many(excel_paths, self.preprocess_workers)):
+			self.submit(path, prepared)
+
+		register_threads = [
+			threading.Thread(target=self._register_worker, name=f"register-{i+1}", daemon=True)
+			for i in range(self.register_stats.workers)
+		]
+		issue_threads = [
+			threading.Thread(target=self._issue_worker, name=f"issue-{i+1}", daemon=True)
+			for i in range(self.issue_stats.workers)
+		]
+		monitor = threading.Thread(target=self._monitor, name="pipeline-monitor", daemon=True)
+
+		self.register_stats.started = self.issue_stats.started = time.time()
+		for t in register_threads + issue_threads:
+			t.start()
+		monitor.start()
+
+		self.watchdog.start()
+		# 감시 스레드가 되돌린 앨범까지 모두 처리된 뒤에 종료 신호를 보낸다
+		self.register_queue.join()
+		for _ in register_threads:
+			self.register_queue.put(_STOP)
+		for t in register_threads:
+			t.join()
+		self.issue_queue.join()
+		for _ in issue_threads:
+			self.issue_queue.put(_STOP)
+		for t in issue_threads:
+			t.join()
+
+		self.watchdog.close()
+		self._stopped.set()
+		monitor.join()
+		self.report()
+		return self.results
+
+	def _open_session(self, stage: str) -> BrowserSession:
+		"""워커 스레드 전용 세션을 만들고 로그인한다. 실패하면 driver가 None인 세션을 반환한다."""
+		session = BrowserSession(self.mims_id, self.mims_password, threading.current_thread().name, self.recycle_policy)
+		with self._results_lock:
+			self.sessions.append(session)
+		if not session.start():
+			events.error(f"[{stage}] 로그인 실패로 세션을 종료합니다.")
+		return session
+
+	def _finish(self, job: dict, status: str, detail: str = "", codes=None) -> None:
+		"""앨범 처리 결과를 기록한다."""
+		job["status"] = status
+		job["detail"] = detail
+		job["codes"] = codes
+		with self._results_lock:
+			self.results.append(job)
+		events.end_album(_job_name(job), status)
+
+	def _retry_after_incident(self, job: dict, lease: dict, session: BrowserSession, stage_queue: queue.Queue) -> bool:
+		"""감시 스레드가 세션을 끊었으면 세션을 다시 띄우고, 재시도 횟수가 남았으면 앨범을 대기열에 되돌린다."""
+		incident = lease["incident"]
+		if incident is None:
+			return False
+		job.setdefault("incidents", []).append(incident)
+		session.restart()
+		if len(job["incidents"]) > self.max_retries:
+			self._finish(job, "failed", f"시간 예산 초과 ({incident['scope']}/{incident['step']}), 재시도 {self.max_retries}회 소진")
+			return True
+		events.warning(f"시간 예산 초과로 다시 대기열에 넣습니다 ({len(job['incidents'])}/{self.max_retries})", album=_job_name(job), kind="retry")
+		stage_queue.put(job)
+		return True
+
+	def _register_worker(self) -> None:
+		"""등록 대기열의 엑셀을 업로드·등록하고 앨범 코드를 발급 대기열로 넘긴다."""
+		session = self._open_session("등록")
+		try:
+			while True:
+				job = self.register_queue.get()
+				try:
+					if job is _STOP:
+						break
+					if session.driver is None:
+						self._finish(job, "failed", "등록 세션 로그인 실패")
+						continue
+					self._register_one(session, job)
+				finally:
+					self.register_queue.task_done()
+		finally:
+			session.close()
+
+	def _register_one(self, session: BrowserSession, job: dict) -> None:
+		"""앨범 하나를 감시 아래 등록하고, 끝나면 세션 재시작 정책을 확인한다."""
+		self.register_stats.begin()
+		ok = False
+		with self.watchdog.watch(session.kill, _job_name(job), session.name) as lease:
+			try:
+				with events.album_context(_job_name(job), report=False):
+					if not register_workbook(session.driver, job["excel_path"], job["durations"], job["upload_path"], job["title"]):
+						self._finish(job, "stopped", "앨범중복확인 단계에서 중단")
+					else:
+						job["code"] = find_album_code(session.driver, job["title"])
+						if job["code"]:
+							self.issue_queue.put(job)
+							# 발급 단계로 넘긴 앨범만 등록 성공으로 센다
+							ok = True
+						else:
+							self._finish(job, "failed", "My앨범에서 앨범 코드를 찾지 못함")
+			except Exception as e:
+				if not self._retry_after_incident(job, lease, session, self.register_queue):
+					events.error(f"[등록] {job['excel_path']} 처리 실패: {e}", album=_job_name(job), traceback=traceback.format_exc())
+					self._finish(job, "failed", str(e))
+			finally:
+				self.register_stats.end(ok)
+		if session.driver is not None:
+			session.after_album()
+
+	def _issue_worker(self) -> None:
+		"""발급 대기열의 앨범 코드에 대해 ISRC/UCI를 발급·추출한다. issue_tabs가 2 이상이면 탭으로 겹쳐 발급한다."""
+		session = self._open_session("발급")
+		try:
+			while True:
+				job = self.issue_queue.get()
+				if job is not _STOP and session.driver is not None and self.issue_tabs > 1:
+					if self._issue_tabs(session, job):
+						break
+					continue
+				try:
+					if job is _STOP:
+						break
+					if session.driver is None:
+						self._finish(job, "failed", "발급 세션 로그인 실패")
+						continue
+					self._issue_one(session, job)
+				finally:
+					self.issue_queue.task_done()
+		finally:
+			session.close()
+
+	def _issue_tabs(self, session: BrowserSession, first: dict) -> bool:
+		"""first와 대기열에 쌓인 앨범을 세션 하나의 탭 여러 개로 겹쳐 발급한다. 종료 신호를 받았으면 True를 반환한다."""
+		pending = [first]
+		stopping = False
+		failed = []
+
+		def take():
+			nonlocal stopping
+			if pending:
+				return pending.pop()
+			# 감시 스레드가 세션을 끊었으면 죽은 드라이버로 남은 앨범을 꺼내 실패시키지 않는다
+			if stopping or lease["incident"] is not None:
+				return None
+			try:
+				job = self.issue_queue.get_nowait()
+			except queue.Empty:
+				return None
+			if job is _STOP:
+				stopping = True
+				self.issue_queue.task_done()
+				return None
+			return job
+
+		def on_done(job, codes, error):
+			self.issue_stats.end(bool(codes))
+			self.issue_stats.begin()
+			self.watchdog.renew(lease)
+			if codes:
+				append_history(job["album"], job["code"], codes)
+				self._finish(job, "issued", codes=codes)
+				self.issue_queue.task_done()
+			else:
+				failed.append((job, error or "코드 없음 또는 발급 실패"))
+
+		self.issue_stats.begin()
+		issuer = TabIssuer(session.driver, self.issue_tabs, name=_job_name, session=session.name)
+		with self.watchdog.watch(session.kill, f"탭 발급 ({session.name})", session.name) as lease:
+			try:
+				done = issuer.run(take, on_done)
+			except Exception as e:
+				events.error(f"[발급] 탭 발급 중단: {e}", traceback=traceback.format_exc())
+				done = 0
+			finally:
+				self.issue_stats.release()
+		for job in pending:
+			failed.append((job, "탭 발급 세션 오류"))
+		incident = lease["incident"]
+		if incident is not None:
+			session.restart()
+		for job, detail in failed:
+			if incident is None or not self._requeue(job, incident):
+				self._finish(job, "failed", detail)
+			self.issue_queue.task_done()
+		if session.driver is not None and done:
+			session.after_album(done)
+		return stopping
+
+	def _requeue(self, job: dict, incident: dict) -> bool:
+		"""감시 사건으로 끊긴 앨범을 재시도 횟수가 남았으면 대기열에 되돌린다."""
+		job.setdefault("incidents", []).append(incident)
+		if len(job["incidents"]) > self.max_retries:
+			return False
+		events.warning(f"시간 예산 초과로 다시 대기열에 넣습니다 ({len(job['incidents'])}/{self.max_retries})", album=_job_name(job), kind="retry")
+		self.issue_queue.put(job)
+		return True
+
+	def _issue_one(self, session: BrowserSession, job: dict) -> None:
+		"""앨범 하나를 감시 아래 발급하고, 끝나면 세션 재시작 정책을 확인한다."""
+		self.issue_stats.begin()
+		ok = False
+		with self.watchdog.watch(session.kill, _job_name(job), session.name) as lease:
+			try:
+				with events.album_context(_job_name(job), report=False):
+					codes = issue_album(session.driver, job["code"], verify_mode=self.verify_mode)
+				if codes:
+					append_history(job["album"], job["code"], codes)
+					self._finish(job, "issued", codes=codes)
+					ok = True
+				else:
+					self._finish(job, "failed", "코드 없음 또는 발급 실패")
+			except Exception as e:
+				if not self._retry_after_incident(job, lease, session, self.issue_queue):
+					events.error(f"[발급] 앨범 {job['code']} 처리 실패: {e}", album=_job_name(job), traceback=traceback.format_exc())
+					self._finish(job, "failed", str(e))
+			finally:
+				self.issue_stats.end(ok)
+		if session.driver is not None:
+			session.after_album()
+
+	def status_line(self) -> str:
+		"""대기열 깊이와 단계별 가동률을 한 줄로 요약한다."""
+		return (
+			f"등록 대기 {self.register_queue.qsize()} · 발급 대기 {self.issue_queue.qsize()} · "
+			f"등록 가동률 {self.register_stats.utilisation():.0%} · 발급 가동률 {self.issue_stats.utilisation():.0%}"
+		)
+
+	def _monitor(self) -> None:
+		"""주기적으로 대기열 깊이와 가동률을 이벤트로 남긴다."""
+		while not self._stopped.wait(self.report_interval):
+			events.info(
+				self.status_line(), step="pipeline",
+				register_queue=self.register_queue.qsize(), issue_queue=self.issue_queue.qsize(),
+				register_utilisation=round(self.register_stats.utilisation(), 3),
+				issue_utilisation=round(self.issue_stats.utilisation(), 3),
+			)
+
+	def report(self) -> None:
+		"""단계별 통계와 앨범별 결과를 이벤트로 남긴다."""
+		events.info("--- 파이프라인 결과 ---", step="pipeline")
+		for stats in (self.register_stats, self.issue_stats):
+			events.info(
+				f"{stats.name} 단계: 워커 {stats.workers} · 완료 {stats.done} · 실패 {stats.failed} · 가동률 {stats.utilisation():.0%}",
+				step="pipeline", stage=stats.name, done=stats.done, failed=stats.failed,
+			)
+		for incident in self.watchdog.incidents:
+			events.warning(
+				f"감시 사건: {incident['album']} · {incident['scope']}/{incident['step']} "
+				f"{incident['elapsed']:.0f}s > {incident['budget']:.0f}s ({incident['session']})",
+				step="pipeline", kind="incident",
+			)
+		for session in self.sessions:
+			mem = session.memory_report()
+			trend = " → ".join(f"{s['rss'] / 1048576:.0f}" for s in mem["samples"][-8:])
+			events.info(
+				f"{mem['session']} 세션: 앨범 {mem['albums']} · 재시작 {mem['recycles']} · "
+				f"최대 {mem['peak_rss'] / 1048576:.0f}MB · 추이(MB) {trend or '-'}",
+				step="pipeline", kind="memory_report", memory=mem,
+			)
+		for job in self.results:
+			events.info(f"[{job['status']}] {_job_name(job)} (코드: {job['code']}) {job['detail']}", step="pipeline", status=job["status"])
+			if job.get("codes"):
+				_print_codes(job["codes"])
+
+
+def _recycle_policy(args) -> RecyclePolicy:
+	"""명령행 값이 있으면 환경변수 기본값 대신 쓴다."""
+	policy = RecyclePolicy.from_env()
+	if args.recycle_albums is not None:
+		policy.max_albums = args.recycle_albums
+	if args.recycle_rss_mb is not None:
+		policy.max_rss_mb = args.recycle_rss_mb
+	return policy
+
+
+def main():
+	"""여러 엑셀을 등록·발급 파이프라인으로 처리한다."""
+	parser = argparse.ArgumentParser(description="MIMS 앨범 등록/코드 발급 파이프라인")
+	parser.add_argument("excel_paths", nargs="+", help="업로드할 MIMS 엑셀 파일들")
+	parser.add_argument("--register-workers", type=int, default=1, help="등록 단계 동시 세션 수")
+	parser.add_argument("--issue-workers", type=int, default=1, help="발급 단계 동시 세션 수")
+	parser.add_argument("--issue-tabs", type=int, default=1, help="발급 세션 하나에서 동시에 여는 앨범 상세 탭 수 (2 이상이면 탭 발급, smart 검증만)")
+	parser.add_argument("--verify-mode", choices=("smart", "double"), default="smart", help="발급 후 검증 방식")
+	parser.add_argument("--strict-durations", action="store_true", help="재생시간 검증 오류가 있는 엑셀은 등록하지 않음")
+	parser.add_argument("--skip-duplicates", action="store_true", help="중복 의심 트랙이나 기존 ISRC 보유 트랙이 있는 엑셀은 등록하지 않음")
+	parser.add_argument("--recycle-albums", type=int, default=None, help="드라이버 하나로 처리할 최대 앨범 수 (0: 제한 없음)")
+	parser.add_argument("--recycle-rss-mb", type=int, default=None, help="드라이버를 재시작할 크롬 프로세스 트리 RSS(MB) (0: 제한 없음)")
+	parser.add_argument("--album-budget", type=float, default=None, help="앨범 하나(단계별)에 허용할 최대 시간(초)")
+	parser.add_argument("--step-budgets", default="", help="단계별 시간 예산, 예: upload=180,issue=900")
+	parser.add_argument("--max-retries", type=int, default=1, help="시간 예산 초과로 끊긴 앨범을 다시 시도할 횟수")
+	parser.add_argument("--preprocess-workers", type=int, default=None, help="엑셀 전처리 프로세스 수 (기본: CPU 수)")
+	parser.add_argument("--report-interval", type=float, default=30.0, help="진행 상황 출력 주기(초)")
+	args = parser.parse_args()
+
+	load_dotenv()
+	metrics.start_from_env()
+	mims_id = os.getenv("MIMS_ID")
+	mims_password = os.getenv("MIMS_PASSWORD")
+	if not mims_id or not mims_password:
+		events.error("환경변수 MIMS_ID/MIMS_PASSWORD가 설정되지 않았습니다. .env를 확인하세요.")
+		return
+
+	pipeline = AlbumPipeline(
+		mims_id,
+		mims_password,
+		register_workers=args.register_workers,
+		issue_workers=args.issue_workers,
+		report_interval=args.report_interval,
+		verify_mode=args.verify_mode,
+		strict_durations=args.strict_durations,
+		skip_duplicates=args.skip_duplicates,
+		recycle_policy=_recycle_policy(args),
+		watchdog=Watchdog(parse_budgets(args.step_budgets), args.album_budget),
+		max_retries=args.max_retries,
+		preprocess_workers=args.preprocess_workers,
+		issue_tabs=args.issue_tabs,
+	)
+	pipeline.run(args.excel_paths)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,118 @@
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import events
+from workbook import read_album, parse_duration_column, normalise_workbook, NORMALISED_DIR
+
+# 브라우저 단계 전에 여러 엑셀의 읽기·재생시간 검증·정규화를 프로세스 풀에 나눠 맡긴다.
+# openpyxl 파싱은 CPU를 쓰므로 파일마다 별도 프로세스에서 돌리고, 결과는 작은 앨범 모델(dict)로 돌려받는다.
+
+DEFAULT_MANIFEST = "preprocessed.json"
+
+
+def preprocess_one(excel_path: str, output_dir: str = NORMALISED_DIR) -> dict:
+	"""엑셀 하나를 읽고 검증·정규화한 결과와 단계별 소요시간을 반환한다. 예외는 error에 담는다."""
+	result = {"excel_path": os.path.abspath(excel_path), "upload_path": None, "album": None, "durations": None,
+		"normalise": None, "timings": {}, "error": None, "pid": os.getpid()}
+	started = time.perf_counter()
+	try:
+		t = time.perf_counter()
+		result["album"] = read_album(result["excel_path"])
+		result["timings"]["read"] = round(time.perf_counter() - t, 4)
+
+		t = time.perf_counter()
+		result["durations"] = parse_duration_column(result["excel_path"]).to_dict()
+		result["timings"]["validate"] = round(time.perf_counter() - t, 4)
+
+		t = time.perf_counter()
+		normalised = normalise_workbook(result["excel_path"], output_dir)
+		result["upload_path"] = normalised["path"]
+		result["normalise"] = {"changed": normalised["changed"], "missing": normalised["missing"]}
+		result["timings"]["normalise"] = round(time.perf_counter() - t, 4)
+	except Exception as e:
+		result["error"] = f"{type(e).__name__}: {e}"
+	result["timings"]["total"] = round(time.perf_counter() - started, 4)
+	return result
+
+
+def _progress(done: int, total: int, name: str, stream=sys.stderr) -> None:
+	width = 30
+	filled = int(width * done / total) if total else width
+	stream.write(f"\r[{'#' * filled}{'.' * (width - filled)}] {done}/{total} {name[:40]:<40}")
+	if done == total:
+		stream.write("\n")
+	stream.flush()
+
+
+def preprocess_many(excel_paths, workers=None, output_dir: str = NORMALISED_DIR, progress: bool = True) -> list:
+	"""여러 엑셀을 프로세스 풀에서 전처리하고 입력 순서대로 결과 목록을 반환한다."""
+	paths = list(excel_paths)
+	results = [None] * len(paths)
+	if not paths:
+		return results
+	started = time.perf_counter()
+	workers = max(1, min(workers or os.cpu_count() or 1, len(paths)))
+	with ProcessPoolExecutor(max_workers=workers) as pool:
+		futures = {pool.submit(preprocess_one, path, output_dir): i for i, path in enumerate(paths)}
+		for done, future in enumerate(as_completed(futures), start=1):
+			i = futures[future]
+			try:
+				results[i] = future.result()
+			except Exception as e:
+				results[i] = {"excel_path": os.path.abspath(paths[i]), "error": f"{type(e).__name__}: {e}", "timings": {}}
+			if progress:
+				_progress(done, len(paths), os.path.basename(paths[i]))
+	events.info(
+		f"전처리 {len(paths)}개 파일 완료: 프로세스 {workers}개, {time.perf_counter() - started:.2f}s",
+		step="preprocess", files=len(paths), workers=workers,
+	)
+	return results
+
+
+def write_manifest(results: list, path: str = DEFAULT_MANIFEST) -> None:
+	"""전처리 결과를 공백 없는 JSON 매니페스트로 저장한다."""
+	with open(path, "w", encoding="utf-8") as f:
+		json.dump({"created_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "albums": results}, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def load_manifest(path: str = DEFAULT_MANIFEST) -> list:
+	"""write_manifest로 저장한 전처리 결과 목록을 읽는다."""
+	with open(path, encoding="utf-8") as f:
+		return json.load(f)["albums"]
+
+
+def print_timings(results: list) -> None:
+	"""파일별 단계 소요시간 표를 출력한다."""
+	print(f"{'file':<40} {'read':>8} {'validate':>9} {'normalise':>10} {'total':>8}  result")
+	for r in results:
+		t = r.get("timings", {})
+		if r.get("error"):
+			status = r["error"]
+		else:
+			errors = sum(1 for i in r["durations"]["issues"] if i["level"] == "error")
+			status = f"{len(r['album']['tracks'])}곡 · 재생시간 오류 {errors} · 정리 {r['normalise']['changed']}셀"
+		cells = " ".join(f"{t.get(k, 0):>{w}.3f}" for k, w in (("read", 8), ("validate", 9), ("normalise", 10), ("total", 8)))
+		print(f"{os.path.basename(r['excel_path'])[:40]:<40} {cells}  {status}")
+
+
+def main():
+	"""여러 엑셀을 병렬 전처리하고 매니페스트와 파일별 소요시간을 남긴다."""
+	parser = argparse.ArgumentParser(description="MIMS 엑셀 병렬 전처리(읽기·검증·정규화)")
+	parser.add_argument("excel_paths", nargs="+")
+	parser.add_argument("-j", "--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+	parser.add_argument("-o", "--output", default=NORMALISED_DIR, help="정규화한 사본을 저장할 디렉터리")
+	parser.add_argument("--manifest", default=DEFAULT_MANIFEST, help="앨범 모델 매니페스트 경로")
+	args = parser.parse_args()
+
+	results = preprocess_many(args.excel_paths, args.workers, args.output)
+	write_manifest(results, args.manifest)
+	print_timings(results)
+	return 1 if any(r.get("error") for r in results) else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
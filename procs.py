@@ -0,0 +1,100 @@
+import os
+import signal
+
+# chromedriver와 그 아래 크롬 프로세스 트리를 다룬다. psutil이 있으면 쓰고, 없으면 /proc을 직접 읽는다.
+
+try:
+	import psutil
+except ImportError:
+	psutil = None
+
+
+def _proc_children() -> dict:
+	"""/proc을 훑어 부모 pid → 자식 pid 목록을 만든다."""
+	children = {}
+	for name in os.listdir("/proc"):
+		if not name.isdigit():
+			continue
+		try:
+			with open(f"/proc/{name}/stat", encoding="utf-8", errors="replace") as f:
+				stat = f.read()
+		except OSError:
+			continue
+		# comm에 공백·괄호가 들어갈 수 있으므로 마지막 ')' 뒤에서 필드를 나눈다
+		ppid = int(stat.rsplit(")", 1)[1].split()[1])
+		children.setdefault(ppid, []).append(int(name))
+	return children
+
+
+def _proc_rss(pid: int) -> int:
+	try:
+		with open(f"/proc/{pid}/status", encoding="utf-8") as f:
+			for line in f:
+				if line.startswith("VmRSS:"):
+					return int(line.split()[1]) * 1024
+	except OSError:
+		pass
+	return 0
+
+
+def process_tree_rss(root_pid: int) -> int:
+	"""root_pid와 모든 자손 프로세스의 RSS 합계(바이트)를 반환한다."""
+	if psutil is not None:
+		try:
+			root = psutil.Process(root_pid)
+			total = 0
+			for proc in [root] + root.children(recursive=True):
+				try:
+					total += proc.memory_info().rss
+				except psutil.Error:
+					pass
+			return total
+		except psutil.Error:
+			return 0
+	if not os.path.isdir("/proc"):
+		return 0
+	children = _proc_children()
+	total, stack = 0, [root_pid]
+	while stack:
+		pid = stack.pop()
+		total += _proc_rss(pid)
+		stack.extend(children.get(pid, ()))
+	return total
+
+
+def _descendants(root_pid: int) -> list:
+	if psutil is not None:
+		try:
+			return [p.pid for p in psutil.Process(root_pid).children(recursive=True)]
+		except psutil.Error:
+			return []
+	children = _proc_children() if os.path.isdir("/proc") else {}
+	found, stack = [], list(children.get(root_pid, ()))
+	while stack:
+		pid = stack.pop()
+		found.append(pid)
+		stack.extend(children.get(pid, ()))
+	return found
+
+
+def kill_process_tree(root_pid: int) -> int:
+	"""root_pid와 자손 프로세스를 모두 강제 종료하고 종료 신호를 보낸 개수를 반환한다."""
+	# pid를 모르면(드라이버가 이미 닫혔거나 원격 드라이버) 아무것도 죽이지 않는다. 0·음수 pid는 프로세스 그룹을 뜻한다.
+	if not root_pid or root_pid < 0 or root_pid == os.getpid():
+		return 0
+	killed = 0
+	for pid in reversed([root_pid] + _descendants(root_pid)):
+		try:
+			os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+			killed += 1
+		except OSError:
+			pass
+	return killed
+
+
+def driver_pid(driver):
+	"""chromedriver 서비스 프로세스의 pid. 크롬은 이 프로세스의 자손으로 뜬다."""
+	try:
+		return driver.service.process.pid
+	except AttributeError:
+		return None
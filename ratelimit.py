@@ -0,0 +1,132 @@
+import os
+import json
+import time
+import asyncio
+import tempfile
+import threading
+import contextlib
+
+import metrics
+
+try:
+	import fcntl
+except ImportError:  # Windows에서는 같은 프로세스 안의 스레드끼리만 공유한다
+	fcntl = None
+
+# mims.or.kr로 나가는 요청(이동·제출·HTTP)을 종류별 토큰 버킷으로 묶는다. 버킷 상태는 로컬 파일에 두고
+# 파일 잠금으로 갱신하므로 같은 PC의 모든 스레드·프로세스(파이프라인 워커, 감사 명령 등)가 한 예산을 나눠 쓴다.
+
+STATE_ENV = "MIMS_RATE_STATE"
+LIMITS_ENV = "MIMS_RATE_LIMITS"
+DEFAULT_STATE = os.path.join(tempfile.gettempdir(), "mims_rate_limit.json")
+# 종류 → (초당 토큰, 최대 누적). upload에는 엑셀 업로드와 메타 저장(저장 후 다음으로, 다음 단계 버튼, 권리 회원 선택 등)이 들어간다.
+DEFAULT_LIMITS = {
+	"login": (1 / 20, 2),
+	"upload": (2.0, 5),
+	"issue": (0.5, 2),
+	"read": (4.0, 8),
+}
+
+WAIT_SECONDS = metrics.Counter("mims_rate_limit_wait_seconds", "속도 제한으로 기다린 시간", ("kind",))
+ACQUIRED = metrics.Counter("mims_rate_limit_acquired", "속도 제한을 통과한 요청 수", ("kind",))
+
+_thread_lock = threading.Lock()
+_limits = None
+
+
+def parse_limits(text: str) -> dict:
+	"""'read=4:8,issue=0.5:2' 형식(초당 토큰:최대 누적)을 읽는다. 최대 누적을 빼면 1."""
+	limits = {}
+	for part in (text or "").split(","):
+		name, _, spec = part.partition("=")
+		if not name.strip() or not spec.strip():
+			continue
+		rate, _, burst = spec.partition(":")
+		limits[name.strip()] = (float(rate), float(burst or 1))
+	return limits
+
+
+def limits() -> dict:
+	global _limits
+	if _limits is None:
+		_limits = dict(DEFAULT_LIMITS)
+		_limits.update(parse_limits(os.getenv(LIMITS_ENV, "")))
+	return _limits
+
+
+def configure(**overrides) -> None:
+	"""이 프로세스의 종류별 (초당 토큰, 최대 누적)을 바꾼다. 여러 프로세스가 나눠 쓰는 종류는 MIMS_RATE_LIMITS로만 바꾼다."""
+	limits().update(overrides)
+
+
+def state_path() -> str:
+	return os.getenv(STATE_ENV) or DEFAULT_STATE
+
+
+@contextlib.contextmanager
+def _locked_state():
+	"""스레드 잠금과 파일 잠금을 잡고 버킷 상태 dict를 내준다. 블록이 끝나면 저장한다."""
+	with _thread_lock:
+		with open(state_path(), "a+", encoding="utf-8") as f:
+			if fcntl is not None:
+				fcntl.flock(f, fcntl.LOCK_EX)
+			try:
+				f.seek(0)
+				try:
+					state = json.loads(f.read() or "{}")
+				except ValueError:
+					state = {}
+				yield state
+				f.seek(0)
+				f.truncate()
+				f.write(json.dumps(state))
+				f.flush()
+			finally:
+				if fcntl is not None:
+					fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def try_acquire(kind: str, tokens: float = 1.0) -> float:
+	"""토큰을 꺼낼 수 있으면 꺼내고 0을, 모자라면 꺼내지 않고 기다려야 할 초를 반환한다."""
+	rate, burst = limits().get(kind) or limits()["read"]
+	if rate <= 0:
+		return 0.0
+	with _locked_state() as state:
+		now = time.time()
+		bucket = state.get(kind) or {"tokens": burst, "updated": now}
+		available = min(burst, bucket["tokens"] + (now - bucket["updated"]) * rate)
+		if available >= tokens:
+			state[kind] = {"tokens": available - tokens, "updated": now}
+			return 0.0
+		state[kind] = {"tokens": available, "updated": now}
+		return (tokens - available) / rate
+
+
+def acquire(kind: str, tokens: float = 1.0) -> float:
+	"""kind 예산에서 토큰을 꺼낼 때까지 기다린다. 기다린 시간(초)을 반환한다."""
+	waited = 0.0
+	while True:
+		delay = try_acquire(kind, tokens)
+		if delay <= 0:
+			break
+		time.sleep(delay)
+		waited += delay
+	ACQUIRED.inc(kind=kind)
+	if waited:
+		WAIT_SECONDS.inc(waited, kind=kind)
+	return waited
+
+
+async def acquire_async(kind: str, tokens: float = 1.0) -> float:
+	"""acquire의 asyncio 버전. 파일 잠금은 짧게만 잡고 기다리는 동안은 이벤트 루프를 막지 않는다."""
+	waited = 0.0
+	while True:
+		delay = try_acquire(kind, tokens)
+		if delay <= 0:
+			break
+		await asyncio.sleep(delay)
+		waited += delay
+	ACQUIRED.inc(kind=kind)
+	if waited:
+		WAIT_SECONDS.inc(waited, kind=kind)
+	return waited
@@ -1,4 +1,5 @@
 import os
+import sys
 import time
 from dotenv import load_dotenv
 from selenium import webdriver
@@ -8,17 +9,79 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, ElementClickInterceptedException, NoSuchElementException, UnexpectedAlertPresentException
-from openpyxl import load_workbook
-import datetime as dt
 from selenium.webdriver.common.keys import Keys
 import traceback
+import functools
+import events
+import metrics
+import snapshots
+from procs import driver_pid, kill_process_tree
+from watchdog import Watchdog
+from fixtures import capture_page
+from workbook import parse_duration_column, read_album, normalise_workbook, _duration_parts
+from catalog import append_history
+import title_index
+import page_parsers
+import ratelimit
+import netcapture
+from pages import MetaRegisterPage, RightsTabPage, AlbumDetailPage, MyAlbumPage
 
 LOGIN_URL = "https://www.mims.or.kr/login"
 ALBUM_REGISTER_URL = "https://www.mims.or.kr/mypage/meta"
+ALBUM_VIEW_URL = "https://www.mims.or.kr/mypage/view/album/{code}"
+MY_ALBUM_URL = "https://www.mims.or.kr/mypage/album"
+DEFAULT_EXCEL_FILENAME = "박성태 - 기도왕｜MIMS.xlsx"
+TRACK_LIST_XPATH = "//th[contains(text(), 'ISRC/Music.UCI')]/ancestor::table/tbody/tr"
+UPLOADED_ALBUM_LINKS_XPATH = "//div[@id='table']//table//tbody/tr/td[3]/a[contains(@class,'go-register')]"
+
+
+class UploadRejected(Exception):
+	"""엑셀 업로드 요청을 서버가 거부했다. errors에 서버 검증 오류 문구가 담긴다."""
+
+	def __init__(self, message: str, errors=()):
+		self.errors = list(errors)
+		detail = f" ({'; '.join(self.errors[:5])})" if self.errors else ""
+		super().__init__(f"엑셀 업로드 실패: {message}{detail}")
+
+
+@functools.lru_cache(maxsize=1)
+def _chromedriver_path() -> str:
+	"""chromedriver 경로를 한 번만 확인해 여러 세션이 공유하도록 한다."""
+	return ChromeDriverManager().install()
+
+
+def create_driver(headless: bool = False):
+	"""크롬 드라이버 세션을 새로 생성한다."""
+	options = webdriver.ChromeOptions()
+	if headless:
+		options.add_argument("--headless=new")
+	# 실패 스냅샷에 브라우저 콘솔 로그를, 발급·업로드 응답 확인(netcapture)에 네트워크 이벤트를 수집해 둔다
+	options.set_capability("goog:loggingPrefs", {"browser": "ALL", "performance": "ALL"})
+	options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+	driver = webdriver.Chrome(service=Service(_chromedriver_path()), options=options)
+	snapshots.attach(driver)
+	return driver
 
 
 def login(driver, mims_id: str, mims_password: str) -> bool:
 	"""MIMS에 로그인한다. 성공 시 True를 반환한다."""
+	with events.step("login"):
+		return _login(driver, mims_id, mims_password)
+
+
+def is_logged_in(driver, timeout: float = 5) -> bool:
+	"""현재 페이지에 로그인 상태에서만 보이는 My앨범 메뉴가 있는지 확인한다."""
+	try:
+		WebDriverWait(driver, timeout).until(
+			EC.presence_of_element_located((By.CSS_SELECTOR, 'a[href="/mypage/album"]'))
+		)
+		return True
+	except TimeoutException:
+		return False
+
+
+def _login(driver, mims_id: str, mims_password: str) -> bool:
+	ratelimit.acquire("read")
 	driver.get(LOGIN_URL)
 	try:
 		wait = WebDriverWait(driver, 10)
@@ -28,15 +91,16 @@ def login(driver, mims_id: str, mims_password: str) -> bool:
 
 		id_input.send_keys(mims_id)
 		pw_input.send_keys(mims_password)
+		ratelimit.acquire("login")
 		login_button.click()
 
 		WebDriverWait(driver, 10).until(
 			EC.presence_of_element_located((By.CSS_SELECTOR, 'a[href="/mypage/album"]'))
 		)
-		print("로그인 성공!")
+		events.info("로그인 성공!")
 		return True
 	except Exception as e:
-		print(f"로그인 실패: {e}")
+		events.warning(f"로그인 실패: {e}")
 		return False
 
 
@@ -81,23 +145,25 @@ def _check_required_and_go_next(driver) -> None:
 			missing.append((field_id, label_text))
 
 	if missing:
-		print("필수 입력 누락으로 앨범정보에서 이동 중단:")
-		for fid, ltxt in missing:
-			print(f" - {ltxt} (id={fid}) 비어있음")
+		events.warning(
+			"필수 입력 누락으로 앨범정보에서 이동 중단: " + ", ".join(f"{ltxt}(id={fid})" for fid, ltxt in missing),
+			missing=[fid for fid, _ in missing],
+		)
 		return
 
 	try:
 		next_btn = WebDriverWait(driver, 10).until(
 			EC.element_to_be_clickable((By.ID, "meta-next-album-btn"))
 		)
+		ratelimit.acquire("upload")
 		next_btn.click()
-		print("곡정보 탭으로 이동 중...")
+		events.info("곡정보 탭으로 이동 중...")
 		WebDriverWait(driver, 15).until(
 			EC.presence_of_element_located((By.ID, "track-list"))
 		)
-		print("곡정보 탭 로딩 완료")
+		events.info("곡정보 탭 로딩 완료")
 	except Exception as e:
-		print(f"곡정보 이동 실패: {e}")
+		events.warning(f"곡정보 이동 실패: {e}")
 
 
 def _drain_alerts_quick(driver, timeout_sec: float = 0.5) -> None:
@@ -108,7 +174,7 @@ def _drain_alerts_quick(driver, timeout_sec: float = 0.5) -> None:
 			WebDriverWait(driver, 0.2).until(EC.alert_is_present())
 			alert = driver.switch_to.alert
 			msg = alert.text
-			print(f"알림 감지: {msg}")
+			events.info(f"알림 감지: {msg}", kind="alert")
 			alert.accept()
 			time.sleep(0.01)
 		except TimeoutException:
@@ -151,117 +217,114 @@ def _check_track_required_and_next(driver) -> None:
 			missing.append((fid, label_text))
 
 	if missing:
-		print("필수 입력 누락으로 곡정보에서 이동 중단:")
-		for fid, ltxt in missing:
-			print(f" - {ltxt} (id={fid}) 비어있음")
+		events.warning(
+			"필수 입력 누락으로 곡정보에서 이동 중단: " + ", ".join(f"{ltxt}(id={fid})" for fid, ltxt in missing),
+			missing=[fid for fid, _ in missing],
+		)
 		return
 
 	try:
 		save_next_btn = WebDriverWait(driver, 10).until(
 			EC.element_to_be_clickable((By.ID, "update-meta-track-next-track-btn"))
 		)
+		ratelimit.acquire("upload")
 		save_next_btn.click()
-		print("곡정보 저장 후 다음으로 이동 중...")
+		events.info("곡정보 저장 후 다음으로 이동 중...")
 		_drain_alerts_quick(driver)
 
 		try:
 			WebDriverWait(driver, 10).until(
 				EC.presence_of_element_located((By.ID, "meta-next-right-new-btn"))
 			)
-			print("앨범중복확인 탭 로딩 완료")
+			events.info("앨범중복확인 탭 로딩 완료")
 		except TimeoutException:
 			try:
 				ok_btn = WebDriverWait(driver, 3).until(
 					EC.element_to_be_clickable((By.XPATH, "//button[normalize-space(.)='확인' or normalize-space(.)='확 인']"))
 				)
 				ok_btn.click()
-				print("모달 확인 버튼 클릭")
+				events.info("모달 확인 버튼 클릭")
 				WebDriverWait(driver, 10).until(
 					EC.presence_of_element_located((By.ID, "meta-next-right-new-btn"))
 				)
-				print("앨범중복확인 탭 로딩 완료")
+				events.info("앨범중복확인 탭 로딩 완료")
 			except Exception as e2:
-				print(f"앨범중복확인 탭 확인 실패: {e2}")
+				events.warning(f"앨범중복확인 탭 확인 실패: {e2}")
 	except Exception as e:
-		print(f"곡정보 저장/이동 실패: {e}")
+		events.warning(f"곡정보 저장/이동 실패: {e}")
 
 
 def _parse_excel_duration_to_hms(value):
-	"""Excel/문자열/시간형 입력을 (HH, MM, SS) 문자열 튜플로 변환한다."""
-	if value is None:
-		return None
+	"""Excel/문자열/시간형 입력을 (HH, MM, SS) 문자열 튜플로 변환한다. 해석은 workbook._duration_parts를 따른다."""
 	try:
-		if isinstance(value, dt.time):
-			return f"{value.hour:02d}", f"{value.minute:02d}", f"{value.second:02d}"
-		if isinstance(value, dt.timedelta):
-			total = int(value.total_seconds())
-			hh = total // 3600
-			mm = (total % 3600) // 60
-			ss = total % 60
-			return f"{hh:02d}", f"{mm:02d}", f"{ss:02d}"
-		if isinstance(value, (int, float)):
-			total = int(round((float(value) % 1) * 86400))
-			hh = total // 3600
-			mm = (total % 3600) // 60
-			ss = total % 60
-			return f"{hh:02d}", f"{mm:02d}", f"{ss:02d}"
-		s = str(value).strip()
-		if not s:
-			return None
-		parts = s.split(":")
-		if len(parts) == 3:
-			hh, mm, ss = parts
-		elif len(parts) == 2:
-			hh, mm, ss = "00", parts[0], parts[1]
-		else:
-			return None
-		hh = f"{int(hh):02d}"
-		mm = f"{int(mm):02d}"
-		ss = f"{int(float(ss)):02d}"
-		return hh, mm, ss
-	except Exception:
+		parts = _duration_parts(value)
+	except (TypeError, ValueError):
+		return None
+	if parts is None:
 		return None
+	return tuple(f"{n:02d}" for n in parts)
+
+
+def tracks_missing_duration(driver, total: int):
+	"""업로드 직후 #track-list에서 재생시간이 비어 있는 트랙 인덱스 목록을 반환한다. 재생시간 칸을 읽을 수 없으면 None."""
+	return page_parsers.missing_durations(driver.page_source, total)
 
 
-def _fill_durations_from_excel(driver, excel_path: str) -> None:
-	"""엑셀(N열, 18행부터)에서 시간을 읽어 각 트랙 HH/MM/SS 입력칸에 채운다."""
+def _open_track(driver, idx: int, seq: str) -> None:
+	"""#track-list의 idx번째 곡제목 링크를 눌러 해당 트랙 편집 화면을 연다."""
+	page = MetaRegisterPage.of(driver)
+	row = page.rows()[idx]
+	link = WebDriverWait(row, 10).until(EC.element_to_be_clickable(page.TRACK_LINK))
+	driver.execute_script("arguments[0].scrollIntoView({block:'center'});", link)
+	ratelimit.acquire("read")
+	link.click()
+	if seq:
+		page.wait_seq(seq)
+
+
+def _fill_durations_from_excel(driver, excel_path: str, durations=None) -> None:
+	"""엑셀(N열, 18행부터)에서 시간을 읽어 재생시간이 반영되지 않은 트랙의 HH/MM/SS 입력칸에 채운다."""
+	page = MetaRegisterPage.of(driver)
 	_ensure_tracks_tab(driver)
 	WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "track-list")))
-	rows = driver.find_elements(By.CSS_SELECTOR, "#track-list tbody tr")
+	rows = page.rows()
 	if not rows:
-		print("수록곡 목록을 찾지 못했습니다.")
+		events.warning("수록곡 목록을 찾지 못했습니다.")
 		return
 
-	row_seqs = [(r.get_attribute("data-import_seq") or "") for r in rows]
+	row_seqs = page.row_seqs()
+	capture_page(driver, "track_list")
 
-	wb = load_workbook(excel_path, data_only=True)
-	ws = wb.active
+	if durations is None:
+		durations = parse_duration_column(excel_path)
 
-	try:
-		first_link = WebDriverWait(rows[0], 10).until(
-			EC.element_to_be_clickable((By.CSS_SELECTOR, "td[for='displayTrackTitle'] a.show-track-btn"))
-		)
-		driver.execute_script("arguments[0].scrollIntoView({block:'center'});", first_link)
-		first_link.click()
-		if row_seqs[0]:
-			WebDriverWait(driver, 10).until(
-				lambda d: d.find_element(By.ID, "importSeq").get_attribute("value") == row_seqs[0]
-			)
-	except Exception:
-		pass
+	total = len(rows)
+	# 정규화한 엑셀이면 업로드만으로 재생시간이 들어간다. 목록에서 확인되면 빈 트랙만 돈다.
+	missing = tracks_missing_duration(driver, total)
+	if missing is None:
+		targets = list(range(total))
+	else:
+		targets = missing
+		events.info(f"업로드 후 재생시간 확인: {total - len(missing)}/{total}개 트랙 반영됨", missing=[i + 1 for i in missing])
+		if not targets:
+			events.info("모든 트랙에 재생시간이 있어 곡별 입력을 건너뜁니다.")
+			return
 
 	updated = 0
-	total = len(rows)
-	for idx in range(total):
-		excel_row = 18 + idx
-		cell = ws.cell(row=excel_row, column=14)  # N열
-		hms = _parse_excel_duration_to_hms(cell.value)
+	current = None
+	for pos, idx in enumerate(targets):
+		track_started = time.perf_counter()
+		hms = durations.hms[idx] if idx < durations.track_count else None
+		next_idx = targets[pos + 1] if pos + 1 < len(targets) else None
+
+		if current != idx:
+			try:
+				_open_track(driver, idx, row_seqs[idx])
+			except Exception:
+				pass
 
 		try:
-			hh_input = WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.ID, "duration_hh")))
-			mm_input = WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.ID, "duration_mm")))
-			ss_input = WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.ID, "duration_ss")))
-			hidden_duration = driver.find_element(By.ID, "duration")
+			hh_input, mm_input, ss_input, hidden_duration = page.duration_inputs()
 
 			existing_hh = (hh_input.get_attribute("value") or "").strip()
 			existing_mm = (mm_input.get_attribute("value") or "").strip()
@@ -274,7 +337,7 @@ def _fill_durations_from_excel(driver, excel_path: str) -> None:
 				hh, mm, ss = hms
 
 				def type_val(el, val):
-					driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
+					page.script("arguments[0].scrollIntoView({block:'center'});", el)
 					try:
 						el.click()
 					except Exception:
@@ -285,7 +348,7 @@ def _fill_durations_from_excel(driver, excel_path: str) -> None:
 						el.send_keys(Keys.COMMAND, 'a')
 						el.send_keys(Keys.BACK_SPACE)
 					el.send_keys(val)
-					driver.execute_script(
+					page.script(
 						"['keyup','change','input'].forEach(e=>arguments[0].dispatchEvent(new Event(e,{bubbles:true})));",
 						el,
 					)
@@ -295,112 +358,107 @@ def _fill_durations_from_excel(driver, excel_path: str) -> None:
 				type_val(ss_input, ss)
 
 				if not (hidden_duration.get_attribute("value") or "").strip():
-					driver.execute_script(
+					page.script(
 						"arguments[0].value = arguments[1]; ['change','input'].forEach(e=>arguments[0].dispatchEvent(new Event(e,{bubbles:true})));",
 						hidden_duration,
 						f"{hh}:{mm}:{ss}",
 					)
 
 				updated += 1
+				events.debug(f"재생시간 입력 {hh}:{mm}:{ss}", track_seq=idx + 1)
 			elif already_filled:
-				print("재생시간이 이미 입력되어 있어 건너뜁니다.")
+				events.debug("재생시간이 이미 입력되어 있어 건너뜁니다.", track_seq=idx + 1)
 		except Exception as e:
-			print(f"{idx+1}번째 트랙 재생시간 처리 중 요소 탐색/입력 실패: {e}")
+			events.warning(f"{idx+1}번째 트랙 재생시간 처리 중 요소 탐색/입력 실패: {e}", track_seq=idx + 1)
 
+		current = None
 		try:
-			save_next_btn = WebDriverWait(driver, 10).until(
-				EC.element_to_be_clickable((By.ID, "update-meta-track-next-track-btn"))
-			)
-			driver.execute_script("arguments[0].scrollIntoView({block:'center'});", save_next_btn)
-			save_next_btn.click()
-			print("저장 후 다음으로 클릭")
+			page.click("save_next", kind="upload")
+			events.debug("저장 후 다음으로 클릭", track_seq=idx + 1)
 			_drain_alerts_quick(driver)
 			if idx < total - 1:
-				next_seq = row_seqs[idx + 1]
-				WebDriverWait(driver, 6).until(
-					lambda d: d.find_element(By.ID, "importSeq").get_attribute("value") == next_seq
-				)
+				# 다음 대상이 바로 다음 트랙이면 저장 후 다음으로 넘어간 화면을 그대로 쓴다
+				if next_idx == idx + 1:
+					page.wait_seq(row_seqs[idx + 1], 6)
+					current = next_idx
 			else:
 				try:
 					ok_btn = WebDriverWait(driver, 5).until(
 						EC.element_to_be_clickable((By.XPATH, "//button[normalize-space(.)='확인' or normalize-space(.)='확 인']"))
 					)
 					ok_btn.click()
-					print("모달 '확인' 버튼 클릭")
+					events.info("모달 '확인' 버튼 클릭")
 				except Exception:
 					pass
 
 		except Exception as e:
-			print(f"저장 후 다음으로 클릭 실패: {e}")
+			events.warning(f"저장 후 다음으로 클릭 실패: {e}", track_seq=idx + 1)
+		events.debug("트랙 처리 완료", kind="track", track_seq=idx + 1, duration=time.perf_counter() - track_started)
 
-	print(f"재생시간 입력 완료: {updated}개 트랙")
+	events.info(f"재생시간 입력 완료: {updated}개 트랙")
+	events.debug(
+		f"요소 캐시: 재사용 {page.stats['hit']} · 첫 조회 {page.stats['miss']} · 다시 찾음 {page.stats['stale']}",
+		kind="page_cache", page=page.name, **page.stats,
+	)
 
 
 def _ensure_tracks_tab(driver) -> None:
 	"""곡정보 탭이 보이고 활성화될 때까지 보장한다."""
+	page = MetaRegisterPage.of(driver)
 	try:
-		meta_tracks = driver.find_element(By.ID, "meta-tracks")
-		if "show" in meta_tracks.get_attribute("class") and "active" in meta_tracks.get_attribute("class"):
+		if page.tracks_tab_active():
 			return
 	except Exception:
 		pass
 
 	try:
-		tab_btn = driver.find_element(By.CSS_SELECTOR, "#metaTab a[data-target='#meta-tracks']")
-		tab_btn.click()
+		page.find("tracks_tab").click()
 	except Exception:
 		try:
 			next_btn = WebDriverWait(driver, 5).until(
 				EC.element_to_be_clickable((By.ID, "meta-next-album-btn"))
 			)
+			ratelimit.acquire("upload")
 			next_btn.click()
 		except Exception:
 			pass
 
-	WebDriverWait(driver, 10).until(
-		lambda d: "show" in d.find_element(By.ID, "meta-tracks").get_attribute("class") and "active" in d.find_element(By.ID, "meta-tracks").get_attribute("class")
-	)
+	page.wait(lambda p: p.tracks_tab_active())
 
 
 def _save_next_on_last_track(driver) -> None:
 	"""마지막 트랙을 활성화하고 '저장 후 다음으로'를 눌러 후속 단계를 유도한다."""
+	page = MetaRegisterPage.of(driver)
 	_ensure_tracks_tab(driver)
 	WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "track-list")))
-	rows = driver.find_elements(By.CSS_SELECTOR, "#track-list tbody tr")
+	rows = page.rows()
 	if not rows:
-		print("수록곡 목록이 비어 있어 저장-다음 수행을 건너뜁니다.")
+		events.warning("수록곡 목록이 비어 있어 저장-다음 수행을 건너뜁니다.")
 		return
 
 	last_row = rows[-1]
 	try:
-		link = WebDriverWait(last_row, 10).until(
-			EC.element_to_be_clickable((By.CSS_SELECTOR, "td[for='displayTrackTitle'] a.show-track-btn"))
-		)
+		link = WebDriverWait(last_row, 10).until(EC.element_to_be_clickable(page.TRACK_LINK))
 		driver.execute_script("arguments[0].scrollIntoView({block:'center'});", link)
+		ratelimit.acquire("read")
 		link.click()
 
 		row_seq = last_row.get_attribute("data-import_seq") or ""
 		if row_seq:
-			WebDriverWait(driver, 10).until(
-				lambda d: d.find_element(By.ID, "importSeq").get_attribute("value") == row_seq
-			)
+			page.wait_seq(row_seq)
 	except Exception as e:
-		print(f"마지막 트랙 활성화 실패: {e}")
+		events.warning(f"마지막 트랙 활성화 실패: {e}")
 
 	try:
-		save_next_btn = WebDriverWait(driver, 10).until(
-			EC.element_to_be_clickable((By.ID, "update-meta-track-next-track-btn"))
-		)
-		driver.execute_script("arguments[0].scrollIntoView({block:'center'});", save_next_btn)
-		save_next_btn.click()
-		print("마지막 곡에서 '저장 후 다음으로' 클릭")
+		page.click("save_next", kind="upload")
+		events.info("마지막 곡에서 '저장 후 다음으로' 클릭")
 
 		try:
 			WebDriverWait(driver, 5).until(EC.alert_is_present())
 			while True:
 				alert = driver.switch_to.alert
 				msg = alert.text
-				print(f"알림 감지: {msg}")
+				events.info(f"알림 감지: {msg}", kind="alert")
 				alert.accept()
 				time.sleep(0.2)
 				try:
@@ -408,7 +466,7 @@ def _save_next_on_last_track(driver) -> None:
 					continue
 				except TimeoutException:
 					break
-			print("알림(확인) 모두 처리 완료")
+			events.info("알림(확인) 모두 처리 완료")
 		except TimeoutException:
 			pass
 
@@ -417,12 +475,12 @@ def _save_next_on_last_track(driver) -> None:
 				EC.element_to_be_clickable((By.XPATH, "//button[normalize-space(.)='확인' or normalize-space(.)='확 인']"))
 			)
 			ok_btn.click()
-			print("모달 '확인' 버튼 클릭")
+			events.info("모달 '확인' 버튼 클릭")
 		except Exception:
 			pass
 
 	except Exception as e:
-		print(f"마지막 곡 저장-다음 클릭 실패: {e}")
+		events.warning(f"마지막 곡 저장-다음 클릭 실패: {e}")
 
 
 def _handle_meta_confirm(driver) -> bool:
@@ -432,10 +490,11 @@ def _handle_meta_confirm(driver) -> bool:
 			EC.presence_of_element_located((By.ID, "meta-confirm"))
 		)
 		time.sleep(0.3)
+		capture_page(driver, "meta_confirm")
 		rows = driver.find_elements(By.CSS_SELECTOR, "#search-track-data table tbody tr")
 		num = len(rows)
 		if num <= 0:
-			print("검색앨범 수록곡 없음 → 다음 단계로 진행")
+			events.info("검색앨범 수록곡 없음 → 다음 단계로 진행")
 			clicked = False
 			for btn_id in ("meta-next-right-new-btn", "meta-next-right-dup-btn"):
 				try:
@@ -443,25 +502,26 @@ def _handle_meta_confirm(driver) -> bool:
 						EC.element_to_be_clickable((By.ID, btn_id))
 					)
 					driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
+					ratelimit.acquire("upload")
 					btn.click()
 					clicked = True
 					break
 				except Exception:
 					continue
 			if not clicked:
-				print("다음 버튼을 찾지 못했습니다. 진행을 중단합니다.")
+				events.warning("다음 버튼을 찾지 못했습니다. 진행을 중단합니다.")
 				return
 			_drain_alerts_quick(driver)
 			try:
 				WebDriverWait(driver, 3).until(
 					EC.presence_of_element_located((By.ID, "right-reg-btn"))
 				)
-				print("권리정보 탭 진입 완료")
+				events.info("권리정보 탭 진입 완료")
 			except TimeoutException:
-				print("권리정보 탭 진입 확인 실패(타임아웃)")
+				events.warning("권리정보 탭 진입 확인 실패(타임아웃)")
 			return True
 		else:
-			print(f"검색앨범 수록곡 {num}개 발견 → 화면 유지")
+			events.warning(f"검색앨범 수록곡 {num}개 발견 → 화면 유지")
 			for i, tr in enumerate(rows, start=1):
 				title = ""
 				try:
@@ -471,10 +531,10 @@ def _handle_meta_confirm(driver) -> bool:
 						title = tr.find_elements(By.TAG_NAME, "td")[2].text.strip()
 					except Exception:
 						title = tr.text.strip()
-				print(f" - 검색앨범 곡 {i}: {title}")
+				events.info(f"검색앨범 곡 {i}: {title}", track_seq=i)
 			return False
 	except Exception as e:
-		print(f"앨범중복확인 처리 실패: {e}")
+		events.warning(f"앨범중복확인 처리 실패: {e}")
 		return False
 
 
@@ -493,6 +553,7 @@ def _open_member_search_modals(driver, close_after: bool = True) -> None:
 					raise
 				btn_el = wrapper.find_element(By.CSS_SELECTOR, f"button.search-group[name='{fallback_name}']")
 			driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn_el)
+			ratelimit.acquire("read")
 			try:
 				btn_el.click()
 			except ElementClickInterceptedException:
@@ -526,87 +587,216 @@ def _open_member_search_modals(driver, close_after: bool = True) -> None:
 							)
 						except TimeoutException:
 							pass
-						print("모달 닫기 완료")
+						events.info("모달 닫기 완료")
 			except Exception:
 				pass
 
 		click_btn("button.search-group[data-group-category='P']", "search-grup1")
 		wait_modal_visible()
-		print("제작회원 검색 모달 열림")
+		events.info("제작회원 검색 모달 열림")
 		close_modal_if_open()
 
 		click_btn("button.search-group[data-group-category='S']", "search-grup2")
 		wait_modal_visible()
-		print("유통회원 검색 모달 열림")
+		events.info("유통회원 검색 모달 열림")
 		if close_after:
 			close_modal_if_open()
 	except Exception as e:
-		print(f"회원 검색 모달 열기 실패: {e}")
+		events.warning(f"회원 검색 모달 열기 실패: {e}")
 
 
 # ===== main.py에서 통합: 앨범 찾기 및 ISRC/UCI 발급/추출 유틸 =====
+def _collect_album_cards(driver):
+	"""현재 My앨범 화면의 앨범 카드에서 제목·코드·링크 요소를 수집한다."""
+	approved_albums = []
+	album_cards = MyAlbumPage.of(driver).find_all("cards")
+	events.info(f"현재 페이지에서 {len(album_cards)}개의 앨범을 찾았습니다.")
+
+	for card in album_cards:
+		try:
+			title_element = card.find_element(By.CSS_SELECTOR, "h3 > a")
+			album_title = title_element.text
+			album_link_element = card.find_element(By.CSS_SELECTOR, "a.go-view")
+			album_code = album_link_element.get_attribute('data-album-code')
+			approved_albums.append({"title": album_title, "code": album_code, "element": album_link_element})
+			events.info(f"앨범 찾음: {album_title} (코드: {album_code})")
+		except Exception as e:
+			events.warning(f"앨범 정보를 가져오는 중 오류 발생: {e}")
+	return approved_albums
+
+
 def find_approved_albums(driver):
 	"""My앨범 화면에서 승인된 앨범들의 제목·코드·링크 요소를 수집한다."""
+	page = MyAlbumPage.of(driver)
 	try:
-		my_album_link = WebDriverWait(driver, 10).until(
-			EC.element_to_be_clickable((By.CSS_SELECTOR, 'a[href="/mypage/album"]'))
-		)
-		my_album_link.click()
+		page.click("menu_link")
+		# 목록 화면으로 옮겨 왔으니 이전 화면에서 찾은 목록 요소는 버린다
+		page.forget("container", "cards")
+		page.wait(lambda p: p.find("container"))
 
-		album_container_selector = "div.mims-pmb"
-		WebDriverWait(driver, 10).until(
-			EC.presence_of_element_located((By.CSS_SELECTOR, album_container_selector))
-		)
-
-		approved_albums = []
-		album_cards = driver.find_elements(By.CSS_SELECTOR, f"{album_container_selector} .thumbnail-style")
-		print(f"현재 페이지에서 {len(album_cards)}개의 앨범을 찾았습니다.")
-
-		for card in album_cards:
-			try:
-				title_element = card.find_element(By.CSS_SELECTOR, "h3 > a")
-				album_title = title_element.text
-				album_link_element = card.find_element(By.CSS_SELECTOR, "a.go-view")
-				album_code = album_link_element.get_attribute('data-album-code')
-				approved_albums.append({"title": album_title, "code": album_code, "element": album_link_element})
-				print(f"앨범 찾음: {album_title} (코드: {album_code})")
-			except Exception as e:
-				print(f"앨범 정보를 가져오는 중 오류 발생: {e}")
-		return approved_albums
+		capture_page(driver, "my_album")
+		return _collect_album_cards(driver)
 	except Exception as e:
-		print(f"앨범을 찾는 중 오류 발생: {e}")
+		events.warning(f"앨범을 찾는 중 오류 발생: {e}")
 		return []
 
 
-def issue_codes(driver):
-	"""앨범 상세에서 ISRC/UCI 필요 여부를 판단해 발급하고 코드를 추출한다."""
-	print("앨범 상세 페이지로 이동했습니다. ISRC/UCI 코드 확인 및 발급을 시작합니다.")
+def extract_codes(driver):
+	"""앨범 상세의 수록곡 표에서 곡명·ISRC·UCI를 추출한다. ISRC가 없는 행이 있으면 None."""
+	try:
+		WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.XPATH, TRACK_LIST_XPATH)))
+	except Exception:
+		return None
+	return read_codes(driver)
+
+
+def read_codes(driver):
+	"""지금 화면의 수록곡 표를 기다리지 않고 읽는다. 표가 아직 없으면 빈 목록, ISRC가 없는 행이 있으면 None."""
+	codes_list = []
+	try:
+		track_rows = driver.find_elements(By.XPATH, TRACK_LIST_XPATH)
+		if not track_rows:
+			return []
+		for row in track_rows:
+			isrc_elements = row.find_elements(By.CSS_SELECTOR, "span.g-bg-darkred")
+			if not isrc_elements:
+				return None
+			title = row.find_element(By.CSS_SELECTOR, "td:nth-child(4) a").text
+			isrc = isrc_elements[0].get_attribute("data-clipboard-data")
+			uci = row.find_element(By.CSS_SELECTOR, "span.g-bg-blue").get_attribute("data-clipboard-data")
+			codes_list.append({"title": title, "isrc": isrc, "uci": uci})
+		return codes_list
+	except Exception:
+		return None
+
 
-	def extract_codes(driver):
-		codes_list = []
+def _codes_complete(codes, total_rows: int) -> bool:
+	"""추출된 코드가 전체 행 수만큼 있고 모든 행에 ISRC/UCI가 채워졌는지 확인한다."""
+	if not codes or len(codes) < total_rows:
+		return False
+	return all(item.get("isrc") and item.get("uci") for item in codes)
+
+
+def _verify_codes(driver, total_rows: int, max_refreshes: int = 3, backoff: float = 0.5):
+	"""현재 화면에서 먼저 추출하고, 누락이 있을 때만 간격을 늘려가며 제한 횟수까지 새로고침한다."""
+	codes = extract_codes(driver)
+	refreshes = 0
+	delay = backoff
+	while not _codes_complete(codes, total_rows) and refreshes < max_refreshes:
+		time.sleep(delay)
+		delay *= 2
+		refreshes += 1
+		ratelimit.acquire("read")
+		driver.refresh()
+		_drain_alerts_quick(driver)
 		try:
-			track_list_xpath = "//th[contains(text(), 'ISRC/Music.UCI')]/ancestor::table/tbody/tr"
-			WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.XPATH, track_list_xpath)))
-			track_rows = driver.find_elements(By.XPATH, track_list_xpath)
-			if not track_rows:
-				return []
-			for row in track_rows:
-				isrc_elements = row.find_elements(By.CSS_SELECTOR, "span.g-bg-darkred")
-				if not isrc_elements:
-					return None
-				title = row.find_element(By.CSS_SELECTOR, "td:nth-child(4) a").text
-				isrc = isrc_elements[0].get_attribute("data-clipboard-data")
-				uci = row.find_element(By.CSS_SELECTOR, "span.g-bg-blue").get_attribute("data-clipboard-data")
-				codes_list.append({"title": title, "isrc": isrc, "uci": uci})
-			return codes_list
-		except Exception:
-			return None
+			WebDriverWait(driver, 20).until(
+				EC.presence_of_element_located((By.XPATH, TRACK_LIST_XPATH))
+			)
+		except UnexpectedAlertPresentException:
+			_drain_alerts_quick(driver)
+		except TimeoutException:
+			continue
+		codes = extract_codes(driver) or codes
+
+	found = len(codes) if codes else 0
+	if refreshes == 0:
+		events.info(f"발급 결과 검증: 새로고침 없이 {found}/{total_rows}개 확인")
+	elif _codes_complete(codes, total_rows):
+		events.info(f"발급 결과 검증: 새로고침 {refreshes}회 후 {found}/{total_rows}개 확인")
+	else:
+		events.warning(f"발급 결과 검증: 새로고침 {refreshes}회 후에도 {found}/{total_rows}개만 확인되었습니다.")
+	capture_page(driver, "album_detail_verified")
+	return codes
+
+
+def issue_alert_errors(alerts) -> list:
+	"""발급 알림 문구 중 오류·실패를 알리는 것만 골라 반환한다."""
+	return [m for m in alerts or () if "오류" in m or "실패" in m]
+
+
+def _accept_open_alerts(driver, label: str, messages: list) -> None:
+	"""떠 있는 확인창·알림창을 모두 수락하고 문구를 messages에 더한다. 없으면 기다리지 않는다."""
+	while True:
+		alert = EC.alert_is_present()(driver)
+		if not alert:
+			return
+		text = alert.text
+		messages.append(text)
+		events.info(f"[{label} ALERT] {text}", kind="alert")
+		alert.accept()
+
+
+def _click_issue(driver, button: str, label: str, alerts: list) -> bool:
+	"""발급 버튼을 눌러 바로 뜬 확인창만 수락하고 돌아온다. 화면 반영은 기다리지 않는다. 버튼이 없으면 False."""
+	try:
+		btn = WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.ID, button)))
+	except TimeoutException as e:
+		events.error(f"{label} 발급 버튼을 찾을 수 없습니다. {e}")
+		return False
+	driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
+	ratelimit.acquire("issue")
+	driver.execute_script("arguments[0].click();", btn)
+	_accept_open_alerts(driver, label, alerts)
+	return True
+
+
+def _issue_from_responses(driver, capture, total_rows: int, need_isrc: bool, need_uci: bool):
+	"""발급 버튼을 누르고 성능 로그의 발급 응답으로 성공 여부를 판단한다. 응답 본문에 코드가 없으면 앨범 상세를 한 번 받아 읽는다.
+	(응답으로 판단을 끝냈는지, 코드)를 반환한다. 실패 응답도 판단한 것으로 보며 이때 코드는 비어 있을 수 있다.
+	버튼을 누르지 못했거나 응답이 없거나 응답으로 성패를 알 수 없으면 False를 반환해 화면 확인으로 넘긴다.
+	화면 반영을 기다리거나 새로고침하지 않는다. UCI 버튼은 ISRC 발급 뒤에도 같은 화면에 남아 있어 바로 누른다."""
+	codes = None
+	decided = True
+	for label, button, needed in (("ISRC", "setTrackIsrc", need_isrc), ("UCI", "setTrackUCI", need_uci)):
+		if not needed:
+			continue
+		events.info(f"{label} 발급 버튼 클릭...")
+		since = capture.mark()
+		alerts = []
+		if not _click_issue(driver, button, label, alerts):
+			return False, None
+		# 확인창이 늦게 뜨거나 완료 알림이 떠도 로그를 읽기 전마다 수락해 응답 대기가 막히지 않게 한다
+		response = capture.wait(
+			netcapture.issue_pattern(label), since, timeout=50, kind=label.lower(),
+			between=lambda: _accept_open_alerts(driver, label, alerts),
+		)
+		if response is None:
+			events.warning(f"{label} 발급 응답을 성능 로그에서 찾지 못했습니다.")
+			return False, None
+		ok, message = netcapture.verdict(response)
+		codes = netcapture.codes_from_payload(response["json"]) or codes
+		if ok is None:
+			events.info(f"{label} 발급 응답으로 성패를 판단할 수 없습니다 (HTTP {response['status']}).", url=response["url"])
+			decided = False
+		elif ok:
+			events.info(f"{label} 발급 응답 확인: HTTP {response['status']} {message}".rstrip(), url=response["url"])
+		else:
+			events.warning(f"{label} 발급 실패 응답: {message}", url=response["url"], alerts=alerts)
+			if label == "ISRC" and need_uci:
+				events.warning("ISRC 발급이 실패해 UCI 발급을 건너뜁니다.")
+			break
+
+	if not decided:
+		return False, codes
+	if not _codes_complete(codes, total_rows):
+		codes = netcapture.fetch_album_codes(driver, driver.current_url)
+	found = len(codes) if codes else 0
+	events.info(f"발급 결과 확인(응답·상세 조회): {found}/{total_rows}개")
+	return True, codes
+
+
+def issue_codes(driver, verify_mode: str = "smart"):
+	"""앨범 상세에서 ISRC/UCI 필요 여부를 판단해 발급하고 코드를 추출한다. verify_mode="double"이면 기존 이중 새로고침으로 검증한다."""
+	events.info("앨범 상세 페이지로 이동했습니다. ISRC/UCI 코드 확인 및 발급을 시작합니다.")
+	capture_page(driver, "album_detail")
+
+	detail = AlbumDetailPage.of(driver)
 
 	def _count_rows(driver):
 		try:
-			track_list_xpath = "//th[contains(text(), 'ISRC/Music.UCI')]/ancestor::table/tbody/tr"
-			WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.XPATH, track_list_xpath)))
-			return len(driver.find_elements(By.XPATH, track_list_xpath))
+			WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.XPATH, TRACK_LIST_XPATH)))
+			return detail.count_rows()
 		except Exception:
 			return 0
 
@@ -614,7 +804,7 @@ def issue_codes(driver):
 		deadline = time.time() + 30
 		while time.time() < deadline:
 			try:
-				count_now = len(driver.find_elements(By.CSS_SELECTOR, "span.g-bg-darkred[data-clipboard-data]"))
+				count_now = detail.count_isrc()
 				if count_now >= 1:
 					break
 			except UnexpectedAlertPresentException:
@@ -626,7 +816,7 @@ def issue_codes(driver):
 		deadline2 = time.time() + 20
 		while time.time() < deadline2:
 			try:
-				if len(driver.find_elements(By.CSS_SELECTOR, "span.g-bg-darkred[data-clipboard-data]")) >= expected_rows:
+				if detail.count_isrc() >= expected_rows:
 					return
 			except UnexpectedAlertPresentException:
 				_accept_all_alerts(driver, "ISRC", max_tries=2)
@@ -638,36 +828,32 @@ def issue_codes(driver):
 		deadline = time.time() + 30
 		while time.time() < deadline:
 			try:
-				count_now = len(driver.find_elements(By.CSS_SELECTOR, "span.g-bg-blue[data-clipboard-data]"))
+				count_now = detail.count_uci()
 				if count_now >= 1:
 					break
 			except UnexpectedAlertPresentException:
-				print("[UCI WAIT] UnexpectedAlertPresentException during initial wait")
-				print(traceback.format_exc())
+				events.error("[UCI WAIT] UnexpectedAlertPresentException during initial wait", traceback=traceback.format_exc())
 				_accept_all_alerts(driver, "UCI", max_tries=2)
 			except Exception:
-				print("[UCI WAIT] Exception during initial wait")
-				print(traceback.format_exc())
+				events.error("[UCI WAIT] Exception during initial wait", traceback=traceback.format_exc())
 			time.sleep(0.2)
 		deadline2 = time.time() + 20
 		while time.time() < deadline2:
 			try:
-				if len(driver.find_elements(By.CSS_SELECTOR, "span.g-bg-blue[data-clipboard-data]")) >= expected_rows:
+				if detail.count_uci() >= expected_rows:
 					return
 			except UnexpectedAlertPresentException:
-				print("[UCI WAIT] UnexpectedAlertPresentException during full-rows wait")
-				print(traceback.format_exc())
+				events.error("[UCI WAIT] UnexpectedAlertPresentException during full-rows wait", traceback=traceback.format_exc())
 				_accept_all_alerts(driver, "UCI", max_tries=2)
 			except Exception:
-				print("[UCI WAIT] Exception during full-rows wait")
-				print(traceback.format_exc())
+				events.error("[UCI WAIT] Exception during full-rows wait", traceback=traceback.format_exc())
 			time.sleep(0.3)
 
 	def _count_isrc_applied(driver):
-		return len(driver.find_elements(By.CSS_SELECTOR, "span.g-bg-darkred[data-clipboard-data]"))
+		return detail.count_isrc()
 
 	def _count_uci_applied(driver):
-		return len(driver.find_elements(By.CSS_SELECTOR, "span.g-bg-blue[data-clipboard-data]"))
+		return detail.count_uci()
 
 	def _accept_all_alerts(driver, label: str, max_tries: int = 5):
 		messages = []
@@ -678,7 +864,7 @@ def issue_codes(driver):
 				try:
 					text = alert.text
 					messages.append(text)
-					print(f"[{label} ALERT #{i}] {text}")
+					events.info(f"[{label} ALERT #{i}] {text}", kind="alert")
 				except Exception:
 					pass
 				alert.accept()
@@ -686,8 +872,7 @@ def issue_codes(driver):
 			except TimeoutException:
 				break
 			except Exception as e:
-				print(f"[{label} ALERT HANDLER ERROR] {e}")
-				print(traceback.format_exc())
+				events.error(f"[{label} ALERT HANDLER ERROR] {e}", traceback=traceback.format_exc())
 				break
 		return messages
 
@@ -695,9 +880,10 @@ def issue_codes(driver):
 		try:
 			btn = WebDriverWait(driver, 10).until(EC.element_to_be_clickable((by, ident)))
 			driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
+			ratelimit.acquire("issue")
 			driver.execute_script("arguments[0].click();", btn)
 			alerts = _accept_all_alerts(driver, label, max_tries=5)
-			print(f"{label} 발급 확인 완료. 페이지 반영 대기...")
+			events.info(f"{label} 발급 확인 완료. 페이지 반영 대기...")
 			for _ in range(3):
 				try:
 					WebDriverWait(driver, 10).until(
@@ -712,12 +898,10 @@ def issue_codes(driver):
 					alerts.extend(more)
 			return True, alerts
 		except NoSuchElementException as e:
-			print(f"{label} 발급 버튼을 찾을 수 없습니다. {e}")
-			print(traceback.format_exc())
+			events.error(f"{label} 발급 버튼을 찾을 수 없습니다. {e}", traceback=traceback.format_exc())
 			return False, []
 		except TimeoutException as e:
-			print(f"{label} 발급 확인창이 나타나지 않았거나 페이지 로딩에 실패했습니다. {e}")
-			print(traceback.format_exc())
+			events.error(f"{label} 발급 확인창이 나타나지 않았거나 페이지 로딩에 실패했습니다. {e}", traceback=traceback.format_exc())
 			return False, []
 
 	try:
@@ -734,63 +918,72 @@ def issue_codes(driver):
 		need_uci = uci_applied < total_rows
 
 		if not need_isrc and not need_uci:
-			print("ISRC/UCI가 모두 존재합니다. 코드만 추출합니다.")
+			events.info("ISRC/UCI가 모두 존재합니다. 코드만 추출합니다.")
 			return extract_codes(driver)
 
+		capture = netcapture.Capture.of(driver)
+		if verify_mode == "smart" and capture.available():
+			responded, codes = _issue_from_responses(driver, capture, total_rows, need_isrc, need_uci)
+			if responded:
+				return codes
+			events.warning("발급 응답을 확인하지 못해 화면 확인으로 전환합니다.")
+			return _verify_codes(driver, total_rows)
+
 		did_issue = False
 		if need_isrc:
-			print("ISRC 발급 버튼 클릭...")
+			events.info("ISRC 발급 버튼 클릭...")
 			prev_isrc = _count_isrc_applied(driver)
 			ok_isrc, isrc_alerts = _click_and_accept(driver, By.ID, "setTrackIsrc", "ISRC")
 			if ok_isrc:
 				_wait_for_isrc_applied(driver, total_rows)
 				now_isrc = _count_isrc_applied(driver)
-				if now_isrc <= prev_isrc and any("오류" in m for m in isrc_alerts):
-					print("ISRC 발급 경고/오류 감지:")
-					for m in isrc_alerts:
-						print(f" - {m}")
-				# ISRC 발급 후 1초 대기 + 새로고침 1회 → 알럿 드레인 → 테이블 재등장 대기
-				try:
-					time.sleep(1)
-					driver.refresh()
-					_accept_all_alerts(driver, "After ISRC Refresh", max_tries=3)
-					WebDriverWait(driver, 20).until(
-						EC.presence_of_element_located((By.XPATH, "//th[contains(text(), 'ISRC/Music.UCI')]/ancestor::table/tbody/tr"))
-					)
-					print("ISRC 후 새로고침 완료. UCI 발급을 시도합니다.")
-				except Exception as _e:
-					print(f"ISRC 후 새로고침 처리 중 경고/오류: {_e}")
+				if now_isrc <= prev_isrc and issue_alert_errors(isrc_alerts):
+					events.warning("ISRC 발급 경고/오류 감지: " + " / ".join(isrc_alerts), alerts=isrc_alerts)
+					if need_uci:
+						events.warning("ISRC 발급이 실패해 UCI 발급을 건너뜁니다.")
+						need_uci = False
+				# ISRC 발급 후 1초 대기 + 새로고침 1회 → 알럿 드레인 → 테이블 재등장 대기 (smart 모드는 UCI 발급이 필요할 때만)
+				if verify_mode != "smart" or need_uci:
+					try:
+						time.sleep(1)
+						ratelimit.acquire("read")
+						driver.refresh()
+						_accept_all_alerts(driver, "After ISRC Refresh", max_tries=3)
+						WebDriverWait(driver, 20).until(
+							EC.presence_of_element_located((By.XPATH, "//th[contains(text(), 'ISRC/Music.UCI')]/ancestor::table/tbody/tr"))
+						)
+						events.info("ISRC 후 새로고침 완료. UCI 발급을 시도합니다.")
+					except Exception as _e:
+						events.warning(f"ISRC 후 새로고침 처리 중 경고/오류: {_e}")
 			did_issue = True
 
 		if need_uci:
-			print("UCI 발급 버튼 클릭...")
+			events.info("UCI 발급 버튼 클릭...")
 			prev_uci = _count_uci_applied(driver)
 			try:
 				ok_uci, uci_alerts = _click_and_accept(driver, By.ID, "setTrackUCI", "UCI")
 			except Exception as e:
-				print("UCI 발급 처리 중 예외 발생")
-				print(traceback.format_exc())
+				events.error("UCI 발급 처리 중 예외 발생", traceback=traceback.format_exc())
 				ok_uci, uci_alerts = (False, [])
 			if ok_uci:
 				try:
 					_wait_for_uci_applied(driver, total_rows)
 				except Exception:
-					print("UCI 대기 중 예외")
-					print(traceback.format_exc())
+					events.error("UCI 대기 중 예외", traceback=traceback.format_exc())
 				now_uci = _count_uci_applied(driver)
 				if now_uci <= prev_uci:
-					print("UCI 발급 결과 반영이 확인되지 않았습니다. 알럿 메시지:")
-					for m in uci_alerts:
-						print(f" - {m}")
+					events.warning("UCI 발급 결과 반영이 확인되지 않았습니다. 알럿 메시지: " + " / ".join(uci_alerts), alerts=uci_alerts)
 					# 예외가 없어도 진단을 위해 현재 호출 스택 출력
 					try:
-						print("[UCI DIAG] 현재 호출 스택 (format_stack):")
-						print("".join(traceback.format_stack()))
+						events.warning("[UCI DIAG] 현재 호출 스택 (format_stack):", stack="".join(traceback.format_stack()))
 					except Exception:
 						pass
+				if verify_mode == "smart":
+					return _verify_codes(driver, total_rows)
 				# UCI 발급 후 1초 대기 + 새로고침 1회 → 알럿 드레인 → 테이블 재등장 대기 → 즉시 코드 추출 시도
 				try:
 					time.sleep(1)
+					ratelimit.acquire("read")
 					driver.refresh()
 					_accept_all_alerts(driver, "After UCI Refresh", max_tries=3)
 					WebDriverWait(driver, 20).until(
@@ -798,17 +991,18 @@ def issue_codes(driver):
 					)
 					quick_codes = extract_codes(driver)
 					if quick_codes:
-						print("UCI 후 새로고침 → 코드 추출 성공.")
+						events.info("UCI 후 새로고침 → 코드 추출 성공.")
 						return quick_codes
 					else:
-						print("UCI 후 새로고침 → 코드 추출 실패, 재시도를 진행합니다.")
+						events.warning("UCI 후 새로고침 → 코드 추출 실패, 재시도를 진행합니다.")
 						# 2차 재시도: UCI 버튼 다시 클릭 → 대기 → 1초 후 새로고침 → 즉시 추출 시도
 						try:
-							print("UCI 재시도 진행...")
+							events.info("UCI 재시도 진행...")
 							ok_uci2, uci_alerts2 = _click_and_accept(driver, By.ID, "setTrackUCI", "UCI-RETRY")
 							if ok_uci2:
 								_wait_for_uci_applied(driver, total_rows)
 								time.sleep(1)
+								ratelimit.acquire("read")
 								driver.refresh()
 								_accept_all_alerts(driver, "After UCI Retry Refresh", max_tries=3)
 								WebDriverWait(driver, 20).until(
@@ -816,61 +1010,59 @@ def issue_codes(driver):
 								)
 								retry_codes = extract_codes(driver)
 								if retry_codes:
-									print("UCI 재시도 후 새로고침 → 코드 추출 성공.")
+									events.info("UCI 재시도 후 새로고침 → 코드 추출 성공.")
 									return retry_codes
 								else:
-									print("UCI 재시도 후에도 코드 추출 실패")
+									events.warning("UCI 재시도 후에도 코드 추출 실패")
 									try:
-										print("[UCI DIAG] 재시도 후 추출 실패 스택:")
-										print("".join(traceback.format_stack()))
+										events.warning("[UCI DIAG] 재시도 후 추출 실패 스택:", stack="".join(traceback.format_stack()))
 									except Exception:
 										pass
 						except Exception:
-							print("UCI 재시도 중 예외")
-							print(traceback.format_exc())
+							events.error("UCI 재시도 중 예외", traceback=traceback.format_exc())
 						try:
-							print("[UCI DIAG] 새로고침 후 추출 실패 시 호출 스택:")
-							print("".join(traceback.format_stack()))
+							events.warning("[UCI DIAG] 새로고침 후 추출 실패 시 호출 스택:", stack="".join(traceback.format_stack()))
 						except Exception:
 							pass
 				except Exception as _e:
-					print("UCI 후 새로고침 처리/추출 중 예외")
-					print(traceback.format_exc())
+					events.error("UCI 후 새로고침 처리/추출 중 예외", traceback=traceback.format_exc())
 			did_issue = True
 
+		if did_issue and verify_mode == "smart":
+			return _verify_codes(driver, total_rows)
+
 		if did_issue:
 			time.sleep(1)
+			ratelimit.acquire("read")
 			driver.refresh()
 			WebDriverWait(driver, 20).until(
 				EC.presence_of_element_located((By.XPATH, "//th[contains(text(), 'ISRC/Music.UCI')]/ancestor::table/tbody/tr"))
 			)
 			first_codes = extract_codes(driver)
 
+			ratelimit.acquire("read")
 			driver.refresh()
 			WebDriverWait(driver, 20).until(
 				EC.presence_of_element_located((By.XPATH, "//th[contains(text(), 'ISRC/Music.UCI')]/ancestor::table/tbody/tr"))
 			)
-			print("코드 발급/이중 새로고침 후 최종 코드 추출을 시도합니다.")
+			events.info("코드 발급/이중 새로고침 후 최종 코드 추출을 시도합니다.")
 			final_codes = extract_codes(driver)
 			return final_codes or first_codes
 
 		return extract_codes(driver)
 	except Exception as e:
-		print(f"코드 확인/발급 중 예상치 못한 오류 발생: {e}")
-		print(traceback.format_exc())
+		events.error(f"코드 확인/발급 중 예상치 못한 오류 발생: {e}", traceback=traceback.format_exc())
 		return None
 
 def _select_producer_member(driver) -> None:
 	"""권리정보 탭에서 제작회원 '케이저'(이메일 metalfocus*) 항목을 선택한다."""
 	try:
+		rights = RightsTabPage.of(driver)
 		try:
-			rights_tab_btn = driver.find_element(By.CSS_SELECTOR, "#metaTab a[data-target='#meta-right']")
-			rights_tab_btn.click()
+			rights.find("rights_tab").click()
 		except Exception:
 			pass
-		WebDriverWait(driver, 5).until(
-			EC.presence_of_element_located((By.ID, "track-right-apply"))
-		)
+		rights.wait(lambda p: p.find("apply"), 5)
 		# 1) 제작회원 검색 버튼 클릭 (열기)
 		btn = None
 		for locator in [
@@ -887,6 +1079,7 @@ def _select_producer_member(driver) -> None:
 		if btn is None:
 			raise Exception("제작회원 검색 버튼을 찾을 수 없습니다.")
 		driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
+		ratelimit.acquire("read")
 		try:
 			btn.click()
 		except ElementClickInterceptedException:
@@ -895,7 +1088,7 @@ def _select_producer_member(driver) -> None:
 		modal = WebDriverWait(driver, 5).until(
 			EC.visibility_of_element_located((By.ID, "rightModal"))
 		)
-		print("제작회원 검색 모달 열림")
+		events.info("제작회원 검색 모달 열림")
 
 		# 3) 검색어 입력 ('케이저') - 가능한 경우 #searchValue 사용
 		try:
@@ -927,6 +1120,7 @@ def _select_producer_member(driver) -> None:
 					search_btn = btns[0] if btns else None
 		if search_btn is None:
 			raise Exception("검색 버튼을 찾을 수 없습니다.")
+		ratelimit.acquire("read")
 		try:
 			search_btn.click()
 		except ElementClickInterceptedException:
@@ -936,9 +1130,10 @@ def _select_producer_member(driver) -> None:
 		WebDriverWait(driver, 5).until(
 			EC.presence_of_element_located((By.CSS_SELECTOR, "#rightModal #search-right-list tbody tr, #rightModal .modal-body table tbody tr"))
 		)
+		capture_page(driver, "right_modal_producer")
 		rows = modal.find_elements(By.CSS_SELECTOR, "#search-right-list tbody tr, .modal-body table tbody tr")
 		if not rows:
-			print("검색 결과가 없습니다.")
+			events.warning("검색 결과가 없습니다.")
 		target_row = None
 		for tr in rows:
 			tds = tr.find_elements(By.TAG_NAME, "td")
@@ -973,11 +1168,12 @@ def _select_producer_member(driver) -> None:
 		if clickable is None:
 			clickable = target_row
 		driver.execute_script("arguments[0].scrollIntoView({block:'center'});", clickable)
+		ratelimit.acquire("upload")
 		try:
 			clickable.click()
 		except ElementClickInterceptedException:
 			driver.execute_script("arguments[0].click();", clickable)
-		print("제작회원: metalfocus* 항목 선택 완료")
+		events.info("제작회원: metalfocus* 항목 선택 완료")
 
 		# 선택 시 자동 닫힘 대기
 		try:
@@ -993,20 +1189,18 @@ def _select_producer_member(driver) -> None:
 		except Exception:
 			pass
 	except Exception as e:
-		print(f"제작회원 자동 선택 실패: {e}")
+		events.warning(f"제작회원 자동 선택 실패: {e}")
 
 
 def _select_distributor_member(driver) -> None:
 	"""권리정보 탭에서 유통회원 '케이저'(이메일 metalfocus*) 항목을 선택한다."""
 	try:
+		rights = RightsTabPage.of(driver)
 		try:
-			rights_tab_btn = driver.find_element(By.CSS_SELECTOR, "#metaTab a[data-target='#meta-right']")
-			rights_tab_btn.click()
+			rights.find("rights_tab").click()
 		except Exception:
 			pass
-		WebDriverWait(driver, 5).until(
-			EC.presence_of_element_located((By.ID, "track-right-apply"))
-		)
+		rights.wait(lambda p: p.find("apply"), 5)
 		# 1) 유통회원 검색 버튼 클릭 (열기)
 		btn = None
 		for locator in [
@@ -1023,6 +1217,7 @@ def _select_distributor_member(driver) -> None:
 		if btn is None:
 			raise Exception("유통회원 검색 버튼을 찾을 수 없습니다.")
 		driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
+		ratelimit.acquire("read")
 		try:
 			btn.click()
 		except ElementClickInterceptedException:
@@ -1031,7 +1226,7 @@ def _select_distributor_member(driver) -> None:
 		modal = WebDriverWait(driver, 5).until(
 			EC.visibility_of_element_located((By.ID, "rightModal"))
 		)
-		print("유통회원 검색 모달 열림")
+		events.info("유통회원 검색 모달 열림")
 
 		# 3) 검색어 입력 ('케이저')
 		try:
@@ -1059,6 +1254,7 @@ def _select_distributor_member(driver) -> None:
 				search_btn = btns[0] if btns else None
 		if search_btn is None:
 			raise Exception("검색 버튼을 찾을 수 없습니다.")
+		ratelimit.acquire("read")
 		try:
 			search_btn.click()
 		except ElementClickInterceptedException:
@@ -1068,6 +1264,7 @@ def _select_distributor_member(driver) -> None:
 		WebDriverWait(driver, 5).until(
 			EC.presence_of_element_located((By.CSS_SELECTOR, "#rightModal .modal-body, #rightModal table"))
 		)
+		capture_page(driver, "right_modal_distributor")
 
 		def try_select_once() -> bool:
 			try:
@@ -1108,11 +1305,12 @@ def _select_distributor_member(driver) -> None:
 				if clickable_local is None:
 					clickable_local = target
 				driver.execute_script("arguments[0].scrollIntoView({block:'center'});", clickable_local)
+				ratelimit.acquire("upload")
 				try:
 					clickable_local.click()
 				except ElementClickInterceptedException:
 					driver.execute_script("arguments[0].click();", clickable_local)
-				print("유통회원: metalfocus* 항목 선택 완료")
+				events.info("유통회원: metalfocus* 항목 선택 완료")
 				return True
 			except StaleElementReferenceException:
 				return False
@@ -1141,206 +1339,381 @@ def _select_distributor_member(driver) -> None:
 			except Exception:
 				pass
 	except Exception as e:
-		print(f"유통회원 자동 선택 실패: {e}")
+		events.warning(f"유통회원 자동 선택 실패: {e}")
 
-def goto_album_register(driver) -> bool:
-	"""앨범등록 페이지 진입→엑셀 업로드→상세 진입→재생시간/권리정보 처리 후 등록한다."""
+def _resolve_excel_path(excel_path=None) -> str:
+	"""업로드할 엑셀 경로를 절대경로로 정한다. 지정하지 않으면 기본 파일명을 쓴다."""
+	if excel_path is None:
+		excel_path = os.path.join(os.getcwd(), DEFAULT_EXCEL_FILENAME)
+	return os.path.abspath(excel_path)
+
+
+def prepare_upload(excel_path: str) -> str:
+	"""업로드할 엑셀을 정규화하고 실제로 올릴 경로를 반환한다. 정규화에 실패하면 원본을 올린다."""
 	try:
-		driver.get(ALBUM_REGISTER_URL)
+		result = normalise_workbook(excel_path)
+	except Exception as e:
+		events.warning(f"엑셀 정규화 실패, 원본을 업로드합니다: {e}")
+		return excel_path
+	if result["changed"]:
+		events.info(f"엑셀 정규화: 셀 {result['changed']}개 정리 → {result['path']}")
+	return result["path"]
 
-		WebDriverWait(driver, 10).until(EC.url_contains("/mypage/meta"))
-		try:
-			WebDriverWait(driver, 5).until(
-				EC.presence_of_element_located((By.CSS_SELECTOR, "form, input, select, textarea"))
-			)
-		except Exception:
-			pass
 
-		print("앨범등록 페이지 진입 완료!")
+def _upload_excel(driver, excel_path: str) -> None:
+	"""앨범등록 페이지의 대량등록(엑셀) 패널에서 파일을 선택하고 업로드한다."""
+	ratelimit.acquire("read")
+	driver.get(ALBUM_REGISTER_URL)
 
-		bulk_btn = WebDriverWait(driver, 10).until(
-			EC.element_to_be_clickable((By.ID, "register-excel-btn"))
-		)
-		bulk_btn.click()
-		excel_card = WebDriverWait(driver, 10).until(
-			EC.presence_of_element_located((By.ID, "excel-card"))
+	WebDriverWait(driver, 10).until(EC.url_contains("/mypage/meta"))
+	try:
+		WebDriverWait(driver, 5).until(
+			EC.presence_of_element_located((By.CSS_SELECTOR, "form, input, select, textarea"))
 		)
-		WebDriverWait(driver, 10).until(lambda d: 'd-none' not in excel_card.get_attribute('class'))
-		print("대량등록(엑셀) 패널 열기 완료!")
+	except Exception:
+		pass
 
-		file_input = WebDriverWait(driver, 10).until(
-			EC.presence_of_element_located((By.ID, "mims-excel-upload"))
-		)
+	events.info("앨범등록 페이지 진입 완료!")
 
-		excel_filename = "박성태 - 기도왕｜MIMS.xlsx"
-		excel_path = os.path.abspath(os.path.join(os.getcwd(), excel_filename))
-		if not os.path.exists(excel_path):
-			raise FileNotFoundError(f"엑셀 파일을 찾을 수 없습니다: {excel_path}")
+	bulk_btn = WebDriverWait(driver, 10).until(
+		EC.element_to_be_clickable((By.ID, "register-excel-btn"))
+	)
+	bulk_btn.click()
+	excel_card = WebDriverWait(driver, 10).until(
+		EC.presence_of_element_located((By.ID, "excel-card"))
+	)
+	WebDriverWait(driver, 10).until(lambda d: 'd-none' not in excel_card.get_attribute('class'))
+	events.info("대량등록(엑셀) 패널 열기 완료!")
 
-		driver.execute_script(
-			"arguments[0].classList.remove('d-none'); arguments[0].style.display='block';",
-			file_input,
-		)
-		file_input.send_keys(excel_path)
-		print(f"파일 선택 완료: {excel_path}")
+	file_input = WebDriverWait(driver, 10).until(
+		EC.presence_of_element_located((By.ID, "mims-excel-upload"))
+	)
 
-		WebDriverWait(driver, 10).until(
-			EC.presence_of_element_located((By.CSS_SELECTOR, "#excel-card tbody tr"))
-		)
+	if not os.path.exists(excel_path):
+		raise FileNotFoundError(f"엑셀 파일을 찾을 수 없습니다: {excel_path}")
+
+	driver.execute_script(
+		"arguments[0].classList.remove('d-none'); arguments[0].style.display='block';",
+		file_input,
+	)
+	file_input.send_keys(excel_path)
+	events.info(f"파일 선택 완료: {excel_path}")
+
+	WebDriverWait(driver, 10).until(
+		EC.presence_of_element_located((By.CSS_SELECTOR, "#excel-card tbody tr"))
+	)
+	capture_page(driver, "excel_uploaded")
 
-		upload_btn = WebDriverWait(driver, 10).until(
-			EC.element_to_be_clickable((By.XPATH, "//div[@id='excel-card']//button[.//span[contains(@class,'fa-upload')]]"))
+	upload_btn = WebDriverWait(driver, 10).until(
+		EC.element_to_be_clickable((By.XPATH, "//div[@id='excel-card']//button[.//span[contains(@class,'fa-upload')]]"))
+	)
+	capture = netcapture.Capture.of(driver)
+	since = capture.mark() if capture.available() else None
+	ratelimit.acquire("upload")
+	upload_btn.click()
+	events.info("업로드 버튼 클릭 완료. 업로드 진행 대기...")
+
+	if since is not None:
+		response = capture.wait(netcapture.upload_pattern(), since, timeout=30, kind="upload", between=lambda: _accept_upload_alert(driver))
+		if response is None:
+			events.warning("업로드 응답을 성능 로그에서 찾지 못해 성공 배지로 확인합니다.")
+		elif _check_upload_response(driver, response):
+			return
+
+	try:
+		WebDriverWait(driver, 5).until(EC.alert_is_present())
+		_accept_upload_alert(driver)
+	except TimeoutException:
+		pass
+
+	try:
+		WebDriverWait(driver, 30).until(
+			EC.presence_of_element_located((By.CSS_SELECTOR, "#excel-card .badge-success"))
 		)
-		upload_btn.click()
-		print("업로드 버튼 클릭 완료. 업로드 진행 대기...")
+		events.info("업로드 완료 감지!")
+	except TimeoutException:
+		events.warning("업로드 성공 배지를 확인하지 못했지만 다음 단계로 진행합니다.")
 
-		try:
-			WebDriverWait(driver, 5).until(EC.alert_is_present())
-			alert = driver.switch_to.alert
-			print(f"업로드 경고창 감지: {alert.text}")
-			alert.accept()
-			print("경고창 확인(accept) 완료")
-		except TimeoutException:
-			pass
 
-		try:
-			WebDriverWait(driver, 30).until(
-				EC.presence_of_element_located((By.CSS_SELECTOR, "#excel-card .badge-success"))
-			)
-			print("업로드 완료 감지!")
-		except TimeoutException:
-			print("업로드 성공 배지를 확인하지 못했지만 다음 단계로 진행합니다.")
+def _accept_upload_alert(driver) -> None:
+	"""업로드 확인창이 떠 있으면 수락한다. 없으면 기다리지 않는다."""
+	alert = EC.alert_is_present()(driver)
+	if alert:
+		events.info(f"업로드 경고창 감지: {alert.text}", kind="alert")
+		alert.accept()
+		events.info("경고창 확인(accept) 완료")
+
+
+def _check_upload_response(driver, response: dict) -> bool:
+	"""업로드 응답의 판정을 남긴다. 성공이면 True, 판단할 수 없으면 False, 서버가 거부했으면 검증 오류를 담아 UploadRejected를 던진다."""
+	_drain_alerts_quick(driver)
+	ok, message = netcapture.verdict(response)
+	if ok:
+		events.info(f"업로드 완료 감지! (HTTP {response['status']}) {message}".rstrip(), url=response["url"])
+		return True
+	if ok is None:
+		events.info(f"업로드 응답으로 성패를 판단할 수 없어 성공 배지로 확인합니다 (HTTP {response['status']}).", url=response["url"])
+		return False
+	errors = netcapture.validation_errors(response["json"])
+	for error in errors:
+		events.error(f"업로드 검증 오류: {error}")
+	raise UploadRejected(message or f"HTTP {response['status']}", errors)
+
+
+def same_title(a: str, b: str) -> bool:
+	"""앞뒤·연속 공백 차이를 무시하고 앨범 제목이 같은지 본다."""
+	return " ".join((a or "").split()) == " ".join((b or "").split())
 
-		try:
-			search_btn = WebDriverWait(driver, 10).until(
-				EC.element_to_be_clickable((By.ID, "search-btn"))
-			)
-			search_btn.click()
-		except Exception:
-			pass
 
-		table_first_album_xpath = "//div[@id='table']//table//tbody/tr[1]/td[3]/a[contains(@class,'go-register')]"
+def _uploaded_album_link(driver, album_title: str):
+	"""업로드된 앨범 목록에서 제목이 album_title인 행의 상세등록 링크. 없으면 False."""
+	for link in driver.find_elements(By.XPATH, UPLOADED_ALBUM_LINKS_XPATH):
+		if same_title(link.text, album_title):
+			return link
+	return False
+
+
+def _open_uploaded_album(driver, album_title=None) -> None:
+	"""업로드된 앨범 목록에서 album_title 행(없으면 첫 행)의 상세등록 페이지로 들어가 곡정보 탭을 띄운다.
+	여러 세션이 동시에 업로드하면 첫 행이 다른 세션의 앨범일 수 있으므로, 제목을 주면 그 행만 연다."""
+	try:
+		search_btn = WebDriverWait(driver, 10).until(
+			EC.element_to_be_clickable((By.ID, "search-btn"))
+		)
+		ratelimit.acquire("read")
+		search_btn.click()
+	except Exception:
+		pass
+
+	table_first_album_xpath = "//div[@id='table']//table//tbody/tr[1]/td[3]/a[contains(@class,'go-register')]"
+	if album_title:
+		try:
+			WebDriverWait(driver, 15, ignored_exceptions=(StaleElementReferenceException,)).until(lambda d: _uploaded_album_link(d, album_title))
+		except TimeoutException:
+			raise Exception(f"업로드한 앨범을 목록에서 찾지 못했습니다: {album_title}")
+	else:
 		WebDriverWait(driver, 15).until(
 			EC.presence_of_element_located((By.XPATH, table_first_album_xpath))
 		)
-		last_err = None
-		for attempt in range(5):
-			try:
+	last_err = None
+	for attempt in range(5):
+		try:
+			if album_title:
+				first_album_link = WebDriverWait(driver, 10, ignored_exceptions=(StaleElementReferenceException,)).until(lambda d: _uploaded_album_link(d, album_title))
+			else:
 				first_album_link = WebDriverWait(driver, 10).until(
 					EC.element_to_be_clickable((By.XPATH, table_first_album_xpath))
 				)
-				first_album_text = first_album_link.text
-				first_album_link.click()
-				print(f"상세등록 페이지로 이동 중... (앨범명: {first_album_text})")
-				break
-			except StaleElementReferenceException as e:
-				last_err = e
+			first_album_text = first_album_link.text
+			ratelimit.acquire("read")
+			first_album_link.click()
+			events.info(f"상세등록 페이지로 이동 중... (앨범명: {first_album_text})")
+			break
+		except StaleElementReferenceException as e:
+			last_err = e
+			time.sleep(0.5)
+			continue
+	else:
+		raise last_err if last_err else Exception("첫 행 앨범 링크 클릭 실패")
+
+	WebDriverWait(driver, 20).until(EC.url_contains("/mypage/meta/register/"))
+	events.info("상세등록 페이지 진입 완료!")
+
+	try:
+		WebDriverWait(driver, 5).until(
+			EC.presence_of_element_located((By.ID, "track-list"))
+		)
+	except TimeoutException:
+		_check_required_and_go_next(driver)
+		WebDriverWait(driver, 10).until(
+			EC.presence_of_element_located((By.ID, "track-list"))
+		)
+
+
+def _apply_rights_and_register(driver) -> None:
+	"""권리정보 탭에서 제작·유통회원을 선택하고 등록 버튼을 누른다."""
+	rights = RightsTabPage.of(driver)
+	try:
+		if rights.wait(lambda p: p.find("register"), 3):
+			_select_producer_member(driver)
+			_select_distributor_member(driver)
+			try:
+				rights.click("register", kind="upload", timeout=5)
+				events.info("등록 버튼 클릭")
+				_drain_alerts_quick(driver)
 				time.sleep(0.5)
-				continue
-		else:
-			raise last_err if last_err else Exception("첫 행 앨범 링크 클릭 실패")
+			except Exception as e:
+				events.warning(f"등록 버튼 클릭 실패: {e}")
+	except Exception:
+		pass
 
-		WebDriverWait(driver, 20).until(EC.url_contains("/mypage/meta/register/"))
-		print("상세등록 페이지 진입 완료!")
 
-		try:
-			WebDriverWait(driver, 5).until(
-				EC.presence_of_element_located((By.ID, "track-list"))
-			)
-		except TimeoutException:
-			_check_required_and_go_next(driver)
-			WebDriverWait(driver, 10).until(
-				EC.presence_of_element_located((By.ID, "track-list"))
-			)
+def register_workbook(driver, excel_path=None, durations=None, upload_path=None, album_title=None) -> bool:
+	"""앨범등록 페이지 진입→엑셀 업로드→상세 진입→재생시간/권리정보 처리 후 등록한다. 중복확인을 통과하면 True.
 
-		try:
-			_fill_durations_from_excel(driver, excel_path)
-		except Exception as e:
-			print(f"재생시간 채우기 실패: {e}")
+	upload_path를 주지 않으면 업로드 전에 엑셀을 정규화한 사본을 만들어 올린다.
+	album_title을 주면 업로드 목록에서 그 제목의 행을 연다(주지 않으면 첫 행).
+	"""
+	excel_path = _resolve_excel_path(excel_path)
+	if upload_path is None:
+		with events.step("normalise"):
+			upload_path = prepare_upload(excel_path)
+	with events.step("upload"):
+		_upload_excel(driver, upload_path)
+	with events.step("open_detail"):
+		_open_uploaded_album(driver, album_title)
 
-		try:
+	try:
+		with events.step("durations"):
+			_fill_durations_from_excel(driver, excel_path, durations)
+	except Exception as e:
+		events.warning(f"재생시간 채우기 실패: {e}")
+
+	try:
+		with events.step("save_last_track"):
 			_save_next_on_last_track(driver)
-		except Exception as e:
-			print(f"마지막 곡 저장-다음 처리 실패: {e}")
+	except Exception as e:
+		events.warning(f"마지막 곡 저장-다음 처리 실패: {e}")
 
-		try:
+	try:
+		with events.step("meta_confirm"):
 			proceed = _handle_meta_confirm(driver)
-			if not proceed:
-				print("검색앨범 수록곡이 있어 자동 진행을 중단합니다.")
-				return True
-		except Exception as e:
-			print(f"앨범중복확인 화면 분기 처리 실패: {e}")
-			return True
+		if not proceed:
+			events.warning("검색앨범 수록곡이 있어 자동 진행을 중단합니다.")
+			return False
+	except Exception as e:
+		events.warning(f"앨범중복확인 화면 분기 처리 실패: {e}")
+		return False
+
+	with events.step("rights"):
+		_apply_rights_and_register(driver)
+	return True
+
+
+def find_album_code(driver, album_title=None):
+	"""My앨범에서 제목이 일치하는 앨범 코드를 찾는다. 제목을 주지 않으면 가장 최신 앨범 코드를, 주었는데 없으면 None을 반환한다."""
+	with events.step("my_album"):
+		albums = find_approved_albums(driver)
+	if not albums:
+		return None
+	if album_title:
+		for album in albums:
+			if same_title(album["title"], album_title):
+				return album["code"]
+		# 다른 세션이 방금 올린 앨범일 수 있으므로 최신 앨범으로 대신하지 않는다
+		events.warning(f"My앨범에서 제목이 일치하는 앨범을 찾지 못했습니다: {album_title}")
+		return None
+	return albums[0]["code"]
+
+
+def issue_album(driver, album_code, verify_mode: str = "smart"):
+	"""앨범 상세 페이지로 이동해 ISRC/UCI를 발급·추출한다."""
+	with events.step("issue", album_code=album_code):
+		ratelimit.acquire("read")
+		driver.get(ALBUM_VIEW_URL.format(code=album_code))
+		WebDriverWait(driver, 20).until(
+			EC.presence_of_element_located((By.XPATH, TRACK_LIST_XPATH))
+		)
+		codes = issue_codes(driver, verify_mode=verify_mode)
+		if codes:
+			metrics.TRACKS.inc(len(codes), step="issue")
+		return codes
+
+
+def export_album(driver, album_code):
+	"""발급 없이 앨범 상세 페이지에서 현재 ISRC/UCI 표만 읽는다. 코드가 빠진 행이 있으면 None."""
+	with events.step("export", album_code=album_code):
+		ratelimit.acquire("read")
+		driver.get(ALBUM_VIEW_URL.format(code=album_code))
+		WebDriverWait(driver, 20).until(
+			EC.presence_of_element_located((By.XPATH, TRACK_LIST_XPATH))
+		)
+		return extract_codes(driver)
+
+
+def _print_codes(codes) -> None:
+	"""추출된 코드 목록을 곡 단위로 남긴다."""
+	for seq, item in enumerate(codes, start=1):
+		events.info(
+			f"곡명: {item['title']} · ISRC: {item['isrc']} · UCI: {item['uci']}",
+			track_seq=seq, isrc=item["isrc"], uci=item["uci"],
+		)
 
-		try:
-			if WebDriverWait(driver, 3).until(
-				EC.presence_of_element_located((By.ID, "right-reg-btn"))
-			):
-				_select_producer_member(driver)
-				_select_distributor_member(driver)
-				try:
-					reg_btn = WebDriverWait(driver, 5).until(
-						EC.element_to_be_clickable((By.ID, "right-reg-btn"))
-					)
-					driver.execute_script("arguments[0].scrollIntoView({block:'center'});", reg_btn)
-					reg_btn.click()
-					print("등록 버튼 클릭")
-					_drain_alerts_quick(driver)
-					time.sleep(0.5)
-				except Exception as e:
-					print(f"등록 버튼 클릭 실패: {e}")
-		except Exception:
-			pass
 
-		# My앨범으로 이동하여 통합된 로직 실행 (가장 최신 앨범 대상으로 수행)
+def goto_album_register(driver, excel_path=None, durations=None) -> bool:
+	"""앨범을 등록한 뒤 My앨범의 최신 앨범에 대해 ISRC/UCI 발급까지 이어서 수행한다."""
+	excel_path = _resolve_excel_path(excel_path)
+	album = read_album(excel_path) if os.path.exists(excel_path) else {"title": os.path.basename(excel_path), "tracks": []}
+	with events.album_context(album["title"]) as album_state:
 		try:
-			albums = find_approved_albums(driver)
-			if albums:
-				latest_code = albums[0]["code"]
-				album_url = f"https://www.mims.or.kr/mypage/view/album/{latest_code}"
-				driver.get(album_url)
-				WebDriverWait(driver, 20).until(
-					EC.presence_of_element_located((By.XPATH, "//th[contains(text(), 'ISRC/Music.UCI')]/ancestor::table/tbody/tr"))
-				)
-				result = issue_codes(driver)
-				if result:
-					print("main.py 로직 실행 완료 - 코드 결과:")
-					for item in result:
-						print(f"  곡명: {item['title']}")
-						print(f"  ISRC: {item['isrc']}")
-						print(f"  UCI:  {item['uci']}")
-						print("-" * 22)
+			if not register_workbook(driver, excel_path, durations, album_title=album["title"] if album["tracks"] else None):
+				album_state["status"] = "중단"
+				return True
+
+			# My앨범으로 이동하여 통합된 로직 실행 (가장 최신 앨범 대상으로 수행)
+			try:
+				latest_code = find_album_code(driver, album["title"] if album["tracks"] else None)
+				if latest_code:
+					result = issue_album(driver, latest_code)
+					if result:
+						events.info("main.py 로직 실행 완료 - 코드 결과:")
+						_print_codes(result)
+						append_history(album, latest_code, result)
+					else:
+						album_state["status"] = "코드 없음"
+						events.warning("main.py 로직 실행 결과: 코드 없음 또는 실패")
 				else:
-					print("main.py 로직 실행 결과: 코드 없음 또는 실패")
-			else:
-				print("My앨범에서 앨범을 찾지 못했습니다.")
-		except Exception as e:
-			print(f"My앨범 이동/코드 처리 실패: {e}")
+					album_state["status"] = "코드 없음"
+					events.warning("My앨범에서 앨범을 찾지 못했습니다.")
+			except Exception as e:
+				album_state["status"] = "실패"
+				events.error(f"My앨범 이동/코드 처리 실패: {e}")
 
-		return True
-	except Exception as e:
-		print(f"앨범등록 페이지/업로드/상세 진입 흐름 실패: {e}")
-		return False
+			return True
+		except Exception as e:
+			album_state["status"] = "실패"
+			events.error(f"앨범등록 페이지/업로드/상세 진입 흐름 실패: {e}")
+			return False
 
 
 def main():
 	"""환경변수 로드 후 크롬 드라이버로 로그인·등록·발급 흐름을 실행한다."""
 	load_dotenv()
+	metrics.start_from_env()
 	mims_id = os.getenv("MIMS_ID")
 	mims_password = os.getenv("MIMS_PASSWORD")
 
 	if not mims_id or not mims_password:
-		print("환경변수 MIMS_ID/MIMS_PASSWORD가 설정되지 않았습니다. .env를 확인하세요.")
+		events.error("환경변수 MIMS_ID/MIMS_PASSWORD가 설정되지 않았습니다. .env를 확인하세요.")
 		return
 
-	driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
+	# 브라우저를 띄우기 전에 재생시간 열 전체와 중복 의심 트랙을 검사한다
+	excel_path = _resolve_excel_path()
+	if not os.path.exists(excel_path):
+		events.error(f"엑셀 파일을 찾을 수 없습니다: {excel_path}")
+		return
+	durations = parse_duration_column(excel_path)
+	durations.print_report()
+	album = read_album(excel_path)
+	title_index.precheck(album)
+	title_index.reuse_check(album)
+
+	driver = create_driver()
+	# 멈춘 단계는 감시 스레드가 브라우저를 강제 종료해 풀어 준다
+	watchdog = Watchdog()
+	watchdog.start()
 
 	try:
-		if not login(driver, mims_id, mims_password):
-			return
-		goto_album_register(driver)
-		input("작업 완료. Enter를 누르면 브라우저를 닫습니다...")
+		with watchdog.watch(lambda: kill_process_tree(driver_pid(driver)), album["title"], "main") as lease:
+			if not login(driver, mims_id, mims_password):
+				return
+			goto_album_register(driver, excel_path, durations)
+		if lease["incident"]:
+			events.error("시간 예산 초과로 작업을 중단했습니다. logs/incidents.jsonl을 확인하세요.")
+		elif sys.stdin.isatty():
+			input("작업 완료. Enter를 누르면 브라우저를 닫습니다...")
 	finally:
+		watchdog.close()
 		driver.quit()
 
 
@@ -0,0 +1,447 @@
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+
+import events
+import catalog
+import ratelimit
+from tabs import issue_in_tabs
+from fakedriver import FakeDriver, VirtualClock
+from workbook import read_album, parse_duration_column
+from register_album import (
+	goto_album_register, issue_album, _handle_meta_confirm, login,
+	LOGIN_URL, ALBUM_REGISTER_URL, ALBUM_VIEW_URL, MY_ALBUM_URL, TRACK_LIST_XPATH, UPLOADED_ALBUM_LINKS_XPATH, DEFAULT_EXCEL_FILENAME,
+)
+
+# 가짜 드라이버(fakedriver)로 등록·발급 흐름의 분기를 시나리오별로 돌려 결과를 확인하고,
+# 브라우저 대기 없이 순수 파이썬 오버헤드(실제 소요시간)와 흐름이 기다렸을 가상 시간을 함께 잰다.
+
+SAMPLE_WORKBOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), DEFAULT_EXCEL_FILENAME)
+ALBUM_CODE = "A1001"
+REGISTER_URL = "https://www.mims.or.kr/mypage/meta/register/1001"
+FIRST_ALBUM_XPATH = "//div[@id='table']//table//tbody/tr[1]/td[3]/a[contains(@class,'go-register')]"
+OK_BUTTON_XPATH = "//button[normalize-space(.)='확인' or normalize-space(.)='확 인']"
+UPLOAD_BUTTON_XPATH = "//div[@id='excel-card']//button[.//span[contains(@class,'fa-upload')]]"
+SELECT_BUTTON_XPATH = ".//button[contains(.,'선택') or contains(.,'선 정') or contains(.,'선 택')]"
+MODAL_ROW_SELECTORS = [
+	"#rightModal #search-right-list tbody tr", "#rightModal .modal-body table tbody tr", "#rightModal table tbody tr",
+	"#search-right-list tbody tr", ".modal-body table tbody tr",
+]
+
+
+def _header() -> dict:
+	return {"key": "menu_link", "tag": "a", "text": "My앨범", "attrs": {"href": "/mypage/album"}, "match": ['a[href="/mypage/album"]'], "on_click": {"goto": "my_album"}}
+
+
+def _fmt(seconds: int) -> str:
+	return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def _sample_tracks(count: int) -> list:
+	return [{"title": f"곡 {i}", "duration": 180 + i} for i in range(1, count + 1)]
+
+
+# ----- 픽스처 조각 -----
+def login_state() -> dict:
+	return {"url": LOGIN_URL, "elements": [
+		{"id": "inputEmail", "tag": "input"},
+		{"id": "inputPwd", "tag": "input", "attrs": {"type": "password"}},
+		{"id": "login-btn", "tag": "button", "on_click": {"goto": "home"}},
+	]}
+
+
+def album_detail_state(tracks: list, isrc: bool, uci: bool) -> dict:
+	"""앨범 상세 화면. 발급 버튼은 ISRC → detail_isrc, UCI → detail_full 상태로 넘긴다."""
+	rows = []
+	for i, track in enumerate(tracks, start=1):
+		codes = []
+		if isrc:
+			codes.append({"tag": "span", "attrs": {"class": "badge g-bg-darkred", "data-clipboard-data": f"KRA40250{i:04d}"}, "match": ["span.g-bg-darkred", "span.g-bg-darkred[data-clipboard-data]"]})
+		if uci:
+			codes.append({"tag": "span", "attrs": {"class": "badge g-bg-blue", "data-clipboard-data": f"G7100125{i:06d}"}, "match": ["span.g-bg-blue", "span.g-bg-blue[data-clipboard-data]"]})
+		rows.append({"tag": "tr", "match": [TRACK_LIST_XPATH, "tbody tr"], "children": [
+			{"tag": "td", "text": str(i)}, {"tag": "td", "text": "1"}, {"tag": "td", "text": str(i)},
+			{"tag": "td", "children": [{"tag": "a", "text": track["title"], "match": ["td:nth-child(4) a"]}]},
+			{"tag": "td", "text": track.get("artist", "")},
+			{"tag": "td", "children": codes},
+		]})
+	return {"url": ALBUM_VIEW_URL.format(code=ALBUM_CODE), "elements": [
+		_header(),
+		{"key": "code_table", "tag": "table", "match": ["//th[contains(text(), 'ISRC/Music.UCI')]/ancestor::table"], "children": [
+			{"tag": "thead", "children": [{"tag": "th", "text": "ISRC/Music.UCI", "match": ["//th[contains(text(), 'ISRC/Music.UCI')]"]}]},
+			{"tag": "tbody", "children": rows},
+		]},
+		{"id": "setTrackIsrc", "tag": "button"},
+		{"id": "setTrackUCI", "tag": "button"},
+	]}
+
+
+def _api_response(path: str, ok: bool, message: str, delay: float, **extra) -> dict:
+	return {"response": {"url": f"https://www.mims.or.kr{path}", "body": {"result": "success" if ok else "fail", "msg": message, **extra}}, "delay": delay}
+
+
+def issue_fixture(tracks: list, isrc_delay: float = 1.0, uci_delay: float = 1.5, isrc_fails: bool = False, uci_fails: bool = False, issued: bool = False, network: bool = False) -> dict:
+	"""발급 흐름만 도는 픽스처. issued면 처음부터 모든 코드가 있고, network면 성능 로그에 발급 응답이 남는다."""
+	states = {
+		"detail": album_detail_state(tracks, issued, issued),
+		"detail_isrc": album_detail_state(tracks, True, False),
+		"detail_full": album_detail_state(tracks, True, True),
+	}
+	for name in ("detail", "detail_isrc"):
+		buttons = {e.get("id"): e for e in states[name]["elements"]}
+		buttons["setTrackIsrc"]["on_click"] = (
+			[{"alert": "ISRC를 발급하시겠습니까?"}, {"alert": "ISRC 발급 중 오류가 발생했습니다."}, _api_response("/mypage/meta/setTrackIsrc", False, "ISRC 발급 중 오류가 발생했습니다.", 0.3)] if isrc_fails
+			else [
+				{"alert": "ISRC를 발급하시겠습니까?"}, {"alert": "ISRC가 발급되었습니다."}, {"goto": "detail_isrc", "delay": isrc_delay},
+				_api_response("/mypage/meta/setTrackIsrc", True, "ISRC가 발급되었습니다.", isrc_delay),
+			]
+		)
+		buttons["setTrackUCI"]["on_click"] = (
+			[{"alert": "UCI를 발급하시겠습니까?"}, {"alert": "UCI 발급 중 오류가 발생했습니다."}, _api_response("/mypage/meta/setTrackUCI", False, "UCI 발급 중 오류가 발생했습니다.", 0.3)] if uci_fails
+			else [
+				{"alert": "UCI를 발급하시겠습니까?"}, {"alert": "UCI가 발급되었습니다."}, {"goto": "detail_full", "delay": uci_delay},
+				_api_response("/mypage/meta/setTrackUCI", True, "UCI가 발급되었습니다.", uci_delay),
+			]
+		)
+	return {"start": "detail", "performance": network, "urls": {ALBUM_VIEW_URL.format(code=""): "detail"}, "states": states}
+
+
+def _track_row(seq: str, track: dict, uploaded: bool) -> dict:
+	return {"tag": "tr", "attrs": {"data-import_seq": seq}, "match": ["#track-list tbody tr"], "children": [
+		{"tag": "td", "attrs": {"for": "displayTrackTitle"}, "children": [
+			{"tag": "a", "text": track["title"], "attrs": {"class": "show-track-btn"}, "match": ["td[for='displayTrackTitle'] a.show-track-btn"], "on_click": {"set": {
+				"importSeq": {"value": seq}, "duration_hh": {"value": ""}, "duration_mm": {"value": ""}, "duration_ss": {"value": ""}, "duration": {"value": ""},
+			}}},
+		]},
+		{"tag": "td", "attrs": {"for": "displayDuration"}, "text": _fmt(track["duration"]) if uploaded else ""},
+	]}
+
+
+def _member_modal() -> list:
+	"""권리정보 탭의 제작·유통회원 검색 버튼과 검색 모달."""
+	row = {"tag": "tr", "match": MODAL_ROW_SELECTORS, "children": [
+		{"tag": "td", "text": "케이저"},
+		{"tag": "td", "text": "metalfocus@example.com"},
+		{"tag": "td", "children": [{"tag": "button", "text": "선택", "match": [".select-right", SELECT_BUTTON_XPATH], "on_click": [
+			{"display": "rightModal", "value": False}, {"hide": "right-results"},
+		]}]},
+	]}
+	open_modal = [{"display": "rightModal", "value": True}, {"hide": "right-results"}]
+	return [
+		{"tag": "a", "text": "권리정보", "match": ["#metaTab a[data-target='#meta-right']"]},
+		{"id": "track-right-apply", "children": [
+			{"tag": "button", "text": "제작회원 검색", "match": ["#track-right-apply button.search-group[data-group-category='P']"], "on_click": open_modal},
+			{"tag": "button", "text": "유통회원 검색", "match": ["#track-right-apply button.search-group[data-group-category='S']"], "on_click": open_modal},
+		]},
+		{"id": "rightModal", "displayed": False, "children": [
+			{"id": "searchValue", "tag": "input", "attrs": {"type": "text"}, "match": ["input[type='text']"]},
+			{"id": "modal-right-search", "tag": "button", "text": "검색", "match": [".//button[normalize-space(text())='검색']", "button.btn.btn-primary"], "on_click": {"show": "right-results"}},
+			{"key": "right-results", "tag": "table", "present": False, "match": ["#rightModal table", "#rightModal .modal-body"], "children": [
+				{"tag": "tbody", "children": [row]},
+			]},
+		]},
+	]
+
+
+def register_fixture(album: dict, duplicates: int = 0, uploaded: bool = False, upload_delay: float = 2.0, upload_fails: bool = False, **issue_options) -> dict:
+	"""로그인부터 업로드·상세등록·권리정보·My앨범·발급까지 한 앨범의 전체 흐름 픽스처. upload_fails면 서버가 엑셀 검증 오류로 거부한다."""
+	tracks = album["tracks"]
+	seqs = [f"s{i}" for i in range(1, len(tracks) + 1)]
+	clear_durations = {k: {"value": ""} for k in ("duration_hh", "duration_mm", "duration_ss", "duration")}
+	fixture = issue_fixture(tracks, **issue_options)
+	fixture["start"] = "login"
+	fixture["urls"].update({LOGIN_URL: "login", ALBUM_REGISTER_URL: "meta", MY_ALBUM_URL: "my_album"})
+	fixture["states"].update({
+		"login": login_state(),
+		"home": {"url": "https://www.mims.or.kr/", "elements": [_header()]},
+		"meta": {"url": ALBUM_REGISTER_URL, "elements": [
+			_header(),
+			{"tag": "form", "match": ["form"]},
+			{"id": "register-excel-btn", "tag": "button", "on_click": {"set": {"excel-card": {"class": "card"}}}},
+			{"id": "excel-card", "attrs": {"class": "card d-none"}, "children": [
+				{"id": "mims-excel-upload", "tag": "input", "displayed": False, "attrs": {"type": "file"}, "on_send_keys": {"show": "excel-row"}},
+				{"key": "excel-row", "tag": "tr", "present": False, "match": ["#excel-card tbody tr"]},
+				{"tag": "button", "match": [UPLOAD_BUTTON_XPATH], "on_click": [
+					{"alert": "업로드 하시겠습니까?"},
+					_api_response("/mypage/meta/excel/upload", False, "엑셀 검증 오류", upload_delay, errors=[{"row": 18, "msg": "재생시간 형식 오류"}]),
+				] if upload_fails else [
+					{"alert": "업로드 하시겠습니까?"}, {"show": "upload-badge", "delay": upload_delay},
+					_api_response("/mypage/meta/excel/upload", True, "업로드되었습니다.", upload_delay),
+				]},
+				{"key": "upload-badge", "tag": "span", "present": False, "match": ["#excel-card .badge-success"]},
+			]},
+			{"id": "search-btn", "tag": "button"},
+			{"tag": "a", "text": album["title"], "match": [FIRST_ALBUM_XPATH, UPLOADED_ALBUM_LINKS_XPATH], "on_click": {"goto": "register"}},
+		]},
+		"register": {"url": REGISTER_URL, "elements": [
+			_header(),
+			{"tag": "body", "attrs": {"class": ""}},
+			{"id": "meta-tracks", "attrs": {"class": "tab-pane fade show active"}},
+			{"tag": "a", "text": "곡정보", "match": ["#metaTab a[data-target='#meta-tracks']"]},
+			{"id": "track-list", "tag": "table", "children": [
+				{"tag": "tbody", "children": [_track_row(seq, t, uploaded) for seq, t in zip(seqs, tracks)]},
+			]},
+			{"id": "importSeq", "tag": "input", "displayed": False, "attrs": {"value": ""}},
+			{"id": "duration_hh", "tag": "input", "attrs": {"value": ""}},
+			{"id": "duration_mm", "tag": "input", "attrs": {"value": ""}},
+			{"id": "duration_ss", "tag": "input", "attrs": {"value": ""}},
+			{"id": "duration", "tag": "input", "displayed": False, "attrs": {"value": ""}},
+			{"id": "update-meta-track-next-track-btn", "tag": "button", "on_click": [
+				{"cycle": {"key": "importSeq", "attr": "value", "values": seqs}}, {"set": clear_durations},
+			]},
+			{"tag": "button", "text": "확인", "match": [OK_BUTTON_XPATH]},
+			{"id": "meta-confirm", "children": [
+				{"id": "search-track-data", "children": [{"tag": "table", "children": [{"tag": "tbody", "children": [
+					{"tag": "tr", "match": ["#search-track-data table tbody tr"], "children": [
+						{"tag": "td", "text": f"중복 {i}", "attrs": {"class": "select-title"}, "match": [".select-title"]},
+					]} for i in range(1, duplicates + 1)
+				]}]}]},
+			]},
+			{"id": "meta-next-right-new-btn", "tag": "button", "on_click": {"show": "right-reg-btn"}},
+			*_member_modal(),
+			{"id": "right-reg-btn", "tag": "button", "present": False, "on_click": {"alert": "등록되었습니다."}},
+		]},
+		"my_album": {"url": MY_ALBUM_URL, "elements": [
+			_header(),
+			{"tag": "div", "attrs": {"class": "mims-pmb"}, "match": ["div.mims-pmb"], "children": [
+				{"tag": "div", "attrs": {"class": "thumbnail-style"}, "match": ["div.mims-pmb .thumbnail-style"], "children": [
+					{"tag": "a", "text": album["title"], "match": ["h3 > a"]},
+					{"tag": "a", "attrs": {"class": "go-view", "data-album-code": ALBUM_CODE}, "match": ["a.go-view"]},
+				]},
+			]},
+		]},
+	})
+	return fixture
+
+
+# ----- 시나리오 -----
+def _click_count(driver, key: str) -> int:
+	return sum(1 for _, kind, name in driver.history if kind == "click" and name == key)
+
+
+def _clicked(driver, key: str) -> bool:
+	return _click_count(driver, key) > 0
+
+
+def _codes_complete(codes, count: int) -> bool:
+	return bool(codes) and len(codes) == count and all(c["isrc"] and c["uci"] for c in codes)
+
+
+def _login_and_register(driver, excel_path: str, durations):
+	if not login(driver, "bench@example.com", "secret"):
+		return False
+	return goto_album_register(driver, excel_path, durations)
+
+
+def build_scenarios(excel_path: str = SAMPLE_WORKBOOK) -> dict:
+	"""이름 → {fixture, run(driver), check(result, driver), about}."""
+	tracks = _sample_tracks(12)
+	album = read_album(excel_path)
+	durations = parse_duration_column(excel_path)
+
+	def issue(verify_mode):
+		return lambda d: issue_album(d, ALBUM_CODE, verify_mode=verify_mode)
+
+	def confirm_state(duplicates):
+		fixture = register_fixture(album, duplicates=duplicates)
+		fixture["start"] = "register"
+		return fixture
+
+	return {
+		"issue_existing": {
+			"about": "코드가 이미 모두 있으면 발급 버튼을 누르지 않고 추출만 한다",
+			"fixture": issue_fixture(tracks, issued=True),
+			"run": issue("smart"),
+			"check": lambda r, d: _codes_complete(r, 12) and not _clicked(d, "setTrackIsrc"),
+		},
+		"issue_fresh_smart": {
+			"about": "ISRC → 새로고침 → UCI 발급 후 smart 검증",
+			"fixture": issue_fixture(tracks),
+			"run": issue("smart"),
+			"check": lambda r, d: _codes_complete(r, 12) and _clicked(d, "setTrackUCI"),
+		},
+		"issue_fresh_double": {
+			"about": "ISRC·UCI 발급 후 이중 새로고침 검증",
+			"fixture": issue_fixture(tracks),
+			"run": issue("double"),
+			"check": lambda r, d: _codes_complete(r, 12),
+		},
+		"issue_network": {
+			"about": "성능 로그의 발급 응답으로 확인하고 상세를 한 번 받아 코드를 읽는다 (새로고침 없음)",
+			"fixture": issue_fixture(tracks, network=True),
+			"run": issue("smart"),
+			"check": lambda r, d: _codes_complete(r, 12) and d.calls["refresh"] == 0,
+		},
+		"issue_network_uci_error": {
+			"about": "UCI 발급 실패 응답이면 화면 확인으로 넘어가 ISRC만 있는 상태로 끝난다",
+			"fixture": issue_fixture(tracks, uci_fails=True, network=True),
+			"run": issue("smart"),
+			"check": lambda r, d: not _codes_complete(r, 12),
+		},
+		"issue_slow_server": {
+			"about": "발급 반영이 늦어도(ISRC 8초·UCI 12초) 대기 루프 안에서 코드를 얻는다",
+			"fixture": issue_fixture(tracks, isrc_delay=8.0, uci_delay=12.0),
+			"run": issue("smart"),
+			"check": lambda r, d: _codes_complete(r, 12),
+		},
+		"issue_tabs": {
+			"about": "앨범 4개를 탭 3개로 번갈아 발급하고 연 탭을 닫는다",
+			"fixture": issue_fixture(tracks),
+			"run": lambda d: issue_in_tabs(d, ["A1001", "A1002", "A1003", "A1004"], tabs=3),
+			"check": lambda r, d: len(r) == 4 and all(_codes_complete(c, 12) for c in r.values()) and d.window_handles == [d.current_window_handle],
+		},
+		"issue_tabs_slow_isrc": {
+			"about": "탭 발급에서 ISRC 반영이 시간 안에 보이지 않아도 새로고침 후 UCI를 발급한다",
+			"fixture": issue_fixture(tracks, isrc_delay=90.0),
+			"run": lambda d: issue_in_tabs(d, ["A1001"], tabs=2),
+			"check": lambda r, d: _clicked(d, "setTrackUCI") and _codes_complete(r["A1001"], 12),
+		},
+		"issue_tabs_isrc_error": {
+			"about": "탭 발급에서 ISRC 오류 알림이 오면 UCI를 누르지 않고 그 앨범만 코드 없이 끝난다",
+			"fixture": issue_fixture(tracks, isrc_fails=True),
+			"run": lambda d: issue_in_tabs(d, ["A1001", "A1002"], tabs=2),
+			"check": lambda r, d: len(r) == 2 and not any(r.values()) and not _clicked(d, "setTrackUCI"),
+		},
+		"issue_tabs_uci_error": {
+			"about": "탭 발급에서 UCI 오류 알림이 오면 그 앨범만 코드 없이 끝난다",
+			"fixture": issue_fixture(tracks, uci_fails=True),
+			"run": lambda d: issue_in_tabs(d, ["A1001", "A1002"], tabs=2),
+			"check": lambda r, d: len(r) == 2 and not any(r.values()),
+		},
+		"issue_isrc_error": {
+			"about": "ISRC 발급이 오류 알림으로 끝나면 UCI를 누르지 않고 코드 없이 반환한다",
+			"fixture": issue_fixture(tracks, isrc_fails=True),
+			"run": issue("smart"),
+			"check": lambda r, d: not r and not _clicked(d, "setTrackUCI"),
+		},
+		"issue_uci_error": {
+			"about": "UCI 발급이 오류 알림으로 끝나면 코드 없이 반환한다",
+			"fixture": issue_fixture(tracks, uci_fails=True),
+			"run": issue("smart"),
+			"check": lambda r, d: not r,
+		},
+		"meta_confirm_clear": {
+			"about": "검색 수록곡이 없으면 권리정보 탭으로 넘어간다",
+			"fixture": confirm_state(0),
+			"run": _handle_meta_confirm,
+			"check": lambda r, d: r is True and _clicked(d, "meta-next-right-new-btn"),
+		},
+		"meta_confirm_duplicates": {
+			"about": "검색 수록곡이 있으면 화면을 유지하고 멈춘다",
+			"fixture": confirm_state(2),
+			"run": _handle_meta_confirm,
+			"check": lambda r, d: r is False and not _clicked(d, "meta-next-right-new-btn"),
+		},
+		"register_full": {
+			"about": "로그인부터 업로드·재생시간 입력·권리정보·발급까지 전체 흐름",
+			"fixture": register_fixture(album),
+			"run": lambda d: _login_and_register(d, excel_path, durations),
+			"check": lambda r, d: r is True and _clicked(d, "right-reg-btn") and d.state == "detail_full",
+		},
+		"register_network": {
+			"about": "업로드·발급 응답을 성능 로그로 확인하는 전체 흐름",
+			"fixture": register_fixture(album, network=True),
+			"run": lambda d: _login_and_register(d, excel_path, durations),
+			"check": lambda r, d: r is True and d.state == "detail_full" and d.calls["refresh"] == 0,
+		},
+		"register_upload_rejected": {
+			"about": "서버가 엑셀을 거부하면 검증 오류를 남기고 등록을 멈춘다",
+			"fixture": register_fixture(album, network=True, upload_fails=True),
+			"run": lambda d: _login_and_register(d, excel_path, durations),
+			"check": lambda r, d: r is False and d.state == "meta" and not _clicked(d, "search-btn"),
+		},
+		"register_uploaded_durations": {
+			"about": "업로드만으로 재생시간이 들어갔으면 곡별 입력을 건너뛴다",
+			"fixture": register_fixture(album, uploaded=True),
+			"run": lambda d: _login_and_register(d, excel_path, durations),
+			"check": lambda r, d: r is True and _click_count(d, "update-meta-track-next-track-btn") <= 1 and d.state == "detail_full",
+		},
+		"register_duplicates": {
+			"about": "앨범중복확인에서 멈추면 권리정보·발급으로 가지 않는다",
+			"fixture": register_fixture(album, duplicates=1),
+			"run": lambda d: _login_and_register(d, excel_path, durations),
+			"check": lambda r, d: r is True and not _clicked(d, "right-reg-btn") and d.state == "register",
+		},
+	}
+
+
+def run_scenario(scenario: dict) -> dict:
+	"""가상 시계 아래에서 시나리오 하나를 돌려 결과·실제 소요시간·가상 대기시간·API 호출 수를 반환한다."""
+	clock = VirtualClock()
+	driver = FakeDriver(scenario["fixture"], clock)
+	started = time.perf_counter()
+	error = None
+	with clock.patch():
+		try:
+			result = scenario["run"](driver)
+		except Exception as e:
+			result, error = None, f"{type(e).__name__}: {e}"
+	wall = time.perf_counter() - started
+	ok = error is None and bool(scenario["check"](result, driver))
+	return {"ok": ok, "error": error, "wall": wall, "virtual": clock.elapsed(), "calls": dict(driver.calls), "state": driver.state}
+
+
+def _prepare_environment(log_dir: str) -> None:
+	"""콘솔 출력을 끄고 로그·실행 기록을 임시 디렉터리로 돌리며 속도 제한을 푼다."""
+	events.setup(log_dir, console_level=logging.CRITICAL, summary_stream=open(os.devnull, "w"))
+	os.environ[catalog.HISTORY_ENV] = os.path.join(log_dir, "run_history.jsonl")
+	ratelimit.configure(**{kind: (0, 1) for kind in ratelimit.DEFAULT_LIMITS})
+
+
+def main():
+	"""시나리오를 반복 실행해 통과 여부와 시나리오별 실제·가상 소요시간을 출력한다. 실패가 있으면 종료코드 1."""
+	parser = argparse.ArgumentParser(description="가짜 드라이버로 등록·발급 흐름 시나리오 실행/벤치마크")
+	parser.add_argument("names", nargs="*", help="실행할 시나리오 (기본: 전체)")
+	parser.add_argument("-n", "--repeat", type=int, default=1, help="시나리오별 반복 횟수")
+	parser.add_argument("--excel", default=SAMPLE_WORKBOOK, help="전체 흐름 시나리오에 쓸 엑셀")
+	parser.add_argument("--list", action="store_true", help="시나리오 목록만 출력")
+	parser.add_argument("--dump", help="시나리오 픽스처를 JSON으로 저장할 디렉터리")
+	args = parser.parse_args()
+
+	scenarios = build_scenarios(args.excel)
+	if args.list:
+		for name, scenario in scenarios.items():
+			print(f"{name:<28} {scenario['about']}")
+		return 0
+	if args.dump:
+		os.makedirs(args.dump, exist_ok=True)
+		for name, scenario in scenarios.items():
+			with open(os.path.join(args.dump, f"{name}.json"), "w", encoding="utf-8") as f:
+				json.dump(scenario["fixture"], f, ensure_ascii=False, indent=1)
+		print(f"픽스처 {len(scenarios)}개 → {args.dump}")
+		return 0
+
+	unknown = [n for n in args.names if n not in scenarios]
+	if unknown:
+		print(f"알 수 없는 시나리오: {', '.join(unknown)}", file=sys.stderr)
+		return 2
+	_prepare_environment(tempfile.mkdtemp(prefix="mims_scenarios_"))
+
+	failed = runs = 0
+	total_started = time.perf_counter()
+	print(f"{'scenario':<28} {'ok':>4} {'real ms':>9} {'p50 ms':>8} {'virtual s':>10} {'clicks':>7} {'finds':>7}")
+	for name in args.names or scenarios:
+		results = [run_scenario(scenarios[name]) for _ in range(args.repeat)]
+		runs += len(results)
+		walls = sorted(r["wall"] * 1000 for r in results)
+		passed = sum(1 for r in results if r["ok"])
+		failed += len(results) - passed
+		last = results[-1]
+		print(
+			f"{name:<28} {passed:>2}/{len(results):<2}{sum(walls) / len(walls):>8.2f} {walls[len(walls) // 2]:>8.2f} "
+			f"{last['virtual']:>10.1f} {last['calls'].get('click', 0):>7} {last['calls'].get('find', 0):>7}"
+		)
+		if last["error"] or not last["ok"]:
+			print(f"    실패: {last['error'] or '기대한 결과가 아님'} (마지막 상태: {last['state']})")
+	elapsed = time.perf_counter() - total_started
+	print(f"시나리오 실행 {runs}회 · 실패 {failed}회 · {elapsed:.2f}s ({runs / elapsed:.0f}회/s)")
+	events.shutdown()
+	return 1 if failed else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
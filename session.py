@@ -0,0 +1,168 @@
+import os
+import time
+
+import events
+import metrics
+import ratelimit
+import netcapture
+from procs import driver_pid, kill_process_tree, process_tree_rss
+from register_album import create_driver, login, is_logged_in, LOGIN_URL, ALBUM_REGISTER_URL
+
+# 로그인된 크롬 세션 하나를 관리한다. 앨범 사이마다 처리 앨범 수와 chromedriver·크롬 프로세스 트리의
+# RSS를 확인해 임계값을 넘으면 드라이버를 새로 띄우고 쿠키(안 되면 재로그인)로 세션을 이어 간다.
+
+RECYCLE_ALBUMS_ENV = "MIMS_RECYCLE_ALBUMS"
+RECYCLE_RSS_ENV = "MIMS_RECYCLE_RSS_MB"
+DEFAULT_RECYCLE_ALBUMS = 20
+DEFAULT_RECYCLE_RSS_MB = 1500
+_COOKIE_KEYS = ("name", "value", "path", "domain", "secure", "httpOnly", "expiry", "sameSite")
+
+BROWSER_RSS = metrics.Gauge("mims_browser_rss_bytes", "세션별 chromedriver·크롬 프로세스 트리 RSS", ("session",))
+RECYCLES = metrics.Counter("mims_driver_recycles", "드라이버 재시작 횟수", ("session", "reason"))
+
+
+class RecyclePolicy:
+	"""처리 앨범 수와 프로세스 트리 RSS 임계값. 0이면 해당 기준은 쓰지 않는다."""
+
+	def __init__(self, max_albums: int = DEFAULT_RECYCLE_ALBUMS, max_rss_mb: int = DEFAULT_RECYCLE_RSS_MB):
+		self.max_albums = max_albums
+		self.max_rss_mb = max_rss_mb
+
+	@classmethod
+	def from_env(cls) -> "RecyclePolicy":
+		return cls(
+			int(os.getenv(RECYCLE_ALBUMS_ENV, DEFAULT_RECYCLE_ALBUMS)),
+			int(os.getenv(RECYCLE_RSS_ENV, DEFAULT_RECYCLE_RSS_MB)),
+		)
+
+	def reason(self, albums: int, rss: int):
+		"""재시작해야 하면 이유 문자열을, 아니면 None을 반환한다."""
+		if self.max_rss_mb and rss >= self.max_rss_mb * 1024 * 1024:
+			return "rss"
+		if self.max_albums and albums >= self.max_albums:
+			return "albums"
+		return None
+
+
+class BrowserSession:
+	"""로그인된 드라이버 하나와 그 드라이버로 처리한 앨범 수·메모리 추이를 들고 있는다."""
+
+	def __init__(self, mims_id: str, mims_password: str, name: str, policy=None, factory=create_driver):
+		self.mims_id = mims_id
+		self.mims_password = mims_password
+		self.name = name
+		self.policy = policy or RecyclePolicy.from_env()
+		self.factory = factory
+		self.driver = None
+		self.albums = 0
+		self.total_albums = 0
+		self.recycles = 0
+		self.samples = []
+
+	def start(self) -> bool:
+		"""드라이버를 띄우고 로그인한다. 실패하면 드라이버를 닫고 False를 반환한다."""
+		self.driver = self.factory()
+		self.albums = 0
+		if login(self.driver, self.mims_id, self.mims_password):
+			return True
+		self.close()
+		return False
+
+	def close(self) -> None:
+		if self.driver is not None:
+			try:
+				self.driver.quit()
+			except Exception:
+				pass
+			self.driver = None
+
+	def kill(self) -> int:
+		"""응답이 없는 드라이버의 chromedriver·크롬 프로세스를 강제 종료한다. 막혀 있던 호출은 곧 예외로 풀린다."""
+		pid = driver_pid(self.driver) if self.driver is not None else None
+		return kill_process_tree(pid) if pid else 0
+
+	def restart(self) -> bool:
+		"""드라이버를 버리고 새로 띄워 다시 로그인한다."""
+		self.close()
+		self.recycles += 1
+		return self.start()
+
+	def rss(self) -> int:
+		pid = driver_pid(self.driver) if self.driver is not None else None
+		return process_tree_rss(pid) if pid else 0
+
+	def sample(self) -> int:
+		"""현재 RSS를 기록하고 이벤트·지표로 남긴다."""
+		rss = self.rss()
+		self.samples.append({"ts": round(time.time(), 3), "albums": self.total_albums, "rss": rss})
+		BROWSER_RSS.set(rss, session=self.name)
+		events.debug(
+			f"[{self.name}] 브라우저 메모리 {rss / 1048576:.0f}MB · 이 드라이버로 {self.albums}개 앨범 처리",
+			kind="memory", step="session", rss=rss, albums=self.albums,
+		)
+		return rss
+
+	def after_album(self, count: int = 1) -> None:
+		"""앨범 하나(탭 발급이면 count개)를 마칠 때마다 호출한다. 임계값을 넘었으면 다음 앨범 전에 드라이버를 새로 띄운다."""
+		self.albums += count
+		self.total_albums += count
+		# 발급·업로드 대기가 읽지 않은 성능 로그(다른 페이지 요청)를 비워 chromedriver에 쌓이지 않게 한다
+		if self.driver is not None:
+			netcapture.Capture.of(self.driver).available()
+		reason = self.policy.reason(self.albums, self.sample())
+		if reason:
+			self.recycle(reason)
+
+	def recycle(self, reason: str) -> bool:
+		"""드라이버를 종료·재실행하고 쿠키로 세션을 복원한다. 복원되지 않으면 다시 로그인한다."""
+		started = time.perf_counter()
+		before = self.samples[-1]["rss"] if self.samples else 0
+		cookies = []
+		if self.driver is not None:
+			try:
+				cookies = self.driver.get_cookies()
+			except Exception:
+				cookies = []
+		self.close()
+		self.driver = self.factory()
+		self.albums = 0
+		self.recycles += 1
+		RECYCLES.inc(session=self.name, reason=reason)
+
+		restored = bool(cookies) and self._restore_cookies(cookies)
+		ok = restored or login(self.driver, self.mims_id, self.mims_password)
+		events.info(
+			f"[{self.name}] 드라이버 재시작 ({reason}, {before / 1048576:.0f}MB → {self.rss() / 1048576:.0f}MB, "
+			f"{'쿠키 복원' if restored else '재로그인'})",
+			kind="recycle", step="session", reason=reason, restored=restored, ok=ok,
+			duration=time.perf_counter() - started,
+		)
+		if not ok:
+			self.close()
+		return ok
+
+	def _restore_cookies(self, cookies: list) -> bool:
+		try:
+			ratelimit.acquire("read")
+			self.driver.get(LOGIN_URL)
+			self.driver.delete_all_cookies()
+			for cookie in cookies:
+				self.driver.add_cookie({k: cookie[k] for k in _COOKIE_KEYS if k in cookie})
+			ratelimit.acquire("read")
+			self.driver.get(ALBUM_REGISTER_URL)
+			return is_logged_in(self.driver)
+		except Exception as e:
+			events.warning(f"[{self.name}] 쿠키 복원 실패: {e}", step="session")
+			return False
+
+	def memory_report(self) -> dict:
+		"""메모리 추이 요약(최대·마지막 RSS, 재시작 횟수, 샘플 목록)을 반환한다."""
+		peak = max((s["rss"] for s in self.samples), default=0)
+		return {
+			"session": self.name,
+			"albums": self.total_albums,
+			"recycles": self.recycles,
+			"peak_rss": peak,
+			"last_rss": self.samples[-1]["rss"] if self.samples else 0,
+			"samples": self.samples,
+		}
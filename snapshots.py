@@ -0,0 +1,208 @@
+import os
+import re
+import json
+import time
+import shutil
+import weakref
+import threading
+from collections import deque
+
+import events
+import fixtures
+
+# 드라이버별로 최근 N개 페이지 상태(스크린샷·다듬은 DOM·브라우저 콘솔 로그)를 메모리 링 버퍼에 들고 있다가,
+# 단계가 예외로 끝났을 때만 디스크에 덤프한다. 메모리 합계와 덤프 디렉터리 용량에 상한을 둔다.
+# DOM은 fixtures.sanitize_html로 민감정보를 지우지만 스크린샷은 화면 그대로라 가릴 수 없다. 그래서 기본값은
+# 실패 시점 한 장만 찍고(MIMS_SNAPSHOT_SCREENSHOTS=failure), 덤프를 밖으로 공유할 때는 *.png를 빼야 한다.
+
+SNAPSHOTS_ENV = "MIMS_SNAPSHOTS"
+DEPTH_ENV = "MIMS_SNAPSHOT_DEPTH"
+MEMORY_ENV = "MIMS_SNAPSHOT_MEMORY_MB"
+DISK_ENV = "MIMS_SNAPSHOT_DISK_MB"
+SCREENSHOTS_ENV = "MIMS_SNAPSHOT_SCREENSHOTS"
+SCREENSHOT_POLICIES = ("failure", "all", "off")
+DEFAULT_DEPTH = 5
+DEFAULT_MEMORY_MB = 32
+DEFAULT_DISK_MB = 200
+MAX_DOM_CHARS = 200_000
+MAX_CONSOLE_ENTRIES = 200
+
+_STYLE_RE = re.compile(r"<(style|svg)\b[^>]*>.*?</\1\s*>", re.S | re.I)
+_BLANK_RE = re.compile(r"\n\s*\n+")
+
+_lock = threading.Lock()
+_rings = weakref.WeakKeyDictionary()
+_current = threading.local()
+_state = {"bytes": 0, "seq": 0}
+
+
+def _env_int(name: str, default: int) -> int:
+	try:
+		return int(os.getenv(name, default))
+	except ValueError:
+		return default
+
+
+def enabled() -> bool:
+	return os.getenv(SNAPSHOTS_ENV, "1") not in ("0", "false", "off")
+
+
+def screenshot_policy() -> str:
+	"""스크린샷을 언제 찍을지: failure(실패 시점만, 기본), all(기록할 때마다), off."""
+	policy = os.getenv(SCREENSHOTS_ENV, "failure").strip().lower()
+	return policy if policy in SCREENSHOT_POLICIES else "failure"
+
+
+def trim_dom(html: str, limit: int = MAX_DOM_CHARS) -> str:
+	"""스크립트·스타일·SVG와 민감정보를 지우고 빈 줄을 줄인 뒤 limit자로 자른다."""
+	html = _BLANK_RE.sub("\n", _STYLE_RE.sub("", fixtures.sanitize_html(html)))
+	if len(html) > limit:
+		html = html[:limit] + f"\n<!-- trimmed {len(html) - limit} chars -->"
+	return html
+
+
+def _entry_size(entry: dict) -> int:
+	return len(entry["screenshot"] or b"") + len(entry["dom"]) * 2 + sum(len(c.get("message", "")) for c in entry["console"])
+
+
+def _evict_locked(limit: int) -> None:
+	"""메모리 합계가 limit 이하가 될 때까지 모든 링에서 가장 오래된 항목부터 버린다."""
+	while _state["bytes"] > limit:
+		oldest = None
+		for ring in _rings.values():
+			if ring and (oldest is None or ring[0]["seq"] < oldest[0]["seq"]):
+				oldest = ring
+		if oldest is None:
+			_state["bytes"] = 0
+			return
+		_state["bytes"] -= oldest.popleft()["size"]
+
+
+def attach(driver) -> None:
+	"""현재 스레드의 드라이버로 등록한다. 이 스레드에서 단계가 실패하면 이 드라이버의 링을 덤프한다."""
+	if not enabled():
+		return
+	with _lock:
+		_rings.setdefault(driver, deque(maxlen=max(1, _env_int(DEPTH_ENV, DEFAULT_DEPTH))))
+	_current.driver = weakref.ref(driver)
+
+
+def current_driver():
+	ref = getattr(_current, "driver", None)
+	return ref() if ref is not None else None
+
+
+def record(driver, step: str, failure: bool = False) -> None:
+	"""현재 페이지 상태를 드라이버의 링 버퍼에 넣는다. 스크린샷은 screenshot_policy()를 따르고, 가져오지 못한 항목은 비워 둔다."""
+	if not enabled() or driver not in _rings:
+		return
+	policy = screenshot_policy()
+	entry = {"step": step, "ts": time.time(), "url": "", "screenshot": None, "dom": "", "console": []}
+	try:
+		entry["url"] = (driver.current_url or "").split("?")[0]
+		entry["dom"] = trim_dom(driver.page_source)
+		if policy == "all" or (failure and policy == "failure"):
+			entry["screenshot"] = driver.get_screenshot_as_png()
+	except Exception as e:
+		entry["error"] = str(e)
+	try:
+		entry["console"] = driver.get_log("browser")[-MAX_CONSOLE_ENTRIES:]
+	except Exception:
+		pass
+	entry["size"] = _entry_size(entry)
+
+	with _lock:
+		ring = _rings.get(driver)
+		if ring is None:
+			return
+		_state["seq"] += 1
+		entry["seq"] = _state["seq"]
+		if len(ring) == ring.maxlen:
+			_state["bytes"] -= ring[0]["size"]
+		ring.append(entry)
+		_state["bytes"] += entry["size"]
+		_evict_locked(_env_int(MEMORY_ENV, DEFAULT_MEMORY_MB) * 1024 * 1024)
+
+
+def _dir_size(path: str) -> int:
+	total = 0
+	for root, _, files in os.walk(path):
+		for name in files:
+			try:
+				total += os.path.getsize(os.path.join(root, name))
+			except OSError:
+				pass
+	return total
+
+
+def _enforce_disk_cap(base: str, limit: int) -> None:
+	"""덤프 디렉터리 합계가 limit을 넘으면 오래된 덤프부터 지운다."""
+	dumps = sorted(
+		(os.path.join(base, d) for d in os.listdir(base) if os.path.isdir(os.path.join(base, d))),
+		key=os.path.getmtime,
+	)
+	sizes = {d: _dir_size(d) for d in dumps}
+	total = sum(sizes.values())
+	for d in dumps[:-1]:
+		if total <= limit:
+			break
+		shutil.rmtree(d, ignore_errors=True)
+		total -= sizes[d]
+
+
+def dump(driver, reason: str, step=None) -> str:
+	"""실패 시점 상태를 한 번 더 기록한 뒤 링 전체를 디스크에 쓰고 링을 비운다. 덤프 경로를 반환한다."""
+	step = step or events.current_step() or "unknown"
+	record(driver, f"failure:{step}", failure=True)
+	with _lock:
+		ring = _rings.get(driver)
+		entries = list(ring) if ring else []
+		if ring:
+			_state["bytes"] -= sum(e["size"] for e in ring)
+			ring.clear()
+	if not entries:
+		return ""
+
+	base = os.path.join(events.setup(), "snapshots")
+	album = events.current_album() or ""
+	safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in f"{album}_{step}")[:60]
+	path = os.path.join(base, f"{time.strftime('%Y%m%d-%H%M%S')}_{threading.current_thread().name}_{safe}")
+	os.makedirs(path, exist_ok=True)
+	# 스크린샷(*.png)은 민감정보를 지우지 않은 화면 그대로다
+	meta = {"album": album, "step": step, "reason": reason, "screenshots_sanitized": False, "entries": []}
+	for i, e in enumerate(entries, start=1):
+		stem = f"{i:02d}_{e['step'].replace(':', '-')}"
+		files = {}
+		if e["screenshot"]:
+			files["screenshot"] = f"{stem}.png"
+			with open(os.path.join(path, files["screenshot"]), "wb") as f:
+				f.write(e["screenshot"])
+		if e["dom"]:
+			files["dom"] = f"{stem}.html"
+			with open(os.path.join(path, files["dom"]), "w", encoding="utf-8") as f:
+				f.write(e["dom"])
+		meta["entries"].append({
+			"step": e["step"], "ts": e["ts"], "url": e["url"], "files": files,
+			"console": e["console"], "error": e.get("error"),
+		})
+	with open(os.path.join(path, "snapshot.json"), "w", encoding="utf-8") as f:
+		json.dump(meta, f, ensure_ascii=False, indent=1, default=str)
+	_enforce_disk_cap(base, _env_int(DISK_ENV, DEFAULT_DISK_MB) * 1024 * 1024)
+	return path
+
+
+def _on_step_failure(name: str, exc: BaseException) -> None:
+	"""events.step 실패 훅. 같은 예외가 바깥 단계로 전파될 때는 한 번만 덤프한다."""
+	driver = current_driver()
+	if driver is None or getattr(exc, "_mims_snapshot", None) is not None:
+		return
+	path = dump(driver, f"{type(exc).__name__}: {exc}", name)
+	try:
+		exc._mims_snapshot = path
+	except Exception:
+		pass
+	if path:
+		events.warning(f"실패 스냅샷 저장: {path}", kind="snapshot", path=path)
+
+
+events.on_step_failure(_on_step_failure)
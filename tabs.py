@@ -0,0 +1,359 @@
+import os
+import sys
+import time
+import argparse
+import contextlib
+import contextvars
+
+from dotenv import load_dotenv
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (
+	NoSuchElementException, StaleElementReferenceException, UnexpectedAlertPresentException, WebDriverException,
+)
+
+import events
+import metrics
+import ratelimit
+from pages import AlbumDetailPage
+from register_album import ALBUM_VIEW_URL, create_driver, login, read_codes, issue_alert_errors, _codes_complete, _print_codes
+
+# 로그인된 브라우저 하나에 앨범 상세(/mypage/view/album/<code>)를 탭 여러 개로 열고, 창 핸들을 돌아가며
+# 탭마다 한 걸음씩(발급 버튼 클릭 → 반영 확인 → 코드 추출) 진행한다. 발급은 대부분 서버 처리를 기다리는 시간이라
+# 크롬 하나의 메모리로 여러 앨범을 동시에 발급할 수 있다. 한 걸음은 기다리지 않고 바로 돌아오며,
+# 기다리는 동안 뜬 알림창은 그 탭으로 돌아왔을 때 수락한다.
+
+TABS_ENV = "MIMS_ISSUE_TABS"
+DEFAULT_TABS = 3
+PHASE_TIMEOUT = 60
+IDLE_SLEEP = 0.2
+MAX_REFRESHES = 3
+MAX_ERRORS = 5
+
+ACTIVE_TABS = metrics.Gauge("mims_issue_tabs_active", "발급 중인 탭 수", ("session",))
+
+
+def tabs_from_env() -> int:
+	"""MIMS_ISSUE_TABS(기본 3)를 읽는다."""
+	return max(1, int(os.getenv(TABS_ENV, DEFAULT_TABS)))
+
+
+class AlbumTab:
+	"""탭 하나에 열린 앨범 하나의 발급 진행 상태. 이벤트 문맥(앨범 이름)은 탭마다 따로 든다."""
+
+	def __init__(self, handle: str, job, code: str, name: str):
+		self.handle = handle
+		self.job = job
+		self.code = code
+		self.name = name
+		self.phase = "load"
+		self.deadline = time.monotonic() + PHASE_TIMEOUT
+		self.next_at = 0.0
+		self.started = time.monotonic()
+		self.total = 0
+		self.need_uci = False
+		self.refreshes = 0
+		self.errors = 0
+		self.alerts = []
+		self.codes = None
+		self.error = None
+		self.context = contextvars.copy_context()
+		self._stack = contextlib.ExitStack()
+
+	def run(self, fn, *args, **kwargs):
+		"""이 탭의 앨범 문맥 안에서 fn을 실행한다."""
+		return self.context.run(fn, *args, **kwargs)
+
+	def enter(self) -> None:
+		self.run(self._stack.enter_context, events.album_context(self.name, report=False))
+
+	def exit(self) -> None:
+		self.run(self._stack.close)
+
+	def to(self, phase: str, timeout: float = PHASE_TIMEOUT) -> None:
+		self.phase = phase
+		self.deadline = time.monotonic() + timeout
+
+
+class TabIssuer:
+	"""드라이버 하나의 탭들로 여러 앨범을 번갈아 발급한다. 끝난 탭은 다음 앨범에 다시 쓴다."""
+
+	def __init__(self, driver, tabs: int = DEFAULT_TABS, name=None, session: str = "tabs"):
+		self.driver = driver
+		self.tabs = max(1, tabs)
+		self.name = name or (lambda job: job if isinstance(job, str) else job["code"])
+		self.session = session
+
+	def run(self, take, on_done) -> int:
+		"""take()가 돌려주는 작업(앨범 코드 또는 "code"가 있는 dict)을 빈 탭에 열어 발급하고, 끝날 때마다 on_done(작업, 코드, 오류)을 부른다.
+		take()가 None이고 진행 중인 탭도 없으면 끝내고 처리한 앨범 수를 반환한다."""
+		driver = self.driver
+		origin = driver.current_window_handle
+		idle, active, done = [], [], 0
+		try:
+			while True:
+				while len(active) < self.tabs:
+					job = take()
+					if job is None:
+						break
+					active.append(self._open(job, idle))
+				ACTIVE_TABS.set(len(active), session=self.session)
+				if not active:
+					return done
+				progressed = False
+				for tab in list(active):
+					if tab.phase != "done":
+						progressed = self._advance(tab) or progressed
+					if tab.phase == "done":
+						active.remove(tab)
+						if tab.handle is not None:
+							idle.append(tab.handle)
+						self._finish(tab, on_done)
+						done += 1
+						progressed = True
+				if not progressed:
+					time.sleep(IDLE_SLEEP)
+		finally:
+			ACTIVE_TABS.set(0, session=self.session)
+			for tab in active:
+				tab.error = tab.error or "탭 발급이 중단되었습니다."
+				self._finish(tab, on_done)
+			self._close_tabs(idle + [t.handle for t in active], origin)
+
+	def _open(self, job, idle: list) -> AlbumTab:
+		"""빈 탭(없으면 새 탭)에 앨범 상세를 연다."""
+		driver = self.driver
+		code = job if isinstance(job, str) else job["code"]
+		tab = None
+		try:
+			if idle:
+				driver.switch_to.window(idle.pop())
+			else:
+				driver.switch_to.new_window("tab")
+			tab = AlbumTab(driver.current_window_handle, job, code, self.name(job))
+			tab.enter()
+			tab.run(self._load, tab)
+		except Exception as e:
+			# 대기열에서 꺼낸 작업은 어떤 오류로 끝나도 on_done까지 가야 한다(chromedriver가 죽으면 urllib3 오류가 난다)
+			tab = tab or AlbumTab(None, job, code, self.name(job))
+			tab.error = f"앨범 상세를 열지 못했습니다: {_reason(e)}"
+			tab.phase = "done"
+		return tab
+
+	def _load(self, tab: AlbumTab) -> None:
+		events.info(f"탭에서 앨범 상세 열기 ({tab.handle})", album_code=tab.code)
+		ratelimit.acquire("read")
+		self.driver.get(ALBUM_VIEW_URL.format(code=tab.code))
+
+	def _advance(self, tab: AlbumTab) -> bool:
+		"""탭으로 전환해 한 걸음 진행한다. 단계가 바뀌었으면 True."""
+		phase = tab.phase
+		try:
+			self.driver.switch_to.window(tab.handle)
+			tab.run(self._step, tab)
+			tab.errors = 0
+		except UnexpectedAlertPresentException as e:
+			tab.alerts.append(e.alert_text or "")
+		except (NoSuchElementException, StaleElementReferenceException):
+			pass
+		except Exception as e:
+			tab.errors += 1
+			if tab.errors >= MAX_ERRORS:
+				tab.error = f"탭 발급 중 오류가 반복되었습니다: {_reason(e)}"
+				tab.phase = "done"
+		if tab.phase in ("done", "verify") or time.monotonic() < tab.deadline:
+			pass
+		elif tab.phase == "wait_isrc" and tab.need_uci:
+			tab.run(events.warning, "ISRC 반영을 확인하지 못했지만 새로고침 후 UCI 발급을 시도합니다.", album_code=tab.code)
+			tab.to("refresh_uci")
+		else:
+			tab.run(events.warning, f"탭 발급 단계 시간 초과 ({tab.phase}). 코드 확인으로 넘어갑니다.", album_code=tab.code)
+			tab.to("verify")
+		return tab.phase != phase
+
+	def _step(self, tab: AlbumTab) -> None:
+		self._accept_alerts(tab)
+		rows, isrc, uci = self._counts()
+		if tab.phase == "load":
+			if not rows:
+				return
+			tab.total = rows
+			tab.need_uci = uci < rows
+			if isrc >= rows and uci >= rows:
+				events.info("ISRC/UCI가 모두 존재합니다. 코드만 추출합니다.")
+				tab.to("extract")
+			elif isrc < rows:
+				self._issue(tab, "ISRC", "setTrackIsrc", "wait_isrc")
+			else:
+				self._issue(tab, "UCI", "setTrackUCI", "wait_uci")
+		elif tab.phase == "wait_isrc":
+			if isrc >= tab.total:
+				events.info(f"ISRC 반영 확인 ({isrc}/{tab.total})")
+				tab.to("refresh_uci" if tab.need_uci else "extract")
+			elif self._failed(tab, "ISRC"):
+				# 단일 앨범 발급과 같이 ISRC 오류 알림이면 UCI를 누르지 않는다. 시간 초과는 _advance에서 UCI를 시도한다.
+				if tab.need_uci:
+					events.warning("ISRC 발급이 실패해 UCI 발급을 건너뜁니다.")
+				tab.to("verify")
+		elif tab.phase == "refresh_uci":
+			ratelimit.acquire("read")
+			self.driver.refresh()
+			self._accept_alerts(tab)
+			tab.to("issue_uci")
+		elif tab.phase == "issue_uci":
+			if rows:
+				self._issue(tab, "UCI", "setTrackUCI", "wait_uci")
+		elif tab.phase == "wait_uci":
+			if uci >= tab.total:
+				events.info(f"UCI 반영 확인 ({uci}/{tab.total})")
+				tab.to("extract")
+			elif self._failed(tab, "UCI"):
+				tab.to("verify")
+		elif tab.phase == "extract":
+			tab.codes = read_codes(self.driver)
+			if _codes_complete(tab.codes, tab.total):
+				tab.phase = "done"
+			else:
+				tab.to("verify")
+		elif tab.phase == "verify":
+			self._verify(tab)
+
+	def _counts(self) -> tuple:
+		"""수록곡 행·ISRC·UCI 수. 탭마다 화면이 다르므로 페이지 객체에 요소를 기억해 두지 않고 매번 찾는다."""
+		try:
+			table = self.driver.find_element(*AlbumDetailPage.LOCATORS["code_table"])
+		except NoSuchElementException:
+			return 0, 0, 0
+		return tuple(len(table.find_elements(*locator)) for locator in (AlbumDetailPage.ROWS, AlbumDetailPage.ISRC_APPLIED, AlbumDetailPage.UCI_APPLIED))
+
+	def _issue(self, tab: AlbumTab, label: str, button: str, wait_phase: str) -> None:
+		"""발급 버튼을 누르고 바로 돌아온다. 확인창·완료 알림과 반영은 다음 차례에 본다."""
+		driver = self.driver
+		events.info(f"{label} 발급 버튼 클릭...")
+		btn = driver.find_element(By.ID, button)
+		tab.alerts = []
+		ratelimit.acquire("issue")
+		driver.execute_script("arguments[0].click();", btn)
+		tab.to(wait_phase)
+
+	def _accept_alerts(self, tab: AlbumTab) -> None:
+		"""떠 있는 알림창을 모두 수락하고 문구를 남긴다. 없으면 기다리지 않는다."""
+		while True:
+			alert = EC.alert_is_present()(self.driver)
+			if not alert:
+				return
+			text = alert.text
+			tab.alerts.append(text)
+			events.info(f"[ALERT] {text}", kind="alert")
+			alert.accept()
+
+	def _failed(self, tab: AlbumTab, label: str) -> bool:
+		"""발급 후 오류 알림이 왔으면 경고를 남기고 True."""
+		errors = issue_alert_errors(tab.alerts)
+		if errors:
+			events.warning(f"{label} 발급 경고/오류 감지: " + " / ".join(errors), alerts=errors)
+		return bool(errors)
+
+	def _verify(self, tab: AlbumTab) -> None:
+		"""새로고침 후 코드를 다시 읽는다. 모자라면 간격을 늘려가며 다음 차례에 다시 본다."""
+		if time.monotonic() < tab.next_at:
+			return
+		if tab.next_at:
+			ratelimit.acquire("read")
+			self.driver.refresh()
+			tab.refreshes += 1
+			self._accept_alerts(tab)
+		codes = read_codes(self.driver) or tab.codes
+		tab.codes = codes
+		if not _codes_complete(codes, tab.total) and tab.refreshes < MAX_REFRESHES:
+			tab.next_at = time.monotonic() + 0.5 * 2 ** tab.refreshes
+			return
+		found = len(codes) if codes else 0
+		(events.info if _codes_complete(codes, tab.total) else events.warning)(
+			f"발급 결과 검증: 새로고침 {tab.refreshes}회 후 {found}/{tab.total}개 확인"
+		)
+		tab.phase = "done"
+
+	def _finish(self, tab: AlbumTab, on_done) -> None:
+		elapsed = time.monotonic() - tab.started
+		if tab.codes:
+			metrics.TRACKS.inc(len(tab.codes), step="issue")
+		if tab.error:
+			tab.run(events.error, f"탭 발급 실패: {tab.error}", album_code=tab.code, duration=elapsed)
+		else:
+			found = len(tab.codes) if tab.codes else 0
+			tab.run(events.info, f"탭 발급 완료: {found}/{tab.total}개 ({elapsed:.1f}s)", album_code=tab.code, duration=elapsed)
+		tab.exit()
+		on_done(tab.job, tab.codes, tab.error)
+
+	def _close_tabs(self, handles: list, origin: str) -> None:
+		"""연 탭을 닫고 처음 보던 창으로 돌아간다."""
+		driver = self.driver
+		for handle in handles:
+			if handle is None or handle == origin:
+				continue
+			try:
+				driver.switch_to.window(handle)
+				driver.close()
+			except WebDriverException:
+				pass
+		try:
+			driver.switch_to.window(origin)
+		except WebDriverException:
+			pass
+
+
+def _reason(error: Exception) -> str:
+	return getattr(error, "msg", None) or str(error) or type(error).__name__
+
+
+def issue_in_tabs(driver, album_codes, tabs: int = DEFAULT_TABS) -> dict:
+	"""앨범 코드 목록을 탭 tabs개로 번갈아 발급하고 {코드: 코드목록 또는 None}을 반환한다."""
+	pending = list(album_codes)
+	results = {}
+
+	def take():
+		return pending.pop(0) if pending else None
+
+	def on_done(code, codes, error):
+		results[code] = codes if not error else None
+
+	TabIssuer(driver, tabs).run(take, on_done)
+	return results
+
+
+def main():
+	"""로그인한 크롬 하나에서 주어진 앨범 코드들을 탭으로 나눠 발급하고 코드를 출력한다."""
+	parser = argparse.ArgumentParser(description="브라우저 하나의 여러 탭으로 앨범 ISRC/UCI 동시 발급")
+	parser.add_argument("album_codes", nargs="+", help="발급할 앨범 코드들")
+	parser.add_argument("--tabs", type=int, default=None, help=f"동시에 여는 탭 수 (기본: {TABS_ENV} 또는 {DEFAULT_TABS})")
+	parser.add_argument("--headless", action="store_true", help="헤드리스 크롬으로 실행")
+	args = parser.parse_args()
+
+	load_dotenv()
+	events.setup()
+	metrics.start_from_env()
+	mims_id = os.getenv("MIMS_ID")
+	mims_password = os.getenv("MIMS_PASSWORD")
+	if not mims_id or not mims_password:
+		events.error("환경변수 MIMS_ID/MIMS_PASSWORD가 설정되지 않았습니다. .env를 확인하세요.")
+		return 1
+
+	driver = create_driver(args.headless)
+	try:
+		if not login(driver, mims_id, mims_password):
+			return 1
+		results = issue_in_tabs(driver, args.album_codes, args.tabs or tabs_from_env())
+	finally:
+		driver.quit()
+	for code, codes in results.items():
+		events.info(f"앨범 {code}: {'코드 ' + str(len(codes)) + '개' if codes else '코드 없음 또는 발급 실패'}")
+		if codes:
+			_print_codes(codes)
+		events.end_album(code, "완료" if codes else "코드 없음")
+	events.shutdown()
+	return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+	sys.exit(main())
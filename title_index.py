@@ -0,0 +1,307 @@
+import os
+import re
+import sys
+import json
+import argparse
+import unicodedata
+from collections import defaultdict
+
+import events
+import catalog
+from workbook import read_album, catalog_seconds
+
+# 등록했던 곡 제목·가수의 n-gram 색인. 브라우저를 띄우기 전에 MIMS 앨범중복확인 화면에서
+# 멈출 만한(같은/비슷한 제목의 곡이 이미 있는) 트랙을 미리 찾아낸다.
+# 실행 기록에 남은 발급 결과로는 (제목, 가수, 재생시간) 지문 → ISRC/UCI 색인을 만들어, 재발매·리마스터·
+# 컴필레이션처럼 이미 코드를 받은 곡을 발급 전에 알려 준다.
+
+INDEX_ENV = "MIMS_TITLE_INDEX"
+DEFAULT_INDEX = "title_index.json"
+NGRAM = 2
+DEFAULT_THRESHOLD = 0.75
+DURATION_TOLERANCE = 2
+
+_STRIP_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalise(text: str) -> str:
+	"""전각/반각·대소문자·공백·문장부호 차이를 없앤 비교용 문자열을 만든다."""
+	text = unicodedata.normalize("NFKC", text or "").casefold()
+	return _STRIP_RE.sub("", text)
+
+
+def ngrams(text: str, n: int = NGRAM) -> set:
+	"""정규화한 문자열의 n-gram 집합. n보다 짧으면 문자열 전체 하나."""
+	s = normalise(text)
+	if len(s) <= n:
+		return {s} if s else set()
+	return {s[i:i + n] for i in range(len(s) - n + 1)}
+
+
+def _dice(a: set, b: set) -> float:
+	if not a or not b:
+		return 0.0
+	return 2 * len(a & b) / (len(a) + len(b))
+
+
+class TitleIndex:
+	"""곡 제목 n-gram → 항목 번호 역색인과 항목(제목·가수·앨범·출처) 목록."""
+
+	def __init__(self):
+		self.entries = []
+		self._postings = defaultdict(list)
+		self._sizes = []
+		self._keys = set()
+
+	def __len__(self) -> int:
+		return len(self.entries)
+
+	def add(self, title: str, artist: str = "", album: str = "", source: str = "") -> None:
+		"""곡 하나를 색인에 추가한다. 같은 제목·가수·앨범은 한 번만 넣는다."""
+		key = (normalise(title), normalise(artist), normalise(album))
+		if not key[0] or key in self._keys:
+			return
+		self._keys.add(key)
+		entry_id = len(self.entries)
+		grams = ngrams(title)
+		self.entries.append({"title": title, "artist": artist, "album": album, "source": source})
+		self._sizes.append(len(grams))
+		for g in grams:
+			self._postings[g].append(entry_id)
+
+	def add_album(self, album: dict, source: str = "") -> None:
+		"""앨범 모델의 모든 트랙을 추가한다."""
+		for track in album.get("tracks", []):
+			self.add(track.get("title", ""), track.get("artist") or album.get("artist", ""), album.get("title", ""), source)
+
+	def search(self, title: str, artist: str = "", threshold: float = DEFAULT_THRESHOLD, limit: int = 5) -> list:
+		"""제목 n-gram 유사도(Dice)에 가수 유사도를 더한 점수가 threshold 이상인 항목을 점수순으로 반환한다."""
+		grams = ngrams(title)
+		if not grams:
+			return []
+		shared = defaultdict(int)
+		for g in grams:
+			for entry_id in self._postings.get(g, ()):
+				shared[entry_id] += 1
+
+		artist_grams = ngrams(artist) if artist else set()
+		hits = []
+		for entry_id, count in shared.items():
+			score = 2 * count / (len(grams) + self._sizes[entry_id])
+			entry = self.entries[entry_id]
+			if artist_grams and entry["artist"]:
+				score = 0.75 * score + 0.25 * _dice(artist_grams, ngrams(entry["artist"]))
+			if score >= threshold:
+				hits.append(dict(entry, score=round(score, 3)))
+		hits.sort(key=lambda h: h["score"], reverse=True)
+		return hits[:limit]
+
+	def save(self, path: str) -> None:
+		"""항목 목록을 JSON으로 저장한다. 역색인은 불러올 때 다시 만든다."""
+		with open(path, "w", encoding="utf-8") as f:
+			json.dump({"ngram": NGRAM, "entries": self.entries}, f, ensure_ascii=False)
+
+	@classmethod
+	def load(cls, path: str) -> "TitleIndex":
+		"""save로 저장한 색인을 불러온다."""
+		index = cls()
+		with open(path, encoding="utf-8") as f:
+			data = json.load(f)
+		for e in data.get("entries", []):
+			index.add(e["title"], e.get("artist", ""), e.get("album", ""), e.get("source", ""))
+		return index
+
+
+def fingerprint(title: str, artist: str = "") -> tuple:
+	"""코드 색인의 키. 정규화한 (제목, 가수). 재생시간은 허용 오차가 있어 키 대신 항목에서 비교한다."""
+	return normalise(title), normalise(artist)
+
+
+class CodeIndex:
+	"""(정규화 제목, 가수) 지문 → 이미 발급된 ISRC/UCI 항목 목록. 재생시간은 DURATION_TOLERANCE초 안이면 같은 곡으로 본다."""
+
+	def __init__(self, tolerance: int = DURATION_TOLERANCE):
+		self.tolerance = tolerance
+		self._entries = defaultdict(list)
+		self._isrcs = set()
+
+	def __len__(self) -> int:
+		return len(self._isrcs)
+
+	def add(self, title: str, artist: str, duration, isrc: str, uci: str = "", album: str = "", source: str = "") -> None:
+		"""발급된 곡 하나를 추가한다. ISRC가 없거나 이미 들어 있으면 넣지 않는다."""
+		key = fingerprint(title, artist)
+		if not key[0] or not isrc or isrc in self._isrcs:
+			return
+		self._isrcs.add(isrc)
+		self._entries[key].append({
+			"title": title, "artist": artist, "duration": duration, "isrc": isrc, "uci": uci or "", "album": album, "source": source,
+		})
+
+	def add_album(self, album: dict, source: str = "") -> None:
+		"""트랙에 isrc가 있는 앨범 모델(실행 기록 한 줄, 코드가 든 카탈로그)의 트랙을 추가한다."""
+		for track in album.get("tracks", []):
+			self.add(
+				track.get("title", ""), track.get("artist") or album.get("artist", ""), _seconds(track.get("duration")),
+				track.get("isrc") or "", track.get("uci") or "", album.get("title", ""), source,
+			)
+
+	def lookup(self, title: str, artist: str = "", duration=None) -> list:
+		"""같은 지문의 항목 중 재생시간이 허용 오차 안이거나 한쪽 재생시간을 모르는 항목을 반환한다. 재생시간이 맞은 항목은 exact=True."""
+		hits = []
+		for entry in self._entries.get(fingerprint(title, artist), ()):
+			if duration is None or entry["duration"] is None:
+				hits.append(dict(entry, exact=False))
+			elif abs(entry["duration"] - duration) <= self.tolerance:
+				hits.append(dict(entry, exact=True))
+		hits.sort(key=lambda h: not h["exact"])
+		return hits
+
+
+def _seconds(value):
+	try:
+		return catalog_seconds(value)
+	except (TypeError, ValueError):
+		return None
+
+
+def build_code_index(catalog_paths=(), history=None) -> CodeIndex:
+	"""실행 기록(발급 결과)과 isrc 열이 있는 카탈로그로 코드 색인을 만든다."""
+	index = CodeIndex()
+	for record in catalog.load_history(history):
+		index.add_album(record, source=f"history:{record.get('album_code', '')}")
+	for path in catalog_paths:
+		for album in catalog.load_catalog(path):
+			index.add_album(album, source=os.path.basename(path))
+	return index
+
+
+def index_path() -> str:
+	"""색인 파일 경로를 반환한다. MIMS_TITLE_INDEX로 바꿀 수 있다."""
+	return os.getenv(INDEX_ENV) or DEFAULT_INDEX
+
+
+def build_index(catalog_paths=(), history=None) -> TitleIndex:
+	"""카탈로그 파일들과 실행 기록으로 색인을 만든다."""
+	index = TitleIndex()
+	for path in catalog_paths:
+		for album in catalog.load_catalog(path):
+			index.add_album(album, source=os.path.basename(path))
+	for record in catalog.load_history(history):
+		index.add_album(record, source=f"history:{record.get('album_code', '')}")
+	return index
+
+
+def load_default_index() -> TitleIndex:
+	"""저장된 색인(있으면)에 그 이후 쌓인 실행 기록까지 합쳐 반환한다."""
+	path = index_path()
+	index = TitleIndex.load(path) if os.path.exists(path) else TitleIndex()
+	for record in catalog.load_history():
+		index.add_album(record, source=f"history:{record.get('album_code', '')}")
+	return index
+
+
+def find_duplicates(index: TitleIndex, album: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+	"""앨범 트랙별로 색인에서 중복 의심 항목을 찾아 [(트랙, 후보목록)]으로 반환한다."""
+	found = []
+	for track in album.get("tracks", []):
+		hits = index.search(track.get("title", ""), track.get("artist") or album.get("artist", ""), threshold)
+		if hits:
+			found.append((track, hits))
+	return found
+
+
+def precheck(album: dict, index=None, threshold: float = DEFAULT_THRESHOLD) -> list:
+	"""등록 전 중복 의심 트랙을 출력하고 목록을 반환한다. 색인이 비어 있으면 건너뛴다."""
+	index = index if index is not None else load_default_index()
+	if not len(index):
+		return []
+	found = find_duplicates(index, album, threshold)
+	if not found:
+		events.info(f"중복 사전검사 통과: {album.get('title', '')} ({len(album.get('tracks', []))}곡)", step="precheck")
+		return found
+	events.warning(f"중복 의심 트랙 {len(found)}곡: {album.get('title', '')} → 앨범중복확인 단계에서 멈출 수 있습니다.", step="precheck")
+	for track, hits in found:
+		best = hits[0]
+		events.warning(
+			f"{track.get('title', '')} ≈ {best['title']} / {best['artist']} [{best['album']}] (유사도 {best['score']:.2f}, {best['source']})",
+			step="precheck", track_seq=track.get("track") or None,
+		)
+	return found
+
+
+def known_codes(index: CodeIndex, album: dict) -> list:
+	"""앨범 트랙별로 이미 발급된 코드가 있는지 찾아 [(트랙, 항목목록)]으로 반환한다."""
+	found = []
+	for track in album.get("tracks", []):
+		hits = index.lookup(track.get("title", ""), track.get("artist") or album.get("artist", ""), track.get("duration"))
+		if hits:
+			found.append((track, hits))
+	return found
+
+
+def reuse_check(album: dict, index=None) -> list:
+	"""발급 전에 이미 ISRC가 있을 것으로 보이는 트랙을 출력하고 목록을 반환한다. 색인이 비어 있으면 건너뛴다."""
+	index = index if index is not None else build_code_index()
+	if not len(index):
+		return []
+	found = known_codes(index, album)
+	if not found:
+		return found
+	events.warning(
+		f"기존 ISRC 보유 추정 트랙 {len(found)}/{len(album.get('tracks', []))}곡: {album.get('title', '')} → 새로 발급하면 코드가 중복됩니다.",
+		step="precheck",
+	)
+	for track, hits in found:
+		best = hits[0]
+		events.warning(
+			f"{track.get('title', '')} → ISRC {best['isrc']} · UCI {best['uci'] or '-'} [{best['album']}]"
+			f"{'' if best['exact'] else ' (재생시간 미확인)'}{f' 외 {len(hits) - 1}건' if len(hits) > 1 else ''} ({best['source']})",
+			step="precheck", track_seq=track.get("track") or None, isrc=best["isrc"],
+		)
+	return found
+
+
+def main():
+	"""색인 생성(build), 엑셀 사전검사(check), 기존 코드 조회(codes)를 수행한다."""
+	parser = argparse.ArgumentParser(description="곡 제목 n-gram 색인으로 중복 등록 사전검사")
+	sub = parser.add_subparsers(dest="command", required=True)
+	p_build = sub.add_parser("build", help="카탈로그·실행 기록으로 색인 생성")
+	p_build.add_argument("--catalog", action="append", default=[], help="카탈로그 CSV/JSON (여러 번 지정 가능)")
+	p_build.add_argument("--history", help="실행 기록 JSONL (기본: run_history.jsonl)")
+	p_build.add_argument("--output", default=None, help="색인 저장 경로")
+	p_check = sub.add_parser("check", help="엑셀의 중복 의심 트랙 검사")
+	p_check.add_argument("excel_paths", nargs="+")
+	p_check.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+	p_codes = sub.add_parser("codes", help="엑셀 트랙 중 이미 ISRC/UCI가 발급된 곡 조회")
+	p_codes.add_argument("excel_paths", nargs="+")
+	p_codes.add_argument("--catalog", action="append", default=[], help="isrc·uci 열이 있는 카탈로그 CSV/JSON (여러 번 지정 가능)")
+	p_codes.add_argument("--history", help="실행 기록 JSONL (기본: run_history.jsonl)")
+	args = parser.parse_args()
+
+	if args.command == "build":
+		index = build_index(args.catalog, args.history)
+		output = args.output or index_path()
+		index.save(output)
+		print(f"색인 저장: {output} ({len(index)}곡)")
+		return 0
+
+	if args.command == "codes":
+		codes = build_code_index(args.catalog, args.history)
+		print(f"코드 색인: ISRC {len(codes)}개")
+		found = [reuse_check(read_album(path), codes) for path in args.excel_paths]
+		return 1 if any(found) else 0
+
+	index = load_default_index()
+	if not len(index):
+		print("색인이 비어 있습니다. 먼저 build를 실행하세요.")
+		return 1
+	flagged = 0
+	for path in args.excel_paths:
+		if precheck(read_album(path), index, args.threshold):
+			flagged += 1
+	return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
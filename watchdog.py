@@ -0,0 +1,162 @@
+import os
+import json
+import time
+import threading
+import contextlib
+
+import events
+import metrics
+
+# 예외 없이 멈춰 버리는 단계(브라우저 기본 대화상자에 막힌 chromedriver, 끝나지 않는 페이지 로딩 등)를 잡는다.
+# 워커 스레드가 events.step으로 들어가고 나올 때마다 기록해 두고, 감시 스레드가 단계·앨범별 시간 예산을 넘긴
+# 세션의 브라우저 프로세스를 강제 종료한다. 막혀 있던 Selenium 호출은 예외로 풀리고, 호출한 쪽은 사건 기록을 보고 재시도한다.
+
+STEP_BUDGETS_ENV = "MIMS_STEP_BUDGETS"
+ALBUM_BUDGET_ENV = "MIMS_ALBUM_BUDGET"
+INCIDENTS_FILENAME = "incidents.jsonl"
+DEFAULT_STEP_BUDGET = 300
+DEFAULT_ALBUM_BUDGET = 1800
+DEFAULT_STEP_BUDGETS = {
+	"login": 60,
+	"my_album": 90,
+	"upload": 180,
+	"open_detail": 90,
+	"durations": 900,
+	"save_last_track": 120,
+	"meta_confirm": 180,
+	"rights": 300,
+	"issue": 600,
+}
+
+INCIDENTS = metrics.Counter("mims_watchdog_incidents", "시간 예산 초과로 강제 종료한 세션 수", ("scope", "step"))
+
+
+def parse_budgets(text: str) -> dict:
+	"""'upload=180,issue=900' 형식의 단계별 예산(초)을 dict로 읽는다."""
+	budgets = {}
+	for part in (text or "").split(","):
+		name, _, seconds = part.partition("=")
+		if name.strip() and seconds.strip():
+			budgets[name.strip()] = float(seconds)
+	return budgets
+
+
+class Watchdog:
+	"""워커 스레드별 진행 중인 앨범·단계를 추적하고 예산을 넘긴 세션을 강제 종료하는 감시 스레드."""
+
+	def __init__(self, step_budgets=None, album_budget=None, default_step_budget: float = DEFAULT_STEP_BUDGET, interval: float = 2.0):
+		self.step_budgets = dict(DEFAULT_STEP_BUDGETS)
+		self.step_budgets.update(parse_budgets(os.getenv(STEP_BUDGETS_ENV, "")))
+		self.step_budgets.update(step_budgets or {})
+		self.album_budget = album_budget or float(os.getenv(ALBUM_BUDGET_ENV, DEFAULT_ALBUM_BUDGET))
+		self.default_step_budget = default_step_budget
+		self.interval = interval
+		self.incidents = []
+		self._leases = {}
+		self._lock = threading.Lock()
+		self._stopped = threading.Event()
+		self._thread = None
+		self._hooked = False
+
+	def start(self) -> None:
+		if not self._hooked:
+			events.on_step_enter(self._step_enter)
+			events.on_step_exit(self._step_exit)
+			self._hooked = True
+		self._stopped.clear()
+		self._thread = threading.Thread(target=self._loop, name="watchdog", daemon=True)
+		self._thread.start()
+
+	def stop(self) -> None:
+		self._stopped.set()
+		if self._thread is not None:
+			self._thread.join()
+
+	def close(self) -> None:
+		"""감시 스레드를 멈추고 단계 훅을 해제한다. 다시 start()하면 훅을 다시 건다."""
+		self.stop()
+		if self._hooked:
+			events.remove_step_hooks(self._step_enter, self._step_exit)
+			self._hooked = False
+
+	@contextlib.contextmanager
+	def watch(self, kill, album: str, name: str = ""):
+		"""이 블록 동안 현재 스레드의 앨범 처리를 감시한다. 예산을 넘기면 kill()을 호출하고 lease["incident"]에 사건을 남긴다."""
+		lease = {"kill": kill, "name": name, "album": album, "started": time.monotonic(), "steps": [], "incident": None}
+		ident = threading.get_ident()
+		with self._lock:
+			self._leases[ident] = lease
+		try:
+			yield lease
+		finally:
+			with self._lock:
+				self._leases.pop(ident, None)
+
+	def renew(self, lease: dict) -> None:
+		"""한 감시 블록에서 여러 앨범을 이어 처리할 때, 앨범 하나를 마칠 때마다 앨범 예산을 처음부터 다시 잰다."""
+		lease["started"] = time.monotonic()
+
+	def _step_enter(self, name: str) -> None:
+		lease = self._leases.get(threading.get_ident())
+		if lease is not None:
+			lease["steps"].append((name, time.monotonic()))
+
+	def _step_exit(self, name: str) -> None:
+		lease = self._leases.get(threading.get_ident())
+		if lease is not None and lease["steps"]:
+			lease["steps"].pop()
+
+	def _overrun(self, lease: dict, now: float):
+		"""예산을 넘겼으면 (범위, 단계, 경과, 예산)을, 아니면 None을 반환한다."""
+		elapsed = now - lease["started"]
+		step = lease["steps"][-1][0] if lease["steps"] else None
+		if elapsed > self.album_budget:
+			return "album", step, elapsed, self.album_budget
+		# 가장 안쪽 단계부터 본다. 바깥 단계는 안쪽 단계를 모두 포함한 시간으로 잰다.
+		for name, started in reversed(list(lease["steps"])):
+			budget = self.step_budgets.get(name, self.default_step_budget)
+			if now - started > budget:
+				return "step", name, now - started, budget
+		return None
+
+	def _loop(self) -> None:
+		while not self._stopped.wait(self.interval):
+			now = time.monotonic()
+			expired = []
+			with self._lock:
+				for ident, lease in self._leases.items():
+					hit = self._overrun(lease, now) if lease["incident"] is None else None
+					if hit:
+						expired.append((ident, lease, hit))
+			for ident, lease, hit in expired:
+				self._kill(ident, lease, *hit)
+
+	def _kill(self, ident: int, lease: dict, scope: str, step, elapsed: float, budget: float) -> None:
+		"""사건을 기록하고 세션의 브라우저 프로세스 트리를 강제 종료한다."""
+		incident = {
+			"ts": round(time.time(), 3),
+			"thread": next((t.name for t in threading.enumerate() if t.ident == ident), str(ident)),
+			"session": lease["name"],
+			"album": lease["album"],
+			"scope": scope,
+			"step": step,
+			"elapsed": round(elapsed, 1),
+			"budget": budget,
+		}
+		lease["incident"] = incident
+		try:
+			incident["killed"] = lease["kill"]()
+		except Exception as e:
+			incident["killed"] = f"종료 실패: {e}"
+		self.incidents.append(incident)
+		INCIDENTS.inc(scope=scope, step=step)
+		label = "앨범 처리" if scope == "album" else f"'{step}' 단계"
+		events.error(
+			f"감시: {label}가 {elapsed:.0f}초로 예산 {budget:.0f}초를 넘겨 브라우저를 강제 종료했습니다.",
+			kind="watchdog", album=lease["album"], step=step, **{k: incident[k] for k in ("scope", "elapsed", "budget", "killed")},
+		)
+		try:
+			with open(os.path.join(events.setup(), INCIDENTS_FILENAME), "a", encoding="utf-8") as f:
+				f.write(json.dumps(incident, ensure_ascii=False) + "\n")
+		except OSError:
+			pass
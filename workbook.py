@@ -0,0 +1,431 @@
+import os
+import sys
+import time
+import hashlib
+import argparse
+import tempfile
+import datetime as dt
+from array import array
+
+from openpyxl import Workbook, load_workbook
+
+import events
+import catalog
+
+# MIMS 업로드 엑셀(Sheet1) 레이아웃: 17행이 곡정보 헤더, 18행부터 트랙, N열이 재생시간
+TRACK_START_ROW = 18
+DISC_COLUMN = 1  # A열
+TRACK_NO_COLUMN = 2  # B열
+TITLE_COLUMN = 5  # E열
+ARTIST_COLUMN = 9  # I열
+DURATION_COLUMN = 14  # N열
+ALBUM_TITLE_CELL = "C3"
+ALBUM_ARTIST_CELL = "C5"
+MAX_TRACK_SECONDS = 3600
+HEADER_ROWS = TRACK_START_ROW - 1
+TEMPLATE_WORKBOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "박성태 - 기도왕｜MIMS.xlsx")
+WORKBOOK_SUFFIX = "｜MIMS.xlsx"
+
+# 앨범 모델 필드 → 앨범정보 값 셀 (A~B열, F열은 항목명)
+ALBUM_FIELD_CELLS = {
+	"title": "C3", "title_en": "G3",
+	"subtitle": "C4", "subtitle_en": "G4",
+	"artist": "C5", "artist_en": "G5",
+	"album_type": "C6", "version": "G6",
+	"media": "C7", "country": "G7",
+	"produced_on": "C8", "released_on": "G8",
+	"genre": "C9",
+	"discs": "C10", "track_count": "G10",
+	"producer": "C11", "producer_en": "G11",
+	"distributor": "C12", "distributor_en": "G12",
+	"label": "C13", "label_en": "G13",
+	"product_code": "C14", "upc": "G14",
+	"rights_code": "C15",
+}
+# 트랙 모델 필드 → 곡정보 열 번호 (17행 헤더 순서)
+TRACK_FIELD_COLUMNS = {
+	"disc": DISC_COLUMN, "track": TRACK_NO_COLUMN, "mr": 3, "title_track": 4,
+	"title": TITLE_COLUMN, "title_en": 6, "subtitle": 7, "subtitle_en": 8,
+	"artist": ARTIST_COLUMN, "artist_en": 10, "genre": 11, "rights_code": 12,
+	"isrc": 13, "duration": DURATION_COLUMN, "featuring": 15,
+	"composer": 16, "lyricist": 17, "arranger": 18, "performer": 19,
+}
+ALBUM_DEFAULTS = {"album_type": "Album", "media": "DIGITAL", "country": "KR"}
+
+
+def _duration_parts(value):
+	"""재생시간 셀 값을 (시, 분, 초) 정수로 나눈다. 빈 값은 None, 해석할 수 없으면 ValueError."""
+	if value is None:
+		return None
+	if isinstance(value, dt.time):
+		return value.hour, value.minute, value.second
+	if isinstance(value, dt.timedelta):
+		total = int(value.total_seconds())
+		return total // 3600, (total % 3600) // 60, total % 60
+	if isinstance(value, (int, float)):
+		total = int(round((float(value) % 1) * 86400))
+		return total // 3600, (total % 3600) // 60, total % 60
+	s = str(value).strip()
+	if not s:
+		return None
+	parts = s.split(":")
+	if len(parts) == 3:
+		hh, mm, ss = parts
+	elif len(parts) == 2:
+		hh, mm, ss = "0", parts[0], parts[1]
+	else:
+		raise ValueError(f"형식 오류: {s!r}")
+	return int(hh), int(mm), int(float(ss))
+
+
+class DurationReport:
+	"""워크북 재생시간 열을 한 번에 변환한 결과와 검증 이슈 목록."""
+
+	def __init__(self, excel_path: str):
+		self.excel_path = excel_path
+		# 인덱스 i는 엑셀 TRACK_START_ROW + i 행에 대응한다. 변환 실패 행의 초는 -1, hms는 None.
+		self.seconds = array("l")
+		self.hms = []
+		self.issues = []
+
+	@property
+	def track_count(self) -> int:
+		return len(self.hms)
+
+	@property
+	def errors(self) -> list:
+		return [i for i in self.issues if i["level"] == "error"]
+
+	@property
+	def ok(self) -> bool:
+		return not self.errors
+
+	def to_dict(self) -> dict:
+		"""프로세스 간에 넘기거나 매니페스트에 쓸 수 있는 dict로 만든다."""
+		return {
+			"excel_path": self.excel_path,
+			"seconds": list(self.seconds),
+			"hms": [list(h) if h else None for h in self.hms],
+			"issues": [dict(i, value=None if i["value"] is None else str(i["value"])) for i in self.issues],
+		}
+
+	@classmethod
+	def from_dict(cls, data: dict) -> "DurationReport":
+		"""to_dict로 만든 dict에서 되살린다."""
+		report = cls(data["excel_path"])
+		report.seconds.extend(data["seconds"])
+		report.hms = [tuple(h) if h else None for h in data["hms"]]
+		report.issues = list(data["issues"])
+		return report
+
+	def _add_issue(self, row: int, value, level: str, message: str) -> None:
+		self.issues.append({"row": row, "value": value, "level": level, "message": message})
+
+	def print_report(self) -> None:
+		"""검증 결과를 행 번호와 함께 이벤트로 남긴다."""
+		if not self.issues:
+			events.info(f"재생시간 검증 통과: {self.track_count}개 트랙", step="validate")
+			return
+		events.warning(
+			f"재생시간 검증: {self.track_count}개 트랙 중 오류 {len(self.errors)}건, 경고 {len(self.issues) - len(self.errors)}건",
+			step="validate",
+		)
+		for issue in self.issues:
+			log = events.error if issue["level"] == "error" else events.warning
+			log(
+				f"N{issue['row']}: {issue['message']} (값: {issue['value']!r})",
+				step="validate", track_seq=issue["row"] - TRACK_START_ROW + 1, row=issue["row"],
+			)
+
+
+def parse_duration_column(excel_path: str, max_seconds: int = MAX_TRACK_SECONDS) -> DurationReport:
+	"""엑셀 재생시간 열 전체를 한 번에 읽어 초/HH·MM·SS로 변환하고 범위를 벗어난 값을 표시한다."""
+	report = DurationReport(excel_path)
+	wb = load_workbook(excel_path, read_only=True, data_only=True)
+	try:
+		rows = list(wb.active.iter_rows(
+			min_row=TRACK_START_ROW, min_col=TITLE_COLUMN, max_col=DURATION_COLUMN, values_only=True,
+		))
+	finally:
+		wb.close()
+
+	# 제목도 재생시간도 없는 뒤쪽 빈 행은 트랙이 아니다
+	last = len(rows)
+	while last > 0 and not _has_value(rows[last - 1][0]) and not _has_value(rows[last - 1][-1]):
+		last -= 1
+
+	for offset, row in enumerate(rows[:last]):
+		excel_row = TRACK_START_ROW + offset
+		value = row[-1]
+		try:
+			parts = _duration_parts(value)
+		except (TypeError, ValueError) as e:
+			report.seconds.append(-1)
+			report.hms.append(None)
+			report._add_issue(excel_row, value, "error", f"해석할 수 없는 재생시간 ({e})")
+			continue
+		if parts is None:
+			report.seconds.append(-1)
+			report.hms.append(None)
+			if _has_value(row[0]):
+				report._add_issue(excel_row, value, "error", "재생시간이 비어 있음")
+			continue
+
+		hh, mm, ss = parts
+		total = hh * 3600 + mm * 60 + ss
+		report.seconds.append(total)
+		report.hms.append((f"{hh:02d}", f"{mm:02d}", f"{ss:02d}"))
+		if ss >= 60 or mm >= 60:
+			report._add_issue(excel_row, value, "error", "분/초가 60 이상")
+		elif total <= 0:
+			report._add_issue(excel_row, value, "error", "길이가 0")
+		elif total > max_seconds:
+			report._add_issue(excel_row, value, "warning", f"{max_seconds // 60}분 초과")
+	return report
+
+
+def _has_value(value) -> bool:
+	return value is not None and str(value).strip() != ""
+
+
+def _cell_text(value) -> str:
+	return str(value).strip() if value is not None else ""
+
+
+def _at(row, column: int):
+	return row[column - 1] if len(row) >= column else None
+
+
+def read_album(excel_path: str) -> dict:
+	"""엑셀에서 앨범제목·대표가수와 트랙별 디스크/트랙번호·제목·가수·재생시간(초)을 읽는다."""
+	wb = load_workbook(excel_path, read_only=True, data_only=True)
+	try:
+		ws = wb.active
+		album = {
+			"excel_path": excel_path,
+			"title": _cell_text(ws[ALBUM_TITLE_CELL].value),
+			"artist": _cell_text(ws[ALBUM_ARTIST_CELL].value),
+			"tracks": [],
+		}
+		for row in ws.iter_rows(min_row=TRACK_START_ROW, max_col=DURATION_COLUMN, values_only=True):
+			title = _cell_text(_at(row, TITLE_COLUMN))
+			if not title:
+				continue
+			try:
+				parts = _duration_parts(_at(row, DURATION_COLUMN))
+			except (TypeError, ValueError):
+				parts = None
+			album["tracks"].append({
+				"disc": _cell_text(_at(row, DISC_COLUMN)),
+				"track": _cell_text(_at(row, TRACK_NO_COLUMN)),
+				"title": title,
+				"artist": _cell_text(_at(row, ARTIST_COLUMN)) or album["artist"],
+				"duration": parts[0] * 3600 + parts[1] * 60 + parts[2] if parts else None,
+			})
+	finally:
+		wb.close()
+	return album
+
+
+def format_duration(seconds: int) -> str:
+	"""초를 HH:MM:SS 문자열로 만든다."""
+	return f"{seconds // 3600:02d}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}"
+
+
+def catalog_seconds(value):
+	"""카탈로그의 재생시간(초 숫자 또는 MM:SS/HH:MM:SS 문자열)을 초로 바꾼다. 비어 있으면 None."""
+	if value is None or isinstance(value, bool):
+		return None
+	if isinstance(value, (int, float)):
+		return int(round(value))
+	s = str(value).strip()
+	if not s:
+		return None
+	if s.replace(".", "", 1).isdigit():
+		return int(round(float(s)))
+	hh, mm, ss = _duration_parts(s)
+	return hh * 3600 + mm * 60 + ss
+
+
+def _cell_position(ref: str) -> tuple:
+	letters = "".join(c for c in ref if c.isalpha())
+	column = 0
+	for c in letters:
+		column = column * 26 + ord(c.upper()) - 64
+	return int(ref[len(letters):]), column
+
+
+def load_template(path: str = TEMPLATE_WORKBOOK) -> list:
+	"""MIMS 양식의 1~17행(형식 버전·항목명·코드표)을 값 목록으로 읽고 앨범 값 셀은 비운다."""
+	wb = load_workbook(path, read_only=True)
+	try:
+		rows = [list(r) for r in wb.active.iter_rows(min_row=1, max_row=HEADER_ROWS, values_only=True)]
+	finally:
+		wb.close()
+	width = max(len(r) for r in rows)
+	rows = [r + [None] * (width - len(r)) for r in rows] + [[None] * width for _ in range(HEADER_ROWS - len(rows))]
+	for ref in ALBUM_FIELD_CELLS.values():
+		row, column = _cell_position(ref)
+		rows[row - 1][column - 1] = None
+	return rows
+
+
+def _text(value) -> str:
+	return "" if value is None else str(value).strip()
+
+
+def album_rows(album: dict, template: list) -> list:
+	"""앨범 모델을 MIMS 시트의 행 목록(1행부터)으로 만든다. 모든 값은 양식과 같이 문자열로 쓴다."""
+	header = [list(r) for r in template]
+	tracks = album.get("tracks", [])
+	values = dict(ALBUM_DEFAULTS)
+	discs = {_text(t.get("disc")) or "1" for t in tracks}
+	values["discs"] = str(len(discs) or 1)
+	values["track_count"] = str(len(tracks))
+	values.update({k: _text(v) for k, v in album.items() if k in ALBUM_FIELD_CELLS and _text(v)})
+	for field, ref in ALBUM_FIELD_CELLS.items():
+		row, column = _cell_position(ref)
+		header[row - 1][column - 1] = values.get(field) or None
+
+	width = max(len(header[0]), max(TRACK_FIELD_COLUMNS.values()))
+	rows = [r + [None] * (width - len(r)) for r in header]
+	for number, track in enumerate(tracks, start=1):
+		row = [None] * width
+		fields = dict(track)
+		fields.setdefault("disc", "1")
+		fields["track"] = _text(fields.get("track")) or str(number)
+		fields["artist"] = _text(fields.get("artist")) or _text(album.get("artist"))
+		fields["genre"] = _text(fields.get("genre")) or _text(album.get("genre"))
+		seconds = catalog_seconds(fields.get("duration"))
+		fields["duration"] = format_duration(seconds) if seconds is not None else None
+		for field, column in TRACK_FIELD_COLUMNS.items():
+			row[column - 1] = _text(fields.get(field)) or None
+		rows.append(row)
+	return rows
+
+
+def workbook_filename(album: dict) -> str:
+	"""'가수 - 앨범제목｜MIMS.xlsx' 형식의 파일 이름을 만든다."""
+	name = f"{_text(album.get('artist'))} - {_text(album.get('title'))}"
+	return "".join("_" if c in '\\/:*?"<>|' else c for c in name).strip() + WORKBOOK_SUFFIX
+
+
+def write_album_workbook(album: dict, path: str, template: list) -> str:
+	"""앨범 하나를 write-only 모드로 MIMS 업로드 엑셀에 쓴다."""
+	wb = Workbook(write_only=True)
+	ws = wb.create_sheet("Sheet1")
+	for row in album_rows(album, template):
+		ws.append(row)
+	wb.create_sheet("Sheet2")
+	wb.create_sheet("Sheet3")
+	wb.save(path)
+	return path
+
+
+def generate_workbooks(catalog_paths, output_dir: str, template_path: str = TEMPLATE_WORKBOOK) -> list:
+	"""카탈로그 파일들의 모든 앨범을 output_dir에 MIMS 엑셀로 만들고 경로 목록을 반환한다."""
+	os.makedirs(output_dir, exist_ok=True)
+	template = load_template(template_path)
+	written = []
+	for catalog_path in catalog_paths:
+		for album in catalog.load_catalog(catalog_path):
+			if not album.get("tracks"):
+				events.warning(f"트랙이 없는 앨범은 건너뜁니다: {album.get('title', '')}", step="generate")
+				continue
+			path = os.path.join(output_dir, workbook_filename(album))
+			written.append(write_album_workbook(album, path, template))
+	return written
+
+
+NORMALISED_DIR = os.path.join(tempfile.gettempdir(), "mims_normalised")
+REQUIRED_TRACK_COLUMNS = (DISC_COLUMN, TRACK_NO_COLUMN, TITLE_COLUMN, ARTIST_COLUMN, TRACK_FIELD_COLUMNS["genre"], DURATION_COLUMN)
+
+
+def _normalised_value(value, column: int):
+	"""셀 값 하나를 MIMS 임포터가 받는 모양으로 바꾼다. 재생시간은 앞뒤 공백 없는 HH:MM:SS 문자열."""
+	if column == DURATION_COLUMN:
+		try:
+			parts = _duration_parts(value)
+		except (TypeError, ValueError):
+			return value
+		if parts is None:
+			return None
+		hh, mm, ss = parts
+		if mm >= 60 or ss >= 60:
+			return value
+		return format_duration(hh * 3600 + mm * 60 + ss)
+	if isinstance(value, str):
+		return value.strip() or None
+	return value
+
+
+def normalise_workbook(excel_path: str, output_dir: str = NORMALISED_DIR) -> dict:
+	"""앨범 값 셀과 트랙 행의 공백을 다듬고 재생시간 열을 HH:MM:SS로 바꾼 사본을 만든다.
+
+	원본은 건드리지 않는다. 바꿀 것이 없으면 원본 경로를 그대로 돌려준다.
+	반환값: {"path": 업로드할 경로, "changed": 바뀐 셀 수, "missing": [필수 값이 빈 (행, 열)]}
+	"""
+	wb = load_workbook(excel_path)
+	ws = wb.active
+	changed = 0
+	missing = []
+
+	def apply(cell, column):
+		nonlocal changed
+		value = _normalised_value(cell.value, column)
+		if value != cell.value:
+			cell.value = value
+			changed += 1
+		return value
+
+	for ref in ALBUM_FIELD_CELLS.values():
+		apply(ws[ref], 0)
+	last = ws.max_row
+	while last >= TRACK_START_ROW and not _has_value(ws.cell(row=last, column=TITLE_COLUMN).value):
+		last -= 1
+	for row in ws.iter_rows(min_row=TRACK_START_ROW, max_row=last, max_col=max(TRACK_FIELD_COLUMNS.values())):
+		for cell in row:
+			value = apply(cell, cell.column)
+			if cell.column in REQUIRED_TRACK_COLUMNS and not _has_value(value):
+				missing.append((cell.row, cell.column))
+
+	result = {"path": excel_path, "changed": changed, "missing": missing}
+	if changed:
+		# 업로드 파일 이름은 그대로 두고, 다른 폴더의 같은 이름 엑셀끼리 겹치지 않게 원본 폴더별 하위 디렉터리에 쓴다
+		folder = hashlib.sha1(os.path.dirname(os.path.abspath(excel_path)).encode("utf-8")).hexdigest()[:8]
+		os.makedirs(os.path.join(output_dir, folder), exist_ok=True)
+		result["path"] = os.path.join(output_dir, folder, os.path.basename(excel_path))
+		wb.save(result["path"])
+	wb.close()
+	return result
+
+
+def main():
+	"""카탈로그(CSV/JSON)에서 MIMS 업로드 엑셀을 만들거나 업로드 전 엑셀을 정규화한다."""
+	parser = argparse.ArgumentParser(description="MIMS 업로드 엑셀 도구")
+	sub = parser.add_subparsers(dest="command", required=True)
+	p_gen = sub.add_parser("generate", help="카탈로그에서 앨범별 MIMS 엑셀 생성")
+	p_gen.add_argument("catalogs", nargs="+", help="카탈로그 CSV/JSON")
+	p_gen.add_argument("-o", "--output", default="workbooks", help="엑셀을 저장할 디렉터리")
+	p_gen.add_argument("--template", default=TEMPLATE_WORKBOOK, help="1~17행을 가져올 MIMS 양식 엑셀")
+	p_norm = sub.add_parser("normalise", help="재생시간 열·필수 항목 공백을 업로드 형식으로 정리")
+	p_norm.add_argument("excel_paths", nargs="+")
+	p_norm.add_argument("-o", "--output", default=NORMALISED_DIR, help="정리한 사본을 저장할 디렉터리")
+	args = parser.parse_args()
+
+	if args.command == "normalise":
+		for path in args.excel_paths:
+			result = normalise_workbook(path, args.output)
+			events.info(f"{os.path.basename(path)}: 셀 {result['changed']}개 정리 → {result['path']}", step="normalise")
+			for row, column in result["missing"]:
+				events.warning(f"{os.path.basename(path)} {row}행 {column}열 필수 값이 비어 있음", step="normalise", row=row)
+		return 0
+
+	started = time.perf_counter()
+	written = generate_workbooks(args.catalogs, args.output, args.template)
+	events.info(f"MIMS 엑셀 {len(written)}개 생성: {args.output} ({time.perf_counter() - started:.2f}s)", step="generate")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())